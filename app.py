@@ -676,6 +676,33 @@ def init_session_state():
 # MODEL LOADING FUNCTIONS (WITH CACHING)
 # ============================================================================
 
+@st.cache_resource(show_spinner=False)
+def start_model_reaper():
+    """Start evicting idle models in the background (when MODEL_IDLE_TIMEOUT is set)."""
+    from detectors import registry
+    registry.registry.start_reaper()
+
+
+@st.cache_resource(show_spinner=False)
+def start_model_warmup():
+    """Load and warm up the text and image models in the background (when MODEL_WARMUP=1)."""
+    from detectors import warmup
+    if warmup.MODEL_WARMUP:
+        warmup.start()
+
+
+def pooled(model):
+    """
+    Wrap a shared pipeline in a replica pool (MODEL_POOL_SIZE replicas).
+
+    Sessions and the background search enrichment call the same cached model
+    from different threads; with the default single replica the pool simply
+    runs their calls one at a time.
+    """
+    from detectors import pool
+    return pool.PipelinePool(model, size=max(1, pool.MODEL_POOL_SIZE))
+
+
 @st.cache_resource(show_spinner=False)
 def load_fake_news_model():
     """Load and cache the fake news detection model with fallback."""
@@ -691,13 +718,14 @@ def load_fake_news_model():
             if model['type'] == 'offline':
                 logger.warning("Using offline rule-based detection (Hugging Face unavailable)")
             else:
+                model['model'] = pooled(model['model'])
                 logger.info("✓ Fake news AI model loaded")
             return model
         except:
             # Fallback to original method
             model = fake_news.load_text_model(device=-1)
             logger.info("✓ Fake news model loaded")
-            return {'type': 'huggingface', 'model': model}
+            return {'type': 'huggingface', 'model': pooled(model)}
     except Exception as e:
         logger.error(f"Failed to load fake news model: {e}")
         # Return offline mode as last resort
@@ -713,7 +741,7 @@ def load_deepfake_model():
             raise ImportError(f"Module import failed: {IMPORT_ERROR}")
             
         logger.info("Loading deepfake model...")
-        model = deepfake.load_image_model(device=-1)
+        model = pooled(deepfake.load_image_model(device=-1))
         logger.info("✓ Deepfake model loaded")
         return model
     except Exception as e:
@@ -721,6 +749,23 @@ def load_deepfake_model():
         raise Exception(f"Model loading failed: {str(e)}\n\nPlease ensure dependencies are installed:\npip install -r requirements.txt")
 
 
+@st.cache_resource(show_spinner=False)
+def load_deepfake_ensemble():
+    """Load and cache the multi-model deepfake ensemble."""
+    try:
+        if not IMPORTS_SUCCESS:
+            raise ImportError(f"Module import failed: {IMPORT_ERROR}")
+        
+        from detectors import ensemble
+        logger.info("Loading deepfake ensemble...")
+        model = ensemble.load_image_ensemble(device=-1)
+        logger.info(f"✓ Deepfake ensemble loaded ({len(model.members)} members)")
+        return model
+    except Exception as e:
+        logger.error(f"Failed to load deepfake ensemble: {e}")
+        raise Exception(f"Ensemble loading failed: {str(e)}")
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -737,12 +782,16 @@ def retry_model_download(model_name: str, task: str, retries: int = 3) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    from transformers import pipeline
+    from detectors import model_prep
     
     for i in range(retries):
         try:
             st.info(f"📥 Downloading {model_name}... (Attempt {i+1}/{retries})")
-            pipeline(task, model=model_name)
+            # Fetch and checksum the files only; the loaders build the pipeline
+            results = model_prep.prepare_all([model_prep.ModelSpec(model_name, task)], formats=[])
+            result = next(iter(results.values()))
+            if not result["ok"]:
+                raise Exception(result["error"])
             st.success(f"✅ Successfully downloaded {model_name}")
             return True
         except Exception as e:
@@ -868,6 +917,103 @@ def display_raw_output(result: dict):
         st.json(result)
 
 
+def start_news_enrichment(articles: list):
+    """Scrape and pre-score search results and fetch their thumbnails in the background (replaces any running job)."""
+    previous = st.session_state.get('news_enrichment')
+    if previous is not None:
+        previous.cancel()
+    
+    from utils import enrichment, thumbnails
+    from detectors import fake_news_offline
+    
+    # Card-sized images are fetched once and served from the local cache
+    thumbnails.prefetch(a.get('urlToImage') for a in articles)
+    
+    # The model is pooled (see pooled()), so these batches wait for a free
+    # replica instead of running concurrently with an "Analyze" click
+    text_model = load_fake_news_model()
+    
+    def classify_batch(texts):
+        return fake_news_offline.classify_texts_with_fallback(text_model, texts, max_length=1024)
+    
+    st.session_state.news_enrichment = enrichment.EnrichmentJob(articles, classify_batch).start()
+
+
+def news_results_pending() -> bool:
+    """True while search results are still being scored or their thumbnails downloaded."""
+    from utils import thumbnails
+    
+    job = st.session_state.get('news_enrichment')
+    if job is not None and not job.done:
+        return True
+    articles = st.session_state.get('news_articles') or []
+    return thumbnails.thumbnails.pending(a.get('urlToImage') for a in articles) > 0
+
+
+def news_verdict_badge(enriched, pending: bool) -> str:
+    """HTML badge with a search result's pre-computed verdict."""
+    if enriched is None or enriched.get('verdict') is None:
+        text, color = ("⏳ SCORING…", "#888") if pending and enriched is None else ("— NOT SCORED", "#666")
+        return f'<div style="color: {color}; font-weight: 600; font-size: 0.85rem; margin-bottom: 0.5rem;">{text}</div>'
+    
+    verdict = enriched['verdict']
+    is_fake = verdict['label'].lower() == 'fake'
+    color = "#ff4444" if is_fake else "#44ff44"
+    source = "full article" if enriched['full_text'] else "headline only"
+    return f"""
+    <div style="border: 1px solid {color}; border-radius: 6px; padding: 0.4rem 0.6rem; margin-bottom: 0.5rem; text-align: center;">
+        <div style="color: {color}; font-weight: 800; letter-spacing: 0.1em;">{'🚨 FAKE' if is_fake else '✅ REAL'} {verdict['score']:.0%}</div>
+        <div style="color: #888; font-size: 0.75rem;">{source}</div>
+    </div>
+    """
+
+
+def render_news_articles(polling: bool = False):
+    """Search result cards with verdict badges; re-run every second while results are being scored."""
+    from utils import thumbnails
+    
+    job = st.session_state.get('news_enrichment')
+    if polling and not news_results_pending():
+        # Every verdict and thumbnail is in: one full rerun stops the polling
+        st.rerun()
+    
+    if job is not None and not job.done:
+        scored, total = job.progress()
+        st.caption(f"⏳ Reading and scoring the full articles in the background ({scored}/{total})...")
+    
+    for idx, article in enumerate(st.session_state.news_articles):
+        formatted = newsapi_client.format_article_for_display(article)
+        enriched = job.get(formatted['url']) if job is not None else None
+        
+        with st.expander(f"📄 {formatted['title']}", expanded=(idx==0)):
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown(f"**Source:** {formatted['source']}")
+                st.markdown(f"**Author:** {formatted['author']}")
+                st.markdown(f"**Published:** {formatted['published'][:10]}")
+                st.markdown(f"**Description:** {formatted['description']}")
+                
+                if formatted['image']:
+                    # Small local copy (utils/thumbnails.py); appears once downloaded
+                    thumbnail = thumbnails.get_thumbnail(formatted['image'])
+                    if thumbnail:
+                        st.image(thumbnail, use_column_width=True)
+            
+            with col2:
+                st.markdown(news_verdict_badge(enriched, pending=job is not None and not job.done), unsafe_allow_html=True)
+                if st.button(f"✅ Analyze This", key=f"analyze_{idx}", use_container_width=True):
+                    if enriched is not None:
+                        # Full text and verdict are ready: no scraping or inference on click
+                        st.session_state.selected_news_text = enriched['text']
+                        st.session_state.selected_news_result = enriched['verdict']
+                    else:
+                        st.session_state.selected_news_text = newsapi_client.extract_article_text(article)
+                        st.session_state.selected_news_result = None
+                    st.session_state.selected_news_url = formatted['url']
+                    st.rerun()
+
+
 # ============================================================================
 # TEXT/URL ANALYSIS SECTION
 # ============================================================================
@@ -946,17 +1092,38 @@ def text_analysis_section():
         )
         
         if url:
-            st.info("👆 Click 'ANALYZE' to fetch and verify the article from this URL")
-            # Optional: quick VirusTotal check button
-            if VT_AVAILABLE:
+            # Instant pre-screen against the local domain list (no network)
+            from utils import domain_reputation
+            domain_hint = domain_reputation.lookup(url)
+            domain_verdict = domain_reputation.verdict(url)
+            if domain_hint and domain_hint["hint"]:
+                message = f"Known domain ({domain_hint['matched']}): {domain_hint['description']} — likely {domain_hint['hint']}"
+                if domain_hint["hint"] == "Real":
+                    st.success(f"🟢 {message}")
+                elif domain_hint["hint"] == "Fake":
+                    st.error(f"🔴 {message}")
+                else:
+                    st.warning(f"🟡 {message}")
+            if domain_verdict is not None:
+                # Decisive list entry: the verdict comes from the list, no scraping, VirusTotal or model
+                st.info("👆 Click 'ANALYZE' for the known-domain verdict")
+                st.checkbox("Fetch and analyze the article anyway", value=False, key="url_full_analysis")
+            else:
+                st.info("👆 Click 'ANALYZE' to fetch and verify the article from this URL")
+            # Optional: quick VirusTotal check button (pointless for a listed Fake / Real domain)
+            if VT_AVAILABLE and domain_verdict is None:
                 if st.button("🛡️ Quick URL Reputation Check (VirusTotal)", use_container_width=True):
-                    with st.spinner("Submitting URL to VirusTotal..."):
+                    with st.spinner("Checking URL with VirusTotal..."):
                         vt_res = virustotal_client.url_analyze(url)
                     if vt_res.get("ok"):
                         verdict = vt_res.get("verdict", "unknown").title()
-                        st.success(f"VirusTotal verdict: {verdict} | Malicious: {vt_res.get('malicious',0)} | Suspicious: {vt_res.get('suspicious',0)} | Harmless: {vt_res.get('harmless',0)}")
+                        source = "cached" if vt_res.get("cached") else ("existing report" if vt_res.get("source") == "report" else "new scan")
+                        st.success(f"VirusTotal verdict: {verdict} | Malicious: {vt_res.get('malicious',0)} | Suspicious: {vt_res.get('suspicious',0)} | Harmless: {vt_res.get('harmless',0)} ({source})")
                         with st.expander("View raw VT result"):
                             st.json(vt_res.get("raw", {}))
+                    elif vt_res.get("pending"):
+                        # The scan keeps running on VirusTotal; the next click polls it
+                        st.info("⏳ VirusTotal is still scanning this URL. Click the check again in a few seconds for the verdict.")
                     else:
                         st.warning(f"VirusTotal check failed: {vt_res.get('error', 'Unknown error')}")
     
@@ -987,6 +1154,7 @@ def text_analysis_section():
                     if articles:
                         st.success(f"✓ Found {results.get('totalResults', 0)} articles (showing {len(articles)})")
                         st.session_state.news_articles = articles
+                        start_news_enrichment(articles)
                     else:
                         st.warning("No articles found. Try a different search term.")
                 else:
@@ -997,32 +1165,20 @@ def text_analysis_section():
             st.markdown("---")
             st.markdown("### 📰 Select an Article to Analyze:")
             
-            for idx, article in enumerate(st.session_state.news_articles):
-                formatted = newsapi_client.format_article_for_display(article)
-                
-                with st.expander(f"📄 {formatted['title']}", expanded=(idx==0)):
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        st.markdown(f"**Source:** {formatted['source']}")
-                        st.markdown(f"**Author:** {formatted['author']}")
-                        st.markdown(f"**Published:** {formatted['published'][:10]}")
-                        st.markdown(f"**Description:** {formatted['description']}")
-                        
-                        if formatted['image']:
-                            st.image(formatted['image'], use_column_width=True)
-                    
-                    with col2:
-                        if st.button(f"✅ Analyze This", key=f"analyze_{idx}", use_container_width=True):
-                            text_to_analyze = newsapi_client.extract_article_text(article)
-                            st.session_state.selected_news_text = text_to_analyze
-                            st.session_state.selected_news_url = formatted['url']
-                            st.rerun()
+            fragment = getattr(st, "fragment", None)
+            if fragment is not None and news_results_pending():
+                # Badges and images appear as the background jobs finish each article
+                fragment(render_news_articles, run_every=1.0)(polling=True)
+            else:
+                render_news_articles()
         
         # Use selected article
         if 'selected_news_text' in st.session_state:
             text_to_analyze = st.session_state.selected_news_text
-            st.info(f"✓ Article selected! Click 'ANALYZE NOW' below.")
+            if st.session_state.get('selected_news_result') is not None:
+                st.info(f"✓ Article selected ({len(text_to_analyze)} chars, already scored)! Click 'ANALYZE NOW' below.")
+            else:
+                st.info(f"✓ Article selected! Click 'ANALYZE NOW' below.")
     
     st.markdown("<div style='height: 1rem;'></div>", unsafe_allow_html=True)
     
@@ -1039,6 +1195,14 @@ def text_analysis_section():
                     st.error("⚠️ Please enter a valid URL")
                     return
                 
+                if domain_verdict is not None and not st.session_state.get("url_full_analysis"):
+                    st.session_state.analysis_count += 1
+                    st.markdown("### 📊 ANALYSIS RESULTS")
+                    st.caption(f"Verdict from the domain reputation list ({domain_verdict['raw']['matched']}); the article was not fetched.")
+                    display_result(domain_verdict, result_type="text")
+                    display_raw_output(domain_verdict)
+                    return
+                
                 with st.spinner("📡 Fetching article from URL..."):
                     text_to_analyze = scraper.get_text_from_url(url)
                     
@@ -1075,39 +1239,47 @@ def text_analysis_section():
             progress_placeholder = st.empty()
             status_placeholder = st.empty()
             
+            # Search results are pre-scored in the background; reuse that verdict
+            precomputed = None
+            if input_method == "news" and text_to_analyze == st.session_state.get('selected_news_text'):
+                precomputed = st.session_state.get('selected_news_result')
+            
             try:
-                # Step 1: Load model
-                progress_placeholder.progress(0.2, text="Loading AI model...")
-                status_placeholder.info("🤖 Initializing BERT Neural Network...")
-                time.sleep(0.5)
-                text_model = load_fake_news_model()
-                
-                # Step 2: Analyze
-                progress_placeholder.progress(0.6, text="Analyzing content...")
-                status_placeholder.info("🔎 Running deep analysis on text patterns...")
-                time.sleep(0.5)
-                
-                # Use fallback-aware classification
-                if text_model.get('type') == 'offline':
-                    status_placeholder.warning("🔎 Using offline rule-based analysis (AI model unavailable)...")
-                
-                try:
-                    from detectors import fake_news_offline
-                    result = fake_news_offline.classify_text_with_fallback(text_model, text_to_analyze, max_length=1024)
-                except:
-                    # Fallback to original method
-                    model = text_model.get('model', text_model)
-                    result = fake_news.classify_text(model, text_to_analyze, max_length=1024)
-                
-                # Step 3: Complete
-                progress_placeholder.progress(1.0, text="Analysis complete!")
-                status_placeholder.success("✅ Analysis completed successfully!")
-                time.sleep(0.5)
-                
-                # Clear progress indicators
-                progress_placeholder.empty()
-                status_placeholder.empty()
-                
+                if precomputed is not None:
+                    result = precomputed
+                else:
+                    # Step 1: Load model
+                    progress_placeholder.progress(0.2, text="Loading AI model...")
+                    status_placeholder.info("🤖 Initializing BERT Neural Network...")
+                    time.sleep(0.5)
+                    text_model = load_fake_news_model()
+                    
+                    # Step 2: Analyze
+                    progress_placeholder.progress(0.6, text="Analyzing content...")
+                    status_placeholder.info("🔎 Running deep analysis on text patterns...")
+                    time.sleep(0.5)
+                    
+                    # Use fallback-aware classification
+                    if text_model.get('type') == 'offline':
+                        status_placeholder.warning("🔎 Using offline rule-based analysis (AI model unavailable)...")
+                    
+                    try:
+                        from detectors import fake_news_offline
+                        result = fake_news_offline.classify_text_with_fallback(text_model, text_to_analyze, max_length=1024)
+                    except:
+                        # Fallback to original method
+                        model = text_model.get('model', text_model)
+                        result = fake_news.classify_text(model, text_to_analyze, max_length=1024)
+                    
+                    # Step 3: Complete
+                    progress_placeholder.progress(1.0, text="Analysis complete!")
+                    status_placeholder.success("✅ Analysis completed successfully!")
+                    time.sleep(0.5)
+                    
+                    # Clear progress indicators
+                    progress_placeholder.empty()
+                    status_placeholder.empty()
+                    
                 # Increment analysis counter
                 st.session_state.analysis_count += 1
                 
@@ -1227,6 +1399,13 @@ def image_analysis_section():
         # Analyze button
         analyze_col1, analyze_col2, analyze_col3 = st.columns([1, 2, 1])
         with analyze_col2:
+            analysis_mode = st.selectbox(
+                "Analysis mode",
+                ["Whole image", "Focus on faces", "High-resolution tiles", "Model ensemble"],
+                help="Focus on faces: classify only detected face regions. "
+                     "High-resolution tiles: classify overlapping full-resolution tiles (best for large photos). "
+                     "Model ensemble: fuse several deepfake models (slower first load)."
+            )
             analyze_button = st.button("🔍 ANALYZE IMAGE", type="primary", use_container_width=True)
         
         if analyze_button:
@@ -1244,13 +1423,24 @@ def image_analysis_section():
                     progress_placeholder.progress(0.2, text="Loading AI model...")
                     status_placeholder.info("🤖 Initializing Computer Vision Model...")
                     time.sleep(0.5)
-                    image_model = load_deepfake_model()
+                    if analysis_mode == "Model ensemble":
+                        image_model = load_deepfake_ensemble()
+                    else:
+                        image_model = load_deepfake_model()
                     
                     # Step 2: Analyze
                     progress_placeholder.progress(0.6, text="Analyzing image...")
                     status_placeholder.info("🔎 Scanning for manipulation patterns...")
                     time.sleep(0.5)
-                    result = deepfake.classify_image(image_model, tmp_path)
+                    if analysis_mode == "Model ensemble":
+                        result = image_model.classify(tmp_path)
+                    else:
+                        result = deepfake.classify_image(
+                            image_model,
+                            tmp_path,
+                            face_crops=analysis_mode == "Focus on faces",
+                            tiled=analysis_mode == "High-resolution tiles"
+                        )
                     
                     # Step 3: Complete
                     progress_placeholder.progress(1.0, text="Analysis complete!")
@@ -1280,7 +1470,13 @@ def image_analysis_section():
                             st.metric("Format", uploaded_file.type.split('/')[-1].upper())
                         with col3:
                             st.metric("Analyzed At", datetime.now().strftime("%H:%M:%S"))
+                        
+                        if "heatmap" in result:
+                            st.markdown("**Per-tile deepfake probability** (brighter = more likely manipulated)")
+                            st.image(result["heatmap"], clamp=True, width=320)
                     
+                    if "heatmap" in result:
+                        result["heatmap"] = result["heatmap"].round(4).tolist()
                     display_raw_output(result)
                     
                 finally:
@@ -1348,6 +1544,12 @@ def video_analysis_section():
             help="Higher values analyze more frames but take longer"
         )
         
+        face_crops = st.checkbox(
+            "Focus on faces",
+            value=False,
+            help="Track faces across frames and classify only the face regions"
+        )
+        
         st.warning("""
         ⚠️ **Note**: Video analysis may take several minutes depending on video length 
         and sampling rate. The app will extract frames and analyze each one.
@@ -1377,7 +1579,7 @@ def video_analysis_section():
                 
                 # Analyze video (all frames)
                 with st.spinner(f"🔎 Analyzing {len(frame_paths)} frames..."):
-                    result = deepfake.classify_video(image_model, tmp_path, sample_rate=sample_rate)
+                    result = deepfake.classify_video(image_model, tmp_path, sample_rate=sample_rate, face_crops=face_crops)
                 
                 # Clean up temp files
                 try:
@@ -1530,6 +1732,13 @@ def main():
     # Initialize session state
     init_session_state()
     
+    # Evict idle models in the background (no-op unless MODEL_IDLE_TIMEOUT is set)
+    start_model_reaper()
+    
+    # Warm up models in the background (no-op unless MODEL_WARMUP=1); requests
+    # arriving before it finishes wait on the same load
+    start_model_warmup()
+    
     # Modern Header with Nothing Phone aesthetic
     st.markdown("""
     <div class="main-header">
@@ -1648,6 +1857,23 @@ def main():
                 else:
                     st.error("❌ Model download failed. Please check your internet connection and try again.")
         
+        # Model memory usage (models are evicted when idle or over budget)
+        if IMPORTS_SUCCESS:
+            from detectors import registry
+            with st.expander("🧠 Model Memory"):
+                model_stats = registry.stats()
+                for key, info in registry.memory_report().items():
+                    st.caption(f"{key}: {info['weights_bytes'] / 1e6:.0f} MB, idle {info['idle_seconds']:.0f}s")
+                budget = model_stats["budget_bytes"]
+                st.caption(
+                    f"Resident: {model_stats['resident_bytes'] / 1e6:.0f} MB"
+                    + (f" of {budget / 1e6:.0f} MB budget" if budget else "")
+                )
+                st.caption(f"Evictions: {model_stats['evictions'] or 0} · Reloads: {model_stats['reloads']}")
+                from detectors import warmup
+                for name, state in warmup.status().items():
+                    st.caption(f"{'✅' if state == 'ready' else '🔥'} Warm-up ({name}): {state}")
+        
         st.markdown("<div style='height: 1rem;'></div>", unsafe_allow_html=True)
         
         # Disclaimer with modern design
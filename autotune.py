@@ -0,0 +1,97 @@
+"""
+Inference Autotune Script
+
+Sweeps batch sizes and torch thread counts for the text and image models on
+synthetic inputs, picks the highest-throughput setting within a latency SLO
+and saves it to this host's tuning profile. The loaders apply the profile
+automatically (see detectors/tuning.py).
+
+Usage:
+    python autotune.py [--slo-ms 500] [--batch-sizes 1,2,4,8,16] [--threads 1,2,4]
+    python autotune.py --model image-classification:dima806/deepfake_vs_real_image_detection
+"""
+
+import argparse
+import sys
+
+from dotenv import load_dotenv
+
+from detectors import registry, tuning
+
+# Load environment variables
+load_dotenv()
+
+
+def parse_ints(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def parse_model(value):
+    """Parse "task:model" into (task, model)."""
+    task, sep, model = value.partition(":")
+    if not sep or not model:
+        raise argparse.ArgumentTypeError("expected task:model, e.g. text-classification:org/name")
+    return task, model
+
+
+def default_models():
+    """Every model the app may load (same list as prepare_models.py)."""
+    from detectors import model_prep
+    return [(spec.task, spec.model) for spec in model_prep.configured_models()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune batch size and thread count per model for this host")
+    parser.add_argument("--model", action="append", type=parse_model, help="task:model (repeatable; default: all configured models)")
+    parser.add_argument("--slo-ms", type=float, default=500.0, help="p95 latency objective per batch (ms)")
+    parser.add_argument("--batch-sizes", type=parse_ints, default=tuning.DEFAULT_BATCH_SIZES)
+    parser.add_argument("--threads", type=parse_ints, default=None, help="Intra-op thread counts (default: powers of two up to the core count)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed calls per setting")
+    parser.add_argument("--profile", default=tuning.TUNING_PROFILE, help="Profile path to write")
+    args = parser.parse_args()
+
+    host = tuning.host_signature()
+    print("\n" + "=" * 70)
+    print("🎛️  INFERENCE AUTOTUNE")
+    print("=" * 70)
+    print(f"Host: {host['host']} | Cores: {host['cpu_count']} | CPU: {host['cpu_model'] or 'unknown'}")
+    print(f"SLO: p95 <= {args.slo_ms:.0f} ms per batch")
+
+    tuned = {}
+    for task, model in args.model or default_models():
+        print(f"\n📋 {task}: {model}")
+        try:
+            pipe = registry.get_pipeline(task, model)
+        except Exception as e:
+            print(f"❌ Could not load model: {e}")
+            continue
+
+        try:
+            result = tuning.sweep(
+                pipe, task, args.slo_ms,
+                batch_sizes=args.batch_sizes, thread_counts=args.threads, repeats=args.repeats
+            )
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            continue
+
+        print(f"{'threads':>9}{'batch':>7}{'items/s':>10}{'p95 ms':>10}  SLO")
+        for trial in result["trials"]:
+            print(f"{trial['intra_op_threads']:>9}{trial['batch_size']:>7}{trial['throughput']:>10.1f}{trial['p95_ms']:>10.1f}  {'✓' if trial['slo_met'] else '✗'}")
+
+        best = result["best"]
+        print(f"✅ Best: batch {best['batch_size']}, {best['intra_op_threads']} threads "
+              f"({best['throughput']:.1f} items/s{'' if best['slo_met'] else ', SLO not met'})")
+        tuned[tuning.profile_key(task, model)] = best
+
+    if not tuned:
+        print("\n⚠️ No model could be tuned.")
+        return 1
+
+    tuning.save_profile(tuned, args.profile)
+    print(f"\n🎉 Profile written to {args.profile}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
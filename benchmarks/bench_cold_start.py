@@ -0,0 +1,119 @@
+"""
+Cold-Start Benchmark
+
+Measures time-to-first-prediction of a fresh worker process: interpreter
+start, module import, model load and the first classification. Each run uses
+a new subprocess so nothing is shared between measurements.
+
+Modes:
+    offline-first  Resolve models from the manifest / local caches (default loader)
+    hub-first      MODEL_OFFLINE_FIRST=0: hand model ids straight to transformers
+
+Usage:
+    python benchmarks/bench_cold_start.py [--task text|image] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "offline-first": {},
+    "hub-first": {"MODEL_OFFLINE_FIRST": "0"},
+}
+
+
+def child(task):
+    """Run inside the fresh process: import, load, predict once, report timings."""
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+
+    if task == "text":
+        from detectors import fake_news
+        imported = time.perf_counter()
+        pipe = fake_news.load_text_model(device=-1)
+        loaded = time.perf_counter()
+        fake_news.classify_text(pipe, "Scientists confirm that drinking water is essential for human health.")
+    else:
+        from PIL import Image
+        from detectors import deepfake
+        imported = time.perf_counter()
+        pipe = deepfake.load_image_model(device=-1)
+        loaded = time.perf_counter()
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+            Image.new("RGB", (224, 224), (128, 128, 128)).save(tmp.name)
+        try:
+            deepfake.classify_image(pipe, tmp.name)
+        finally:
+            os.unlink(tmp.name)
+    predicted = time.perf_counter()
+
+    print(json.dumps({
+        "import_s": imported - start,
+        "load_s": loaded - imported,
+        "predict_s": predicted - loaded,
+    }))
+
+
+def run_once(task, env_overrides):
+    """Spawn one cold worker and return its timings plus total wall time."""
+    env = dict(os.environ, **env_overrides)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", task],
+        env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "worker failed")
+
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    timings["first_prediction_s"] = wall
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time-to-first-prediction benchmark")
+    parser.add_argument("--task", choices=["text", "image"], default="text")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", choices=["text", "image"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    print("=" * 70)
+    print("⏱️  COLD-START BENCHMARK")
+    print("=" * 70)
+    print(f"Task: {args.task} | Runs per mode: {args.runs}")
+
+    print(f"\n{'mode':<16}{'import s':>10}{'load s':>10}{'predict s':>11}{'first pred s':>14}")
+    print("-" * 61)
+
+    for mode, env_overrides in MODES.items():
+        try:
+            runs = [run_once(args.task, env_overrides) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{mode:<16}  ❌ {e}")
+            continue
+
+        def median(field):
+            values = sorted(r[field] for r in runs)
+            return values[len(values) // 2]
+
+        print(f"{mode:<16}{median('import_s'):>10.2f}{median('load_s'):>10.2f}{median('predict_s'):>11.2f}{median('first_prediction_s'):>14.2f}")
+
+    print("\nfirst pred s = wall time from process spawn to first prediction (median)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
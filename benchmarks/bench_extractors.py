@@ -0,0 +1,119 @@
+"""
+Article Extractor Benchmark
+
+Runs every registered extractor over a corpus of saved pages and reports
+extraction quality and speed. Each <name>.html in the corpus may have a
+<name>.txt with the expected article body; quality is the token-level
+precision / recall / F1 of the extracted text against it.
+
+Usage:
+    python benchmarks/bench_extractors.py [corpus_dir] [--repeats 20] [--extractors density,newspaper]
+
+The default corpus is tests/fixtures/html.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import extractors  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "html")
+
+
+def tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def overlap_scores(extracted, expected):
+    """Token-level (precision, recall, F1) of extracted text vs the expected text."""
+    got, want = Counter(tokens(extracted)), Counter(tokens(expected))
+    common = sum((got & want).values())
+    if not common:
+        return 0.0, 0.0, 0.0
+    precision = common / sum(got.values())
+    recall = common / sum(want.values())
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+def load_corpus(directory):
+    pages = []
+    for html_path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(html_path, encoding="utf-8") as f:
+            html = f.read()
+        txt_path = html_path[:-len(".html")] + ".txt"
+        expected = None
+        if os.path.exists(txt_path):
+            with open(txt_path, encoding="utf-8") as f:
+                expected = f.read()
+        name = os.path.basename(html_path)[:-len(".html")]
+        pages.append((name, f"https://example.com/{name}", html, expected))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extractor quality and speed benchmark")
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS, help="Directory of .html pages (+ optional .txt gold text)")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed passes over the corpus")
+    parser.add_argument("--extractors", default=",".join(extractors.EXTRACTORS), help="Comma-separated extractor names")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"❌ No .html files in {args.corpus}")
+        return 1
+
+    print("=" * 70)
+    print("📰 ARTICLE EXTRACTOR BENCHMARK")
+    print("=" * 70)
+    print(f"Corpus: {args.corpus} ({len(pages)} pages, {sum(p[3] is not None for p in pages)} with gold text)")
+
+    summary = []
+    for name in [n.strip() for n in args.extractors.split(",") if n.strip()]:
+        engine = extractors.get_extractor(name)
+        print(f"\n🔎 {name}")
+        print(f"{'page':<24}{'chars':>8}{'precision':>11}{'recall':>8}{'F1':>7}")
+
+        f1s = []
+        for page, url, html, expected in pages:
+            try:
+                result = engine.extract(url, html)
+            except Exception as e:
+                print(f"{page:<24}  ❌ {e}")
+                f1s.append(0.0)
+                continue
+            if expected is None:
+                print(f"{page:<24}{len(result['text']):>8}{'-':>11}{'-':>8}{'-':>7}")
+                continue
+            precision, recall, f1 = overlap_scores(result["text"], expected)
+            f1s.append(f1)
+            print(f"{page:<24}{len(result['text']):>8}{precision:>11.2f}{recall:>8.2f}{f1:>7.2f}")
+
+        # Untimed pass already done above (imports, warm caches)
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            for _, url, html, _ in pages:
+                try:
+                    engine.extract(url, html)
+                except Exception:
+                    pass
+        elapsed = time.perf_counter() - start
+        pages_per_second = args.repeats * len(pages) / elapsed
+        mean_f1 = sum(f1s) / len(f1s) if f1s else float("nan")
+        summary.append((name, mean_f1, pages_per_second))
+
+    print(f"\n{'extractor':<14}{'mean F1':>9}{'pages/s':>10}")
+    print("-" * 33)
+    for name, mean_f1, pages_per_second in summary:
+        print(f"{name:<14}{mean_f1:>9.2f}{pages_per_second:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
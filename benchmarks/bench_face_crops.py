@@ -0,0 +1,106 @@
+"""
+Face-Crop vs Whole-Frame Benchmark
+
+Compares the speed and accuracy of face-focused deepfake scoring
+(deepfake.classify_image_faces) against whole-frame scoring
+(deepfake.classify_image) on a local folder of labelled images.
+
+Fixture layout:
+    <fixtures>/real/*.jpg|png|webp
+    <fixtures>/fake/*.jpg|png|webp
+
+Usage:
+    python benchmarks/bench_face_crops.py path/to/fixtures [--model MODEL]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detectors import deepfake
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def load_fixtures(root):
+    """Collect (path, expected_label) pairs from the real/ and fake/ folders."""
+    fixtures = []
+    for folder, label in (("real", "Real"), ("fake", "Deepfake")):
+        directory = os.path.join(root, folder)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                fixtures.append((os.path.join(directory, name), label))
+    return fixtures
+
+
+def run_mode(name, classify, fixtures):
+    """Classify every fixture with one mode and collect timing and accuracy."""
+    correct = 0
+    with_faces = 0
+    latencies = []
+
+    for path, expected in fixtures:
+        start = time.perf_counter()
+        result = classify(path)
+        latencies.append(time.perf_counter() - start)
+
+        if result["label"] == expected:
+            correct += 1
+        if result.get("face_count", 0) > 0:
+            with_faces += 1
+
+    latencies.sort()
+    return {
+        "mode": name,
+        "accuracy": correct / len(fixtures),
+        "mean_ms": 1000 * sum(latencies) / len(latencies),
+        "p95_ms": 1000 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "with_faces": with_faces,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Face-crop vs whole-frame deepfake benchmark")
+    parser.add_argument("fixtures", help="Folder containing real/ and fake/ image folders")
+    parser.add_argument("--model", default=None, help="Override IMAGE_MODEL (hub id or local path)")
+    args = parser.parse_args()
+
+    if args.model:
+        deepfake.IMAGE_MODEL = args.model
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"❌ No fixtures found under {args.fixtures} (expected real/ and fake/ folders)")
+        return 1
+
+    print("=" * 70)
+    print("🧪 FACE-CROP vs WHOLE-FRAME BENCHMARK")
+    print("=" * 70)
+    print(f"Model: {deepfake.IMAGE_MODEL}")
+    print(f"Fixtures: {len(fixtures)} images")
+
+    pipe = deepfake.load_image_model(device=-1)
+
+    # Warm up once so the first timed image does not pay for lazy initialization
+    deepfake.classify_image(pipe, fixtures[0][0])
+
+    results = [
+        run_mode("whole-frame", lambda path: deepfake.classify_image(pipe, path), fixtures),
+        run_mode("faces", lambda path: deepfake.classify_image_faces(pipe, path), fixtures),
+    ]
+
+    print(f"\n{'mode':<14}{'accuracy':>10}{'mean ms':>12}{'p95 ms':>12}{'faces found':>14}")
+    print("-" * 62)
+    for r in results:
+        print(f"{r['mode']:<14}{r['accuracy']:>10.2%}{r['mean_ms']:>12.1f}{r['p95_ms']:>12.1f}{r['with_faces']:>10}/{len(fixtures)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
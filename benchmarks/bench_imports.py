@@ -0,0 +1,78 @@
+"""
+Import-Time Benchmark
+
+Imports each entry point in a fresh interpreter (`python -X importtime`) and
+reports its cumulative import time against a budget, plus any heavy
+dependency (torch, transformers, cv2, newspaper3k, newsapi) it pulls in.
+The heavy-module check also runs in the unit tests; the timings live here
+because wall-clock budgets are unreliable on loaded CI machines.
+
+Usage:
+    python benchmarks/bench_imports.py [--runs 3] [module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = {"torch", "transformers", "cv2", "newspaper", "newsapi"}
+
+# Entry point -> import-time budget in seconds
+BUDGETS = {
+    "detectors": 0.5,
+    "detectors.fake_news_offline": 0.5,
+    "detectors.fake_news": 0.5,
+    "detectors.deepfake": 1.0,
+    "detectors.ensemble": 1.0,
+    "utils": 0.5,
+    "utils.scraper": 0.5,
+    "utils.newsapi_client": 0.5,
+}
+
+
+def import_time(module):
+    """Return (heavy top-level modules loaded, cumulative seconds) for `import <module>`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    loaded = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            loaded[name.strip()] = int(cumulative) / 1e6
+    heavy = {name.split(".")[0] for name in loaded} & HEAVY
+    return heavy, loaded.get(module, 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entry point import-time benchmark")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS), help="Modules to import (default: all entry points)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh imports per module (best is reported)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱️  IMPORT-TIME BENCHMARK")
+    print("=" * 70)
+    print(f"{'module':<32}{'best s':>8}{'budget':>8}  heavy")
+
+    over_budget = 0
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(max(1, args.runs))]
+        seconds = min(s for _, s in runs)
+        heavy = set().union(*(h for h, _ in runs))
+        budget = BUDGETS.get(module)
+        flag = "❌" if budget is not None and seconds >= budget else "✓"
+        over_budget += flag == "❌"
+        print(f"{module:<32}{seconds:>8.3f}{budget if budget is not None else '-':>8}  {', '.join(sorted(heavy)) or '-'} {flag}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Pipeline Pool Stress Benchmark
+
+Hammers a text or image model from many threads at once and compares:
+
+    shared      every thread calls the same pipeline object (current app behaviour)
+    pool-N      threads check out one of N weight-sharing replicas
+
+Every prediction is compared with a single-threaded reference run, so races
+show up as errors or wrong results; latency is reported as p50 / p99.
+
+Usage:
+    python benchmarks/bench_pool.py [--task text|image] [--model NAME] [--threads 8] [--requests 20] [--sizes 1,2,4]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detectors import registry  # noqa: E402
+from detectors.pool import PipelinePool  # noqa: E402
+
+TEXTS = [
+    "Scientists confirm that drinking water is essential for human health.",
+    "SHOCKING: this one weird trick cures every disease, doctors hate it!!!",
+    "The central bank left interest rates unchanged on Thursday, officials said.",
+    "Aliens secretly control the government, leaked documents reveal.",
+]
+
+
+def make_inputs(task):
+    if task == "text":
+        return TEXTS
+    from PIL import Image
+    return [Image.new("RGB", (224, 224), color) for color in ((0, 0, 0), (128, 128, 128), (255, 255, 255), (200, 50, 50))]
+
+
+def top_label(output):
+    first = output[0] if isinstance(output, list) else output
+    return first["label"], round(first["score"], 4)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def stress(target, inputs, reference, threads, requests_per_thread):
+    """Run requests from many threads; return latencies (ms), wrong results, errors and wall time."""
+    latencies, wrong, errors = [], [0], [0]
+    lock = threading.Lock()
+
+    def worker(offset):
+        for i in range(requests_per_thread):
+            idx = (offset + i) % len(inputs)
+            start = time.perf_counter()
+            try:
+                result = top_label(target(inputs[idx]))
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if result[0] != reference[idx][0] or abs(result[1] - reference[idx][1]) > 1e-3:
+                    wrong[0] += 1
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return latencies, wrong[0], errors[0], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent pipeline pool stress test")
+    parser.add_argument("--task", choices=["text", "image"], default="text")
+    parser.add_argument("--model", help="Model id or local path (default: TEXT_MODEL / IMAGE_MODEL)")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per thread")
+    parser.add_argument("--sizes", default="1,2,4", help="Pool sizes to compare")
+    args = parser.parse_args()
+
+    if args.task == "text":
+        from detectors import fake_news
+        base = registry.get_pipeline("text-classification", args.model or fake_news.TEXT_MODEL)
+    else:
+        from detectors import deepfake
+        base = registry.get_pipeline("image-classification", args.model or deepfake.IMAGE_MODEL)
+
+    inputs = make_inputs(args.task)
+    reference = [top_label(base(item)) for item in inputs]
+
+    print("=" * 70)
+    print("🏋️  PIPELINE POOL STRESS TEST")
+    print("=" * 70)
+    print(f"Task: {args.task} | Threads: {args.threads} | Requests/thread: {args.requests} | Cores: {os.cpu_count()}")
+
+    print(f"\n{'mode':<10}{'req/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'wrong':>8}{'errors':>8}")
+    print("-" * 55)
+
+    modes = [("shared", base)]
+    modes += [(f"pool-{n}", PipelinePool(base, size=n)) for n in (int(s) for s in args.sizes.split(",") if s.strip())]
+
+    failed = False
+    for name, target in modes:
+        latencies, wrong, errors, wall = stress(target, inputs, reference, args.threads, args.requests)
+        if latencies:
+            print(f"{name:<10}{len(latencies) / wall:>9.1f}{percentile(latencies, 50):>10.1f}{percentile(latencies, 99):>10.1f}{wrong:>8}{errors:>8}")
+        else:
+            print(f"{name:<10}  ❌ every request failed ({errors} errors)")
+        failed |= name != "shared" and (wrong or errors)
+
+    print("\nwrong = predictions that differ from the single-threaded reference")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,24 @@
 Detectors package for FakeNews + Deepfake Detector
 
 This package contains detection modules for fake news and deepfakes.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+one detector (e.g. the rule-based fake_news_offline) does not pull in torch
+or transformers for the others.
 """
 
-from . import fake_news
-from . import deepfake
+import importlib
+
+__all__ = ['fake_news', 'deepfake', 'ensemble']
+
+_SUBMODULES = set(__all__) | {'fake_news_offline', 'registry', 'model_cache', 'model_prep', 'warmup', 'pool', 'tuning', 'compiled'}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ['fake_news', 'deepfake']
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,227 @@
+"""
+Compiled Execution Module
+
+Opt-in torch.compile mode (inductor CPU backend) for the text and image
+classifiers, for long-running workers. Set MODEL_COMPILE=1.
+
+Recompiling per request would cost seconds, so every forward pass is padded
+to a fixed bucket before it reaches the compiled model:
+
+- batch size -> the next size in MODEL_COMPILE_BATCH_BUCKETS (rows repeated)
+- text length -> the next length in MODEL_COMPILE_SEQ_BUCKETS (masked padding)
+
+and the logits are sliced back to the real batch. Each bucket compiles once,
+on first use (or during warm-up). Compiled graphs are cached on disk
+(TORCHINDUCTOR_CACHE_DIR, default <MODEL_CACHE_DIR>/inductor) so a restarted
+worker reuses them. If compilation fails the model falls back to eager mode.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import model_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_COMPILE = os.getenv("MODEL_COMPILE", "0") == "1"
+
+BATCH_BUCKETS = sorted(int(n) for n in os.getenv("MODEL_COMPILE_BATCH_BUCKETS", "1,2,4,8").split(",") if n.strip())
+SEQ_BUCKETS = sorted(int(n) for n in os.getenv("MODEL_COMPILE_SEQ_BUCKETS", "128,256,512").split(",") if n.strip())
+
+# Read before torch is imported: torch fills in its own default later
+INDUCTOR_CACHE_DIR = os.getenv("TORCHINDUCTOR_CACHE_DIR") or os.path.join(model_cache.MODEL_CACHE_DIR, "inductor")
+
+# Text inputs padded along the sequence axis, with their padding value (None: pad_token_id)
+_SEQUENCE_INPUTS = {"input_ids": None, "attention_mask": 0, "token_type_ids": 0}
+
+_disk_cache = {"dir": None}
+_disk_cache_lock = threading.Lock()
+
+
+def enable_disk_cache(cache_dir: Optional[str] = None) -> str:
+    """
+    Keep inductor's compiled artifacts on disk across restarts.
+
+    The cache location is process-wide (inductor reads it from the
+    environment), so it is configured once, by the first call; later calls
+    return the directory already in use.
+
+    Args:
+        cache_dir (str): Cache directory (default: INDUCTOR_CACHE_DIR)
+
+    Returns:
+        str: The cache directory in use
+    """
+    with _disk_cache_lock:
+        if _disk_cache["dir"] is None:
+            directory = cache_dir or INDUCTOR_CACHE_DIR
+            os.environ["TORCHINDUCTOR_CACHE_DIR"] = directory
+            os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+            os.makedirs(directory, exist_ok=True)
+
+            import torch._inductor.config as inductor_config
+            inductor_config.fx_graph_cache = True
+            _disk_cache["dir"] = directory
+        elif cache_dir and cache_dir != _disk_cache["dir"]:
+            logger.warning(f"Inductor cache already set to {_disk_cache['dir']}; ignoring {cache_dir}")
+        return _disk_cache["dir"]
+
+
+def _bucket(value: int, buckets: List[int]) -> Optional[int]:
+    """Smallest bucket >= value, or None if the value exceeds every bucket."""
+    return next((b for b in buckets if b >= value), None)
+
+
+class CompiledModel:
+    """
+    Drop-in replacement for a pipeline's model that runs bucketed inputs through torch.compile.
+
+    Attribute access (config, device, dtype, forward, ...) is forwarded to the
+    wrapped model, so pipelines keep working unchanged.
+
+    Example:
+        >>> pipe.model = CompiledModel(pipe.model)
+        >>> pipe("Some news text")
+        >>> pipe.model.stats()
+        {'compiled_buckets': [(1, 128)], 'eager_calls': 0, 'fallback': None}
+    """
+
+    def __init__(self, model, batch_buckets: Optional[List[int]] = None, seq_buckets: Optional[List[int]] = None):
+        """
+        Args:
+            model: Hugging Face model (torch.nn.Module)
+            batch_buckets (List[int]): Batch sizes to compile (default: BATCH_BUCKETS)
+            seq_buckets (List[int]): Sequence lengths to compile for text models (default: SEQ_BUCKETS)
+        """
+        import torch
+
+        self.model = model
+        self.batch_buckets = sorted(batch_buckets or BATCH_BUCKETS)
+        self.seq_buckets = sorted(seq_buckets or SEQ_BUCKETS)
+        self.fallback: Optional[str] = None
+        self.eager_calls = 0
+
+        self._compiled_buckets = set()
+        self._compile_lock = threading.Lock()
+
+        # One graph per bucket; make sure dynamo keeps all of them
+        config = torch._dynamo.config
+        limit_name = "recompile_limit" if hasattr(config, "recompile_limit") else "cache_size_limit"
+        needed = len(self.batch_buckets) * len(self.seq_buckets) + 2
+        setattr(config, limit_name, max(getattr(config, limit_name), needed))
+
+        try:
+            enable_disk_cache()
+            self._compiled = torch.compile(model, backend="inductor", dynamic=False)
+        except Exception as e:
+            self._fail(e)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.__dict__["model"], name)
+
+    def _fail(self, error: Exception):
+        self.fallback = f"{type(error).__name__}: {str(error)[:200]}"
+        self._compiled = None
+        logger.warning(f"torch.compile failed, falling back to eager mode: {self.fallback}")
+
+    def _pad(self, inputs: Dict[str, Any]) -> Tuple[Optional[Tuple[int, int]], Dict[str, Any]]:
+        """Pad inputs to their bucket; returns (bucket, padded inputs) or (None, inputs) if no bucket fits."""
+        import torch
+
+        tensors = {k: v for k, v in inputs.items() if torch.is_tensor(v)}
+        if not tensors:
+            return None, inputs
+        batch = next(iter(tensors.values())).shape[0]
+        batch_bucket = _bucket(batch, self.batch_buckets)
+
+        seq_bucket = 0
+        if "input_ids" in inputs:
+            seq_bucket = _bucket(inputs["input_ids"].shape[1], self.seq_buckets)
+        if batch_bucket is None or seq_bucket is None:
+            return None, inputs
+
+        pad_token_id = getattr(self.model.config, "pad_token_id", None) or 0
+        padded = dict(inputs)
+        for name, tensor in tensors.items():
+            if batch_bucket > batch:
+                # Repeat the first row: padded rows stay numerically well-behaved and are sliced off
+                tensor = torch.cat([tensor, tensor[:1].expand(batch_bucket - batch, *tensor.shape[1:])])
+            if name in _SEQUENCE_INPUTS and seq_bucket > tensor.shape[1]:
+                value = _SEQUENCE_INPUTS[name]
+                fill = tensor.new_full((tensor.shape[0], seq_bucket - tensor.shape[1]), pad_token_id if value is None else value)
+                tensor = torch.cat([tensor, fill], dim=1)
+            padded[name] = tensor
+        return (batch_bucket, seq_bucket), padded
+
+    def __call__(self, *args, **inputs):
+        if args or self._compiled is None:
+            self.eager_calls += 1
+            return self.model(*args, **inputs)
+
+        bucket, padded = self._pad(inputs)
+        if bucket is None:
+            # Larger than every bucket: run eagerly rather than compile a new shape
+            self.eager_calls += 1
+            return self.model(**inputs)
+
+        batch = next(v for v in inputs.values() if hasattr(v, "shape")).shape[0]
+
+        if bucket in self._compiled_buckets:
+            compiled = self._compiled
+            try:
+                # A guard failure can still trigger a recompile here, which may fail too
+                outputs = compiled(**padded) if compiled is not None else None
+            except Exception as e:
+                with self._compile_lock:
+                    if self._compiled is compiled:
+                        self._fail(e)
+                outputs = None
+            if outputs is None:
+                self.eager_calls += 1
+                return self.model(**inputs)
+        else:
+            with self._compile_lock:
+                if self._compiled is None:
+                    self.eager_calls += 1
+                    return self.model(**inputs)
+                try:
+                    outputs = self._compiled(**padded)
+                    self._compiled_buckets.add(bucket)
+                    logger.info(f"Compiled bucket batch={bucket[0]} seq={bucket[1]}")
+                except Exception as e:
+                    self._fail(e)
+                    self.eager_calls += 1
+                    return self.model(**inputs)
+
+        return type(outputs)(logits=outputs.logits[:batch])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Compilation state.
+
+        Returns:
+            Dict[str, Any]: compiled_buckets (batch, seq) pairs, eager_calls and the fallback reason (or None)
+        """
+        return {
+            "compiled_buckets": sorted(self._compiled_buckets),
+            "eager_calls": self.eager_calls,
+            "fallback": self.fallback,
+        }
+
+
+def compile_pipeline(pipe) -> Any:
+    """
+    Switch a pipeline to compiled execution (in place).
+
+    Returns:
+        The same pipeline, whose model is now a CompiledModel
+    """
+    if not isinstance(pipe.model, CompiledModel):
+        pipe.model = CompiledModel(pipe.model)
+    return pipe
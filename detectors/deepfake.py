@@ -8,10 +8,14 @@ Model: prithivMLmods/Deep-Fake-Detector-v2-Model
 """
 
 import logging
+import math
 import os
-from typing import Dict, Any, List
-from transformers import pipeline
-from utils import video_utils
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from utils import video_utils, face_utils
+
+from . import registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,17 +25,28 @@ logger = logging.getLogger(__name__)
 HF_TOKEN = os.getenv("HUGGINGFACE_TOKEN", None)
 IMAGE_MODEL = os.getenv("IMAGE_MODEL", "prithivMLmods/Deep-Fake-Detector-v2-Model")
 
+# Images per forward pass for crops / tiles when the host has no tuning profile
+DEFAULT_BATCH_SIZE = 8
+
+
+def pipeline(*args, **kwargs):
+    """Build a transformers pipeline; transformers is imported on first use."""
+    from transformers import pipeline as _pipeline
+    return _pipeline(*args, **kwargs)
 
-def load_image_model(device: int = -1):
+
+def load_image_model(device: int = -1, model_name: Optional[str] = None):
     """
     Load the deepfake detection model pipeline.
     
     Args:
         device (int): Device to run inference on.
                      -1 for CPU (default), 0 for GPU, 1+ for multi-GPU setups.
+        model_name (str): Hugging Face model id (default: IMAGE_MODEL)
     
     Returns:
-        Pipeline: A Hugging Face image-classification pipeline ready for inference.
+        ManagedModel: Shared handle to a Hugging Face image-classification pipeline,
+                      ready for inference (reloads transparently if evicted).
     
     Raises:
         Exception: If model loading fails (network issues, memory, etc.)
@@ -40,22 +55,23 @@ def load_image_model(device: int = -1):
         >>> pipe = load_image_model(device=-1)
         >>> # Model is now ready for classification
     """
+    model_name = model_name or IMAGE_MODEL
+    
     try:
-        logger.info(f"Loading deepfake detection model: {IMAGE_MODEL}")
-        
-        # Prepare pipeline arguments
-        pipeline_kwargs = {
-            "model": IMAGE_MODEL,
-            "device": device
-        }
+        logger.info(f"Loading deepfake detection model: {model_name}")
         
         # Add token if available (for private models or avoiding rate limits)
         if HF_TOKEN:
-            pipeline_kwargs["token"] = HF_TOKEN
             logger.info("Using Hugging Face authentication token")
         
-        # Load the image-classification pipeline with the specified model
-        image_pipeline = pipeline("image-classification", **pipeline_kwargs)
+        # Load (or reuse) the image-classification pipeline through the shared registry
+        image_pipeline = registry.load(
+            "image-classification",
+            model_name,
+            device=device,
+            token=HF_TOKEN,
+            factory=pipeline
+        )
         
         logger.info("✓ Deepfake model loaded successfully")
         return image_pipeline
@@ -65,13 +81,17 @@ def load_image_model(device: int = -1):
         raise
 
 
-def classify_image(pipe, image_path: str) -> Dict[str, Any]:
+def classify_image(pipe, image_path: str, face_crops: bool = False, tiled: bool = False) -> Dict[str, Any]:
     """
     Classify an image as deepfake or real.
     
     Args:
         pipe: The loaded Hugging Face pipeline from load_image_model()
         image_path (str): Path to the image file to analyze
+        face_crops (bool): Classify only detected face regions instead of the
+                           whole frame (see classify_image_faces())
+        tiled (bool): Classify overlapping full-resolution tiles instead of a
+                      downscaled frame (see classify_image_tiled())
     
     Returns:
         Dict[str, Any]: Classification result containing:
@@ -88,6 +108,11 @@ def classify_image(pipe, image_path: str) -> Dict[str, Any]:
         >>> result = classify_image(pipe, "photo.jpg")
         >>> print(f"{result['label']} (confidence: {result['score']:.2%})")
     """
+    if face_crops:
+        return classify_image_faces(pipe, image_path)
+    if tiled:
+        return classify_image_tiled(pipe, image_path)
+    
     try:
         # Run inference
         raw_results = pipe(image_path)
@@ -116,7 +141,388 @@ def classify_image(pipe, image_path: str) -> Dict[str, Any]:
         raise
 
 
-def classify_video(pipe, video_path: str, sample_rate: int = 1) -> Dict[str, Any]:
+def classify_image_faces(
+    pipe,
+    image_path: str,
+    margin: float = 0.25,
+    batch_size: Optional[int] = None,
+    aggregate: str = "max"
+) -> Dict[str, Any]:
+    """
+    Classify an image by scoring only its face regions.
+    
+    Most deepfake artifacts live in the face, while most pixels are background.
+    Faces are located once with OpenCV's bundled cascades, all face crops are
+    classified in a single batched call, and the per-face scores are aggregated.
+    Falls back to whole-frame classification when no face is found.
+    
+    Args:
+        pipe: The loaded Hugging Face pipeline from load_image_model()
+        image_path (str): Path to the image file to analyze
+        margin (float): Context margin around each face box (default: 0.25)
+        batch_size (int): Maximum crops per forward pass (default: tuned, else 8)
+        aggregate (str): "max" (any manipulated face flags the image) or "mean"
+    
+    Returns:
+        Dict[str, Any]: Classification result containing:
+            - label (str): Human-readable label ("Deepfake" or "Real")
+            - score (float): Confidence of the label (0-1)
+            - face_count (int): Number of faces classified
+            - faces (List[Dict]): Per-face box and deepfake probability
+            - raw (Dict): Aggregation details including the method used
+    
+    Raises:
+        FileNotFoundError: If the image cannot be read
+        Exception: If classification fails
+    
+    Example:
+        >>> pipe = load_image_model()
+        >>> result = classify_image_faces(pipe, "photo.jpg")
+        >>> print(f"{result['label']} ({result['face_count']} faces)")
+    """
+    image = face_utils.load_rgb_array(image_path)
+    if image is None:
+        raise FileNotFoundError(f"Could not read image: {image_path}")
+    
+    try:
+        boxes = face_utils.detect_faces(image)
+        
+        if boxes:
+            items = [Image.fromarray(crop) for crop in face_utils.crop_faces(image, boxes, margin=margin)]
+        else:
+            logger.info("No faces found, classifying the whole frame")
+            items = [Image.fromarray(image)]
+        
+        fake_probs = _classify_batch(pipe, items, batch_size=batch_size)
+        result = _aggregate_faces(boxes, fake_probs, aggregate=aggregate)
+        
+        logger.info(f"Face classification: {result['label']} (confidence: {result['score']:.4f}, faces: {len(boxes)})")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Face classification failed: {e}")
+        raise
+
+
+def _resolve_batch_size(pipe, batch_size: Optional[int] = None) -> int:
+    """An explicit batch size, else the host's tuned one, else DEFAULT_BATCH_SIZE."""
+    if batch_size:
+        return batch_size
+    tuned = getattr(pipe, "tuned_batch_size", None)
+    return tuned if isinstance(tuned, int) and tuned > 0 else DEFAULT_BATCH_SIZE
+
+
+def _classify_batch(pipe, images: List[Image.Image], batch_size: Optional[int] = None) -> List[float]:
+    """
+    Run a list of images through the pipeline in one batched call.
+    
+    Args:
+        pipe: The loaded Hugging Face pipeline
+        images (List[Image.Image]): Decoded images or crops
+        batch_size (int): Maximum images per forward pass
+                         (default: the host's tuned batch size, else DEFAULT_BATCH_SIZE)
+    
+    Returns:
+        List[float]: Deepfake probability for each image, in input order
+    """
+    if not images:
+        return []
+    
+    raw_results = pipe(images, batch_size=_resolve_batch_size(pipe, batch_size))
+    
+    # A single input may come back as a flat list of predictions
+    if raw_results and isinstance(raw_results[0], dict):
+        raw_results = [raw_results]
+    
+    return [_fake_probability(pipe, predictions) for predictions in raw_results]
+
+
+def _fake_probability(pipe, predictions: List[Dict[str, Any]]) -> float:
+    """
+    Extract the deepfake probability from one image's predictions.
+    
+    Args:
+        pipe: The pipeline object with model config
+        predictions (List[Dict]): Label/score predictions for one image
+    
+    Returns:
+        float: Probability that the image is a deepfake (0-1)
+    """
+    for prediction in predictions:
+        if _map_label_to_human(pipe, prediction["label"]) == "Deepfake":
+            return float(prediction["score"])
+    
+    # Only the "real" label was returned; its complement is the fake probability
+    top = predictions[0]
+    if _map_label_to_human(pipe, top["label"]) == "Real":
+        return 1.0 - float(top["score"])
+    
+    return 0.0
+
+
+def _aggregate_scores(fake_probs: List[float], aggregate: str = "max") -> float:
+    """
+    Reduce region-level deepfake probabilities to one value.
+    
+    Args:
+        fake_probs (List[float]): Deepfake probability per region
+        aggregate (str): "max" (any manipulated region flags the image) or "mean"
+    
+    Returns:
+        float: Aggregated deepfake probability
+    
+    Raises:
+        ValueError: If the aggregate method is unknown
+    """
+    if aggregate == "max":
+        return max(fake_probs)
+    if aggregate == "mean":
+        return sum(fake_probs) / len(fake_probs)
+    raise ValueError(f"Unknown aggregate: {aggregate}")
+
+
+def _aggregate_faces(boxes: List, fake_probs: List[float], aggregate: str = "max") -> Dict[str, Any]:
+    """
+    Combine per-face deepfake probabilities into one image-level result.
+    
+    Args:
+        boxes (List): Face boxes, or an empty list for whole-frame scoring
+        fake_probs (List[float]): Deepfake probability per face (or per frame)
+        aggregate (str): "max" or "mean"
+    
+    Returns:
+        Dict[str, Any]: Result in the same shape as classify_image()
+    """
+    fake_probability = _aggregate_scores(fake_probs, aggregate)
+    is_fake = fake_probability >= 0.5
+    
+    return {
+        "label": "Deepfake" if is_fake else "Real",
+        "score": fake_probability if is_fake else 1.0 - fake_probability,
+        "face_count": len(boxes),
+        "faces": [
+            {"box": list(box), "fake_probability": prob}
+            for box, prob in zip(boxes, fake_probs)
+        ],
+        "raw": {
+            "method": "faces" if boxes else "whole-frame",
+            "aggregate": aggregate,
+            "fake_probability": fake_probability
+        }
+    }
+
+
+def classify_image_tiled(
+    pipe,
+    image_path: str,
+    tile_size: Optional[int] = None,
+    overlap: float = 0.25,
+    max_tiles: int = 16,
+    batch_size: Optional[int] = None,
+    aggregate: str = "max"
+) -> Dict[str, Any]:
+    """
+    Classify a high-resolution image as a batch of overlapping tiles.
+    
+    Downscaling a large photo to the model's input size erases the local
+    artifacts the classifier looks for. Instead, the image is cut into
+    overlapping tiles at (close to) native resolution, all tiles run through
+    the model in one batched call, and the per-tile scores are aggregated.
+    If the grid would exceed `max_tiles`, the tiles are enlarged until it fits,
+    which bounds the compute spent per image.
+    
+    Args:
+        pipe: The loaded Hugging Face pipeline from load_image_model()
+        image_path (str): Path to the image file to analyze
+        tile_size (int): Tile edge in pixels (default: the model's input size)
+        overlap (float): Fraction of overlap between neighbouring tiles (default: 0.25)
+        max_tiles (int): Compute budget - maximum number of tiles (default: 16)
+        batch_size (int): Maximum tiles per forward pass (default: tuned, else 8)
+        aggregate (str): "max" or "mean"
+    
+    Returns:
+        Dict[str, Any]: Classification result containing:
+            - label (str): Human-readable label ("Deepfake" or "Real")
+            - score (float): Confidence of the label (0-1)
+            - tile_count (int): Number of tiles classified
+            - heatmap (np.ndarray): Deepfake probability per tile, shape (rows, cols)
+            - raw (Dict): Tiling and aggregation details
+    
+    Raises:
+        FileNotFoundError: If the image file doesn't exist
+        Exception: If classification fails
+    
+    Example:
+        >>> pipe = load_image_model()
+        >>> result = classify_image_tiled(pipe, "photo_4k.jpg", max_tiles=12)
+        >>> print(result["label"], result["heatmap"].shape)
+    """
+    if not os.path.exists(image_path):
+        raise FileNotFoundError(f"Image file not found: {image_path}")
+    
+    try:
+        image = Image.open(image_path).convert("RGB")
+        width, height = image.size
+        
+        tile = tile_size or _model_input_size(pipe)
+        xs, ys, tile = _tile_grid(width, height, tile, overlap, max_tiles)
+        
+        tiles = [image.crop((x, y, x + tile, y + tile)) for y in ys for x in xs]
+        fake_probs = _classify_batch(pipe, tiles, batch_size=batch_size)
+        
+        heatmap = np.array(fake_probs, dtype=np.float32).reshape(len(ys), len(xs))
+        fake_probability = _aggregate_scores(fake_probs, aggregate)
+        is_fake = fake_probability >= 0.5
+        
+        logger.info(f"Tiled classification: {len(tiles)} tiles of {tile}px, fake probability {fake_probability:.4f}")
+        
+        return {
+            "label": "Deepfake" if is_fake else "Real",
+            "score": fake_probability if is_fake else 1.0 - fake_probability,
+            "tile_count": len(tiles),
+            "heatmap": heatmap,
+            "raw": {
+                "method": "tiles",
+                "aggregate": aggregate,
+                "fake_probability": fake_probability,
+                "tile_size": tile,
+                "grid": [len(ys), len(xs)]
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"Tiled classification failed: {e}")
+        raise
+
+
+def _model_input_size(pipe, default: int = 224) -> int:
+    """
+    Read the square input size the pipeline's image processor resizes to.
+    
+    Args:
+        pipe: The loaded Hugging Face pipeline
+        default (int): Size to use if the processor config is unavailable
+    
+    Returns:
+        int: Input edge length in pixels
+    """
+    try:
+        size = pipe.image_processor.size
+        if isinstance(size, dict):
+            return int(size.get("height") or size.get("shortest_edge") or default)
+        return int(size)
+    except Exception:
+        return default
+
+
+def _tile_positions(length: int, tile: int, overlap: float, max_count: Optional[int] = None) -> List[int]:
+    """Evenly spaced tile offsets along one axis, with the last tile flush to the edge."""
+    if length <= tile:
+        return [0]
+    stride = max(1, int(tile * (1 - overlap)))
+    count = math.ceil((length - tile) / stride) + 1
+    if max_count:
+        count = max(1, min(count, max_count))
+    if count == 1:
+        return [(length - tile) // 2]
+    return [int(round(i * (length - tile) / (count - 1))) for i in range(count)]
+
+
+def _tile_grid(width: int, height: int, tile: int, overlap: float, max_tiles: int) -> Tuple[List[int], List[int], int]:
+    """
+    Lay out overlapping square tiles, enlarging them until the grid fits the budget.
+    
+    Args:
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        tile (int): Preferred tile edge in pixels
+        overlap (float): Fraction of overlap between neighbouring tiles
+        max_tiles (int): Maximum number of tiles
+    
+    Returns:
+        Tuple: (x offsets, y offsets, final tile edge)
+    """
+    tile = min(tile, width, height)
+    while True:
+        xs = _tile_positions(width, tile, overlap)
+        ys = _tile_positions(height, tile, overlap)
+        if len(xs) * len(ys) <= max(1, max_tiles):
+            return xs, ys, tile
+        if tile >= min(width, height):
+            # Tiles cannot grow any further (very elongated image): spread fewer
+            # tiles along the long side, accepting gaps between them
+            if width >= height:
+                return _tile_positions(width, tile, overlap, max_count=max_tiles // len(ys)), ys, tile
+            return xs, _tile_positions(height, tile, overlap, max_count=max_tiles // len(xs)), tile
+        tile = min(min(width, height), int(math.ceil(tile * 1.25)))
+
+
+def _classify_frames_by_faces(
+    pipe,
+    frame_paths: List[str],
+    margin: float = 0.25,
+    batch_size: Optional[int] = None,
+    aggregate: str = "max"
+) -> List[Dict[str, Any]]:
+    """
+    Classify video frames by their face regions, tracking faces across frames.
+    
+    Faces are tracked with face_utils.FaceTracker so full-frame detection runs
+    only every few frames. Frames are decoded and classified in chunks of
+    batch_size frames (the tracker carries over between chunks), so memory
+    stays flat however long the video is. A chunk that fails to classify is
+    logged and skipped, like a failed frame in the whole-frame path.
+    
+    Args:
+        pipe: The loaded Hugging Face pipeline
+        frame_paths (List[str]): Consecutive sampled frames
+        margin (float): Context margin around each face box
+        batch_size (int): Frames per chunk and maximum crops per forward pass
+                         (default: the host's tuned batch size, else DEFAULT_BATCH_SIZE)
+        aggregate (str): Per-frame aggregation ("max" or "mean")
+    
+    Returns:
+        List[Dict[str, Any]]: One classify_image_faces()-style result per classified frame
+    """
+    batch_size = _resolve_batch_size(pipe, batch_size)
+    tracker = face_utils.FaceTracker()
+    results = []
+    crop_count = 0
+    
+    for chunk_start in range(0, len(frame_paths), batch_size):
+        chunk_end = min(chunk_start + batch_size, len(frame_paths))
+        items: List[Image.Image] = []
+        frames = []  # (boxes, start index into items, item count)
+        for i in range(chunk_start, chunk_end):
+            image = face_utils.load_rgb_array(frame_paths[i])
+            if image is None:
+                logger.warning(f"Failed to read frame {i+1}: {frame_paths[i]}")
+                continue
+            
+            boxes = tracker.update(image)
+            start = len(items)
+            if boxes:
+                items.extend(Image.fromarray(crop) for crop in face_utils.crop_faces(image, boxes, margin=margin))
+            else:
+                items.append(Image.fromarray(image))
+            frames.append((boxes, start, len(items) - start))
+        
+        try:
+            fake_probs = _classify_batch(pipe, items, batch_size=batch_size)
+        except Exception as e:
+            logger.warning(f"Failed to classify frames {chunk_start+1}-{chunk_end}: {e}")
+            continue
+        crop_count += len(items)
+        results.extend(
+            _aggregate_faces(boxes, fake_probs[start:start + count], aggregate=aggregate)
+            for boxes, start, count in frames
+        )
+    
+    logger.info(f"Tracked faces over {len(frame_paths)} frames ({tracker.full_detections} full detections), classified {crop_count} crops")
+    return results
+
+
+def classify_video(pipe, video_path: str, sample_rate: int = 1, face_crops: bool = False) -> Dict[str, Any]:
     """
     Classify a video as deepfake or real by analyzing sampled frames.
     
@@ -128,6 +534,8 @@ def classify_video(pipe, video_path: str, sample_rate: int = 1) -> Dict[str, Any
         pipe: The loaded Hugging Face pipeline from load_image_model()
         video_path (str): Path to the video file to analyze
         sample_rate (int): Frames to extract per second (default: 1)
+        face_crops (bool): Track faces across frames and classify only the
+                           face crops in batches (default: False)
     
     Returns:
         Dict[str, Any]: Aggregated classification result containing:
@@ -164,24 +572,26 @@ def classify_video(pipe, video_path: str, sample_rate: int = 1) -> Dict[str, Any
         real_count = 0
         total_score = 0.0
         
-        for i, frame_path in enumerate(frame_paths):
-            try:
-                result = classify_image(pipe, frame_path)
-                frame_results.append(result)
-                
-                # Count classifications
-                if "fake" in result["label"].lower():
-                    deepfake_count += 1
-                else:
-                    real_count += 1
-                
-                total_score += result["score"]
-                
-                logger.debug(f"Frame {i+1}/{len(frame_paths)}: {result['label']} ({result['score']:.2f})")
-                
-            except Exception as e:
-                logger.warning(f"Failed to classify frame {i+1}: {e}")
-                continue
+        if face_crops:
+            frame_results = _classify_frames_by_faces(pipe, frame_paths)
+        else:
+            for i, frame_path in enumerate(frame_paths):
+                try:
+                    result = classify_image(pipe, frame_path)
+                    frame_results.append(result)
+                    logger.debug(f"Frame {i+1}/{len(frame_paths)}: {result['label']} ({result['score']:.2f})")
+                except Exception as e:
+                    logger.warning(f"Failed to classify frame {i+1}: {e}")
+                    continue
+        
+        for result in frame_results:
+            # Count classifications
+            if "fake" in result["label"].lower():
+                deepfake_count += 1
+            else:
+                real_count += 1
+            
+            total_score += result["score"]
         
         # Calculate aggregated result
         if not frame_results:
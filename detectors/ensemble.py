@@ -0,0 +1,279 @@
+"""
+Deepfake Ensemble Module
+
+This module runs several deepfake image classifiers on the same image and fuses
+their scores. Each image is decoded once; members whose image processors share
+the same configuration also share one preprocessed tensor. Member models run in
+parallel threads, and per-member latency is tracked so slow members can be dropped.
+
+Models: prithivMLmods/Deep-Fake-Detector-v2-Model, dima806/deepfake_vs_real_image_detection
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from PIL import Image
+
+from . import deepfake
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Comma-separated list of member models
+ENSEMBLE_MODELS = [
+    name.strip()
+    for name in os.getenv(
+        "ENSEMBLE_MODELS",
+        "prithivMLmods/Deep-Fake-Detector-v2-Model,dima806/deepfake_vs_real_image_detection"
+    ).split(",")
+    if name.strip()
+]
+
+# Processor config keys that do not affect the produced tensor
+_IGNORED_PROCESSOR_KEYS = {"_processor_class", "processor_class", "image_processor_type", "_commit_hash"}
+
+# Number of recent calls kept per member for latency statistics
+LATENCY_WINDOW = 100
+
+
+def load_image_ensemble(model_names: Optional[List[str]] = None, device: int = -1, weights: Optional[Dict[str, float]] = None):
+    """
+    Load every member model and build an ensemble.
+
+    Args:
+        model_names (List[str]): Hugging Face model ids (default: ENSEMBLE_MODELS)
+        device (int): Device to run inference on (-1 for CPU)
+        weights (Dict[str, float]): Optional fusion weight per model (default: equal)
+
+    Returns:
+        ImageEnsemble: Ensemble ready for classification
+
+    Raises:
+        Exception: If no member model could be loaded
+
+    Example:
+        >>> ensemble = load_image_ensemble()
+        >>> result = ensemble.classify("photo.jpg")
+    """
+    members = {}
+    for name in model_names or ENSEMBLE_MODELS:
+        try:
+            members[name] = deepfake.load_image_model(device=device, model_name=name)
+        except Exception as e:
+            logger.warning(f"Skipping ensemble member {name}: {e}")
+
+    if not members:
+        raise Exception("No ensemble member could be loaded")
+
+    return ImageEnsemble(members, weights=weights)
+
+
+def _processor_signature(pipe) -> str:
+    """
+    Build a hashable description of a pipeline's image preprocessing.
+
+    Two members with the same signature produce identical input tensors,
+    so the tensor only needs to be computed once.
+    """
+    processor = pipe.image_processor
+    try:
+        config = {
+            key: value for key, value in processor.to_dict().items()
+            if key not in _IGNORED_PROCESSOR_KEYS
+        }
+        return type(processor).__name__ + json.dumps(config, sort_keys=True, default=str)
+    except Exception:
+        # Unknown processor: never share
+        return f"{type(processor).__name__}:{id(processor)}"
+
+
+class ImageEnsemble:
+    """
+    Fuse several deepfake image classifiers with shared decode and preprocessing.
+
+    Example:
+        >>> ensemble = ImageEnsemble({"a": pipe_a, "b": pipe_b})
+        >>> result = ensemble.classify("photo.jpg")
+        >>> print(result["label"], result["raw"]["members"])
+        >>> ensemble.drop_slow(max_latency_ms=500)
+    """
+
+    def __init__(self, members: Dict[str, Any], weights: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            members (Dict[str, Pipeline]): Member name -> image-classification pipeline
+            weights (Dict[str, float]): Optional fusion weight per member (default: 1.0)
+        """
+        if not members:
+            raise ValueError("An ensemble needs at least one member")
+
+        self.members = dict(members)
+        self.weights = {name: (weights or {}).get(name, 1.0) for name in self.members}
+        self._latencies = {name: deque(maxlen=LATENCY_WINDOW) for name in self.members}
+        # drop_slow() swaps in new dicts under this lock; classify() works on the dicts it started with
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.members), thread_name_prefix="ensemble")
+
+    @staticmethod
+    def _groups(members: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Group member names by identical preprocessing."""
+        groups: Dict[str, List[str]] = {}
+        for name, pipe in members.items():
+            groups.setdefault(_processor_signature(pipe), []).append(name)
+        return groups
+
+    def _run_member(self, pipe, latencies: deque, pixel_values) -> Dict[str, Any]:
+        """Forward one member on an already preprocessed tensor."""
+        import torch
+
+        start = time.perf_counter()
+
+        model = pipe.model
+        with torch.no_grad():
+            logits = model(pixel_values=pixel_values.to(model.device, dtype=model.dtype)).logits
+        probs = torch.softmax(logits[0].float(), dim=-1).tolist()
+
+        id2label = model.config.id2label
+        predictions = sorted(
+            ({"label": id2label[i], "score": p} for i, p in enumerate(probs)),
+            key=lambda pred: pred["score"],
+            reverse=True
+        )
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        latencies.append(latency_ms)
+
+        fake_probability = deepfake._fake_probability(pipe, predictions)
+        return {
+            "label": "Deepfake" if fake_probability >= 0.5 else "Real",
+            "fake_probability": fake_probability,
+            "latency_ms": latency_ms,
+            "predictions": predictions
+        }
+
+    def classify(self, image_path: str) -> Dict[str, Any]:
+        """
+        Classify an image with every member and fuse the results.
+
+        Args:
+            image_path (str): Path to the image file to analyze
+
+        Returns:
+            Dict[str, Any]: Classification result containing:
+                - label (str): Fused label ("Deepfake" or "Real")
+                - score (float): Confidence of the fused label (0-1)
+                - raw (Dict): Fused probability, per-member results and latencies,
+                              and preprocessing time per shared group
+
+        Raises:
+            FileNotFoundError: If the image file doesn't exist
+            Exception: If every member fails
+        """
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+
+        # Decode once for all members
+        image = Image.open(image_path).convert("RGB")
+
+        with self._lock:
+            members, weights, latencies = self.members, self.weights, self._latencies
+
+        # Preprocess once per distinct processor config
+        futures = {}
+        preprocess_ms = {}
+        for group in self._groups(members).values():
+            start = time.perf_counter()
+            processor = members[group[0]].image_processor
+            pixel_values = processor(images=image, return_tensors="pt")["pixel_values"]
+            preprocess_ms[",".join(group)] = (time.perf_counter() - start) * 1000
+
+            for name in group:
+                futures[name] = self._executor.submit(self._run_member, members[name], latencies[name], pixel_values)
+
+        member_results = {}
+        for name, future in futures.items():
+            try:
+                member_results[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Ensemble member {name} failed: {e}")
+
+        if not member_results:
+            raise Exception("All ensemble members failed")
+
+        # Weighted mean of the members' deepfake probabilities
+        total_weight = sum(weights[name] for name in member_results)
+        fake_probability = sum(
+            weights[name] * r["fake_probability"] for name, r in member_results.items()
+        ) / total_weight
+        is_fake = fake_probability >= 0.5
+
+        logger.info(f"Ensemble classification: fake probability {fake_probability:.4f} from {len(member_results)} members")
+
+        return {
+            "label": "Deepfake" if is_fake else "Real",
+            "score": fake_probability if is_fake else 1.0 - fake_probability,
+            "raw": {
+                "method": "ensemble",
+                "fake_probability": fake_probability,
+                "members": member_results,
+                "preprocess_ms": preprocess_ms
+            }
+        }
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize recent per-member latency.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Member name -> {calls, mean_ms, p95_ms}
+        """
+        report = {}
+        for name, samples in list(self._latencies.items()):
+            if not samples:
+                report[name] = {"calls": 0, "mean_ms": 0.0, "p95_ms": 0.0}
+                continue
+            ordered = sorted(samples)
+            report[name] = {
+                "calls": len(ordered),
+                "mean_ms": sum(ordered) / len(ordered),
+                "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+            }
+        return report
+
+    def drop_slow(self, max_latency_ms: float) -> List[str]:
+        """
+        Remove members whose mean latency exceeds a budget.
+
+        The fastest member is always kept so the ensemble stays usable.
+
+        Args:
+            max_latency_ms (float): Latency budget per member in milliseconds
+
+        Returns:
+            List[str]: Names of the removed members
+        """
+        with self._lock:
+            report = self.latency_report()
+            measured = {name: r["mean_ms"] for name, r in report.items() if r["calls"]}
+            if not measured:
+                return []
+
+            fastest = min(measured, key=measured.get)
+            dropped = [name for name, mean in measured.items() if mean > max_latency_ms and name != fastest]
+            if not dropped:
+                return []
+
+            # Swap in new dicts rather than deleting keys that running classify() calls may still use
+            self.members = {n: p for n, p in self.members.items() if n not in dropped}
+            self.weights = {n: w for n, w in self.weights.items() if n not in dropped}
+            self._latencies = {n: d for n, d in self._latencies.items() if n not in dropped}
+
+        for name in dropped:
+            logger.info(f"Dropped slow ensemble member {name} ({measured[name]:.1f} ms)")
+        return dropped
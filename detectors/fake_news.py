@@ -9,8 +9,9 @@ Model: jy46604790/Fake-News-Bert-Detect
 
 import logging
 import os
-from typing import Dict, Any, Optional
-from transformers import pipeline
+from typing import Dict, Any, List, Optional
+
+from . import registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +21,15 @@ logger = logging.getLogger(__name__)
 HF_TOKEN = os.getenv("HUGGINGFACE_TOKEN", None)
 TEXT_MODEL = os.getenv("TEXT_MODEL", "jy46604790/Fake-News-Bert-Detect")
 
+# Texts per forward pass in classify_texts() when the host has no tuned batch size
+DEFAULT_BATCH_SIZE = 8
+
+
+def pipeline(*args, **kwargs):
+    """Build a transformers pipeline; transformers is imported on first use."""
+    from transformers import pipeline as _pipeline
+    return _pipeline(*args, **kwargs)
+
 
 def load_text_model(device: int = -1):
     """
@@ -30,7 +40,8 @@ def load_text_model(device: int = -1):
                      -1 for CPU (default), 0 for GPU, 1+ for multi-GPU setups.
     
     Returns:
-        Pipeline: A Hugging Face text-classification pipeline ready for inference.
+        ManagedModel: Shared handle to a Hugging Face text-classification pipeline,
+                      ready for inference (reloads transparently if evicted).
     
     Raises:
         Exception: If model loading fails (network issues, memory, etc.)
@@ -42,19 +53,18 @@ def load_text_model(device: int = -1):
     try:
         logger.info(f"Loading fake news detection model: {TEXT_MODEL}")
         
-        # Prepare pipeline arguments
-        pipeline_kwargs = {
-            "model": TEXT_MODEL,
-            "device": device
-        }
-        
         # Add token if available (for private models or avoiding rate limits)
         if HF_TOKEN:
-            pipeline_kwargs["token"] = HF_TOKEN
             logger.info("Using Hugging Face authentication token")
         
-        # Load the text-classification pipeline with the specified model
-        text_pipeline = pipeline("text-classification", **pipeline_kwargs)
+        # Load (or reuse) the text-classification pipeline through the shared registry
+        text_pipeline = registry.load(
+            "text-classification",
+            TEXT_MODEL,
+            device=device,
+            token=HF_TOKEN,
+            factory=pipeline
+        )
         
         logger.info("✓ Fake news model loaded successfully")
         return text_pipeline
@@ -124,6 +134,68 @@ def classify_text(pipe, text: str, max_length: int = 1024) -> Dict[str, Any]:
         raise
 
 
+def classify_texts(
+    pipe,
+    texts: List[str],
+    max_length: int = 1024,
+    batch_size: Optional[int] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Classify many texts in one batched pipeline call.
+    
+    Much faster than calling classify_text() in a loop: the texts share
+    padded forward passes of up to batch_size inputs.
+    
+    Args:
+        pipe: The loaded Hugging Face pipeline from load_text_model()
+        texts (List[str]): News texts to classify
+        max_length (int): Maximum character length to process per text
+        batch_size (int): Maximum texts per forward pass
+                         (default: the host's tuned batch size, else DEFAULT_BATCH_SIZE)
+    
+    Returns:
+        List[Optional[Dict[str, Any]]]: One classify_text()-style result
+            ({label, score, raw}) per input, in order; None for empty texts
+    
+    Example:
+        >>> pipe = load_text_model()
+        >>> for result in classify_texts(pipe, [article_a, article_b]):
+        >>>     print(result['label'], result['score'])
+    """
+    indices = [i for i, text in enumerate(texts) if text and text.strip()]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    if not indices:
+        return results
+    
+    if not batch_size:
+        tuned = getattr(pipe, "tuned_batch_size", None)
+        batch_size = tuned if isinstance(tuned, int) and tuned > 0 else DEFAULT_BATCH_SIZE
+    
+    try:
+        raw_results = pipe(
+            [texts[i][:max_length] for i in indices],
+            truncation=True,
+            max_length=512,
+            batch_size=batch_size
+        )
+    except Exception as e:
+        logger.error(f"Batch classification failed: {e}")
+        raise
+    
+    for i, raw_result in zip(indices, raw_results):
+        # top_k pipelines return a list of predictions per input
+        if isinstance(raw_result, list):
+            raw_result = raw_result[0]
+        results[i] = {
+            "label": _map_label_to_human(pipe, raw_result["label"]),
+            "score": raw_result["score"],
+            "raw": raw_result
+        }
+    
+    logger.info(f"Classified {len(indices)} texts in batches of {batch_size}")
+    return results
+
+
 def _map_label_to_human(pipe, model_label: str) -> str:
     """
     Map model output labels (e.g., LABEL_0, LABEL_1) to human-readable labels.
@@ -6,7 +6,7 @@ that works offline when Hugging Face models are not available.
 """
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -122,7 +122,7 @@ def load_text_model_with_fallback(device: int = -1):
         Model pipeline or simple analyzer
     """
     try:
-        from transformers import pipeline
+        from . import registry
         import os
         
         HF_TOKEN = os.getenv("HUGGINGFACE_TOKEN", None)
@@ -130,15 +130,7 @@ def load_text_model_with_fallback(device: int = -1):
         
         logger.info(f"Attempting to load model: {TEXT_MODEL}")
         
-        pipeline_kwargs = {
-            "model": TEXT_MODEL,
-            "device": device
-        }
-        
-        if HF_TOKEN:
-            pipeline_kwargs["token"] = HF_TOKEN
-        
-        model = pipeline("text-classification", **pipeline_kwargs)
+        model = registry.load("text-classification", TEXT_MODEL, device=device, token=HF_TOKEN)
         logger.info("✅ Successfully loaded Hugging Face model")
         return {'type': 'huggingface', 'model': model}
         
@@ -193,3 +185,38 @@ def classify_text_with_fallback(model_info: dict, text: str, max_length: int = 1
         result = analyze_text_simple(text)
         result['method'] = 'offline-rules'
         return result
+
+
+def classify_texts_with_fallback(model_info: dict, texts: List[str], max_length: int = 1024) -> List[Optional[Dict[str, Any]]]:
+    """
+    Classify many texts using available method (one batched model call).
+    
+    Args:
+        model_info: Model information from load_text_model_with_fallback
+        texts: Texts to classify
+        max_length: Maximum length per text
+        
+    Returns:
+        One classification result per text (None for empty texts)
+    """
+    if model_info['type'] == 'huggingface':
+        try:
+            from . import fake_news
+            results = fake_news.classify_texts(model_info['model'], texts, max_length=max_length)
+            for result in results:
+                if result is not None:
+                    result['method'] = 'ai-model'
+            return results
+        except Exception as e:
+            logger.error(f"Model batch classification failed: {e}")
+            logger.info("Falling back to rule-based detection")
+    
+    results = []
+    for text in texts:
+        if not text or not text.strip():
+            results.append(None)
+            continue
+        result = analyze_text_simple(text)
+        result['method'] = 'offline-rules'
+        results.append(result)
+    return results
@@ -0,0 +1,349 @@
+"""
+Offline-First Model Resolution Module
+
+Resolves a Hugging Face model id to a local directory before any pipeline is
+built, so a fresh worker never waits on the hub when the weights are already
+on disk:
+
+1. The local cache manifest (MODEL_MANIFEST, written by prepare_models.py)
+2. A local directory path given as the model name
+3. The Hugging Face cache (~/.cache/huggingface), checked without network calls
+4. The hub itself - only if the network is reachable
+
+Missing network is detected with a short TCP probe instead of waiting for the
+hub client's request timeouts, so offline callers fail (and fall back) at once.
+Local checkpoints with safetensors weights are loaded with
+low_cpu_mem_usage: the model is built on the meta device and each tensor is
+copied in from the memory-mapped file, instead of first allocating randomly
+initialized weights and then a second full copy (transformers 5 always loads
+this way; on 4.x it needs `accelerate`).
+
+Manifest entries may also list prebuilt artifacts (tokenizer cache, int8
+weights, ONNX graph); loaders use them as-is and never convert at startup.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "truthlens"))
+MODEL_MANIFEST = os.getenv("MODEL_MANIFEST", os.path.join(MODEL_CACHE_DIR, "manifest.json"))
+
+# Set MODEL_OFFLINE_FIRST=0 to always hand model ids straight to transformers
+OFFLINE_FIRST = os.getenv("MODEL_OFFLINE_FIRST", "1") != "0"
+
+HUB_HOST = os.getenv("HF_HUB_HOST", "huggingface.co")
+NETWORK_PROBE_TIMEOUT = 0.5
+NETWORK_PROBE_TTL = 30.0
+
+_network_state = {"checked_at": 0.0, "available": False}
+_manifest_cache = {"path": None, "mtime": None, "data": {}}
+_lock = threading.Lock()
+
+
+class ModelUnavailableError(Exception):
+    """Raised when a model is not on disk and the hub cannot be reached."""
+
+
+class Resolution(NamedTuple):
+    """Where a model will be loaded from."""
+    location: str
+    source: str  # "manifest", "local-dir", "hf-cache" or "hub"
+    artifacts: Optional[Dict[str, Any]] = None  # Prebuilt artifacts from the manifest
+
+    @property
+    def is_local(self) -> bool:
+        return self.source != "hub"
+
+
+def _env_offline() -> bool:
+    return any(os.getenv(var, "0").lower() in ("1", "true", "yes") for var in ("HF_HUB_OFFLINE", "TRANSFORMERS_OFFLINE"))
+
+
+def network_available(force: bool = False) -> bool:
+    """
+    Check whether the Hugging Face hub is reachable.
+
+    Honors HF_HUB_OFFLINE / TRANSFORMERS_OFFLINE; otherwise opens a TCP
+    connection to the hub with a sub-second timeout. The answer is cached for
+    NETWORK_PROBE_TTL seconds.
+
+    Args:
+        force (bool): Ignore the cached answer and probe again
+
+    Returns:
+        bool: True if the hub is reachable
+    """
+    if _env_offline():
+        return False
+
+    with _lock:
+        if not force and time.monotonic() - _network_state["checked_at"] < NETWORK_PROBE_TTL:
+            return _network_state["available"]
+
+    try:
+        with socket.create_connection((HUB_HOST, 443), timeout=NETWORK_PROBE_TIMEOUT):
+            available = True
+    except OSError:
+        available = False
+
+    with _lock:
+        _network_state.update(checked_at=time.monotonic(), available=available)
+
+    if not available:
+        logger.info(f"{HUB_HOST} is unreachable; using local models only")
+    return available
+
+
+def manifest_key(model: str, revision: Optional[str] = None) -> str:
+    """Manifest entry name for a model (and optional revision)."""
+    return f"{model}@{revision}" if revision else model
+
+
+def load_manifest(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the local model manifest (re-read only when the file changes).
+
+    Args:
+        path (str): Manifest path (default: MODEL_MANIFEST)
+
+    Returns:
+        Dict[str, Any]: Manifest contents, or an empty manifest if missing
+    """
+    path = path or MODEL_MANIFEST
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {"version": 1, "models": {}}
+
+    with _lock:
+        if _manifest_cache["path"] == path and _manifest_cache["mtime"] == mtime:
+            return _manifest_cache["data"]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable model manifest {path}: {e}")
+        return {"version": 1, "models": {}}
+
+    with _lock:
+        _manifest_cache.update(path=path, mtime=mtime, data=data)
+    return data
+
+
+def manifest_entry(model: str, revision: Optional[str] = None, manifest_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Look up a model in the manifest.
+
+    Returns:
+        Dict[str, Any]: The entry (path, revision, files, artifacts), or None
+    """
+    models = load_manifest(manifest_path).get("models", {})
+    entry = models.get(manifest_key(model, revision))
+    if entry is None and revision is None:
+        # Fall back to any prepared revision of the model
+        entry = next((e for k, e in models.items() if k.split("@")[0] == model), None)
+    return entry
+
+
+# Weight files transformers loads, single-file or sharded (index + shards)
+WEIGHT_FILES = ("model.safetensors", "pytorch_model.bin")
+WEIGHT_INDEX_FILES = ("model.safetensors.index.json", "pytorch_model.bin.index.json")
+
+
+def has_weights(path: str) -> bool:
+    """
+    Check that a model directory holds complete weights, not just a config.
+
+    Sharded checkpoints count only when every shard named in the index exists.
+    """
+    if any(os.path.isfile(os.path.join(path, name)) for name in WEIGHT_FILES):
+        return True
+    for index_name in WEIGHT_INDEX_FILES:
+        index_path = os.path.join(path, index_name)
+        if not os.path.isfile(index_path):
+            continue
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                shards = set(json.load(f).get("weight_map", {}).values())
+        except (OSError, ValueError):
+            continue
+        if shards and all(os.path.isfile(os.path.join(path, shard)) for shard in shards):
+            return True
+    return False
+
+
+def _hf_cache_snapshot(model: str, revision: Optional[str]) -> Optional[str]:
+    """Find a complete cached snapshot in the Hugging Face cache without network access."""
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return None
+
+    try:
+        config_path = try_to_load_from_cache(model, "config.json", revision=revision)
+    except Exception:
+        return None
+
+    if not (isinstance(config_path, str) and os.path.exists(config_path)):
+        return None
+
+    # A snapshot with only some files (interrupted download) would fail at load time
+    snapshot = os.path.dirname(config_path)
+    if not has_weights(snapshot):
+        logger.info(f"Ignoring incomplete cached snapshot of {model} (no weights in {snapshot})")
+        return None
+    return snapshot
+
+
+def resolve_model(model: str, revision: Optional[str] = None, manifest_path: Optional[str] = None) -> Resolution:
+    """
+    Resolve a model id to the place it should be loaded from.
+
+    Args:
+        model (str): Hugging Face model id or local directory
+        revision (str): Optional model revision
+        manifest_path (str): Manifest to consult (default: MODEL_MANIFEST)
+
+    Returns:
+        Resolution: Location and source of the model
+
+    Raises:
+        ModelUnavailableError: If the model is not available locally and the hub is unreachable
+
+    Example:
+        >>> resolve_model("jy46604790/Fake-News-Bert-Detect")
+        Resolution(location='/home/me/.cache/huggingface/hub/models--.../snapshots/abc', source='hf-cache')
+    """
+    if not OFFLINE_FIRST:
+        return Resolution(model, "hub")
+
+    entry = manifest_entry(model, revision, manifest_path)
+    if entry and entry.get("path") and os.path.isdir(entry["path"]):
+        artifacts = {
+            name: artifact for name, artifact in entry.get("artifacts", {}).items()
+            if artifact.get("path") and os.path.exists(artifact["path"])
+        }
+        return Resolution(entry["path"], "manifest", artifacts or None)
+
+    if os.path.isdir(model):
+        return Resolution(model, "local-dir")
+
+    snapshot = _hf_cache_snapshot(model, revision)
+    if snapshot:
+        return Resolution(snapshot, "hf-cache")
+
+    if network_available():
+        return Resolution(model, "hub")
+
+    raise ModelUnavailableError(f"{model} is not cached locally and {HUB_HOST} is unreachable")
+
+
+def _lazy_loading_supported() -> bool:
+    """low_cpu_mem_usage needs accelerate on transformers 4.x (5.x always loads lazily)."""
+    return importlib.util.find_spec("accelerate") is not None
+
+
+def pipeline_kwargs(resolution: Resolution, task: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extra pipeline arguments for loading a resolved model.
+
+    Local checkpoints with safetensors weights are loaded from those files
+    rather than from pickled .bin weights, with low_cpu_mem_usage so tensors
+    are copied from the memory map into a meta-initialized model once.
+    A prebuilt tokenizer / image processor from the manifest is used instead
+    of the one shipped with the checkpoint.
+
+    Args:
+        resolution (Resolution): Result of resolve_model()
+        task (str): Pipeline task, used to pick the preprocessing artifact
+
+    Returns:
+        Dict[str, Any]: Keyword arguments to merge into the pipeline call
+    """
+    if not resolution.is_local:
+        return {}
+
+    kwargs: Dict[str, Any] = {}
+    try:
+        has_safetensors = any(name.endswith(".safetensors") for name in os.listdir(resolution.location))
+    except OSError:
+        has_safetensors = False
+    if has_safetensors:
+        kwargs["model_kwargs"] = {"use_safetensors": True}
+        if _lazy_loading_supported():
+            kwargs["model_kwargs"]["low_cpu_mem_usage"] = True
+
+    preprocessor = (resolution.artifacts or {}).get("tokenizer")
+    if preprocessor and task:
+        kwargs["image_processor" if task.startswith("image") else "tokenizer"] = preprocessor["path"]
+
+    return kwargs
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_quantized(resolution: Resolution):
+    """
+    Load the prebuilt int8 model of a resolved model.
+
+    The artifact is a pickled module written by prepare_models.py; its
+    checksum is verified against the manifest before it is unpickled.
+
+    Returns:
+        torch.nn.Module: The dynamically quantized model
+
+    Raises:
+        ModelUnavailableError: If the model has no int8 artifact or it fails verification
+    """
+    artifact = (resolution.artifacts or {}).get("int8")
+    if not artifact:
+        raise ModelUnavailableError(
+            f"No int8 artifact for {resolution.location}; run prepare_models.py to build one"
+        )
+
+    if artifact.get("sha256") and sha256_file(artifact["path"]) != artifact["sha256"]:
+        raise ModelUnavailableError(f"int8 artifact {artifact['path']} does not match its manifest checksum")
+
+    import torch
+    model = torch.load(artifact["path"], map_location="cpu", weights_only=False)
+    model.eval()
+    return model
+
+
+def write_json(path: str, data: Any):
+    """Atomically replace a JSON file (write a temporary file, then os.replace)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def write_manifest(data: Dict[str, Any], path: Optional[str] = None):
+    """
+    Atomically replace the model manifest.
+
+    Args:
+        data (Dict[str, Any]): Manifest contents ({"version": 1, "models": {...}})
+        path (str): Manifest path (default: MODEL_MANIFEST)
+    """
+    write_json(path or MODEL_MANIFEST, data)
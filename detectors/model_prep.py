@@ -0,0 +1,441 @@
+"""
+Model Preparation Module
+
+Everything a production node needs is produced ahead of time by this module
+(driven by prepare_models.py), so workers only ever read finished files:
+
+1. Resolve each configured model from a local mirror directory, the Hugging
+   Face cache, or - if reachable - the hub, concurrently
+2. Verify file checksums (SHA256SUMS in a mirror, blob hashes in the HF cache,
+   and the hashes recorded by a previous run)
+3. Build optimized artifacts: a tokenizer / image-processor cache and
+   dynamically quantized int8 weights (an ONNX graph on request, for external
+   runtimes; the loaders here do not use it)
+4. Record paths, hashes and artifacts in the manifest read by model_cache
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from . import model_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_DIR = os.getenv("MODEL_ARTIFACTS_DIR", os.path.join(model_cache.MODEL_CACHE_DIR, "artifacts"))
+
+# Artifact kinds, in build order
+ARTIFACT_FORMATS = ("tokenizer", "int8", "onnx")
+
+# Artifacts built by default: the ones the loaders use ("onnx" is only for external runtimes)
+DEFAULT_FORMATS = ("tokenizer", "int8")
+
+# Checksum file looked up in mirrored model directories ("<sha256>  <relative path>" per line)
+CHECKSUM_FILE = "SHA256SUMS"
+
+# Files never needed for inference with PyTorch weights
+_IGNORED_DOWNLOADS = ["*.h5", "*.msgpack", "*.ot", "*.tflite", "*.onnx", "onnx/*", "coreml/*", "*.mlmodel", "training_args.bin"]
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# torch.onnx.export keeps global state, so exports run one at a time
+_onnx_lock = threading.Lock()
+
+
+class ModelIntegrityError(Exception):
+    """Raised when a model file does not match its expected checksum."""
+
+
+class ModelSpec(NamedTuple):
+    """A model to prepare."""
+    model: str
+    task: str
+    revision: Optional[str] = None
+
+
+def configured_models() -> List[ModelSpec]:
+    """
+    Collect every model the application may load.
+
+    Returns:
+        List[ModelSpec]: Text, fallback text, image and ensemble models (deduplicated)
+    """
+    from . import deepfake, ensemble, fake_news
+
+    specs = [
+        ModelSpec(fake_news.TEXT_MODEL, "text-classification"),
+        # Default of fake_news_offline.load_text_model_with_fallback (used by the app)
+        ModelSpec(os.getenv("TEXT_MODEL", "hamzab/roberta-fake-news-classification"), "text-classification"),
+        ModelSpec(deepfake.IMAGE_MODEL, "image-classification"),
+    ]
+    specs += [ModelSpec(name, "image-classification") for name in ensemble.ENSEMBLE_MODELS]
+
+    unique: Dict[tuple, ModelSpec] = {}
+    for spec in specs:
+        unique.setdefault((spec.model, spec.revision), spec)
+    return list(unique.values())
+
+
+def _mirror_dir(mirror: str, model: str) -> Optional[str]:
+    """Find a model in a mirror laid out as <mirror>/<org>/<name> or <mirror>/<org>--<name>."""
+    for candidate in (os.path.join(mirror, model), os.path.join(mirror, model.replace("/", "--"))):
+        if os.path.isfile(os.path.join(candidate, "config.json")) and model_cache.has_weights(candidate):
+            return os.path.abspath(candidate)
+    return None
+
+
+def _download_snapshot(model: str, revision: Optional[str], token: Optional[str]) -> str:
+    """Download the files needed for inference, preferring safetensors over pickled weights."""
+    from huggingface_hub import HfApi, snapshot_download
+
+    ignore = list(_IGNORED_DOWNLOADS)
+    repo_files = HfApi().list_repo_files(model, revision=revision, token=token)
+    if any(name.endswith(".safetensors") for name in repo_files):
+        ignore.append("*.bin")
+
+    return snapshot_download(model, revision=revision, token=token, ignore_patterns=ignore)
+
+
+def fetch_model(model: str, revision: Optional[str] = None, mirror: Optional[str] = None, token: Optional[str] = None) -> model_cache.Resolution:
+    """
+    Make a model's files available locally without building a pipeline.
+
+    Args:
+        model (str): Hugging Face model id or local directory
+        revision (str): Optional model revision
+        mirror (str): Optional local mirror directory, checked first
+        token (str): Optional Hugging Face token for hub downloads
+
+    Returns:
+        Resolution: Local directory and where it came from ("mirror", "local-dir", "hf-cache" or "hub")
+
+    Raises:
+        ModelUnavailableError: If the model is not available locally and the hub is unreachable
+
+    Example:
+        >>> fetch_model("jy46604790/Fake-News-Bert-Detect", mirror="/mnt/models")
+        Resolution(location='/mnt/models/jy46604790/Fake-News-Bert-Detect', source='mirror')
+    """
+    if mirror:
+        location = _mirror_dir(mirror, model)
+        if location:
+            return model_cache.Resolution(location, "mirror")
+
+    if os.path.isdir(model):
+        return model_cache.Resolution(os.path.abspath(model), "local-dir")
+
+    snapshot = model_cache._hf_cache_snapshot(model, revision)
+    if snapshot:
+        return model_cache.Resolution(snapshot, "hf-cache")
+
+    if not model_cache.network_available():
+        raise model_cache.ModelUnavailableError(
+            f"{model} is not in the mirror or local caches and {model_cache.HUB_HOST} is unreachable"
+        )
+
+    logger.info(f"Downloading {model} from {model_cache.HUB_HOST}")
+    return model_cache.Resolution(_download_snapshot(model, revision, token), "hub")
+
+
+def _model_files(path: str) -> List[str]:
+    """Relative paths of the files in a model directory (hidden files and checksums excluded)."""
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in names:
+            if name.startswith(".") or name == CHECKSUM_FILE:
+                continue
+            files.append(os.path.relpath(os.path.join(root, name), path))
+    return sorted(files)
+
+
+def expected_hashes(path: str) -> Dict[str, str]:
+    """
+    Collect the checksums a model directory is expected to match.
+
+    Sources: a SHA256SUMS file in the directory, and Hugging Face cache blobs,
+    which are named after the SHA-256 of large (LFS) files.
+
+    Returns:
+        Dict[str, str]: Relative path -> expected hex SHA-256
+    """
+    expected = {}
+
+    for rel_path in _model_files(path):
+        full_path = os.path.join(path, rel_path)
+        if os.path.islink(full_path):
+            blob = os.path.basename(os.path.realpath(full_path))
+            if _SHA256_RE.match(blob):
+                expected[rel_path] = blob
+
+    checksum_path = os.path.join(path, CHECKSUM_FILE)
+    if os.path.isfile(checksum_path):
+        with open(checksum_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split(maxsplit=1)
+                if len(parts) == 2:
+                    expected[parts[1].lstrip("*")] = parts[0].lower()
+
+    return expected
+
+
+def verify_files(path: str, previous: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Hash every file of a model directory and check it against the expected checksums.
+
+    Args:
+        path (str): Model directory
+        previous (Dict[str, str]): Hashes recorded by an earlier run, also enforced
+
+    Returns:
+        Dict[str, str]: Relative path -> hex SHA-256 of every file
+
+    Raises:
+        ModelIntegrityError: If a file is missing or its checksum does not match
+    """
+    expected = dict(previous or {})
+    expected.update(expected_hashes(path))
+
+    hashes = {rel_path: model_cache.sha256_file(os.path.join(path, rel_path)) for rel_path in _model_files(path)}
+
+    missing = sorted(set(expected) - set(hashes))
+    mismatched = sorted(name for name, digest in expected.items() if name in hashes and hashes[name] != digest)
+    if missing or mismatched:
+        raise ModelIntegrityError(
+            f"{path}: " + "; ".join(
+                ([f"missing {', '.join(missing)}"] if missing else []) +
+                ([f"checksum mismatch in {', '.join(mismatched)}"] if mismatched else [])
+            )
+        )
+
+    return hashes
+
+
+def _load_model(path: str, task: str):
+    """Load the bare PyTorch model for a task."""
+    from transformers import AutoModelForImageClassification, AutoModelForSequenceClassification
+
+    model_cls = AutoModelForImageClassification if task.startswith("image") else AutoModelForSequenceClassification
+    return model_cls.from_pretrained(path).eval()
+
+
+def _build_tokenizer(path: str, task: str, out_dir: str) -> str:
+    """Save a ready-to-load fast tokenizer (or image processor) so no conversion happens at startup."""
+    if task.startswith("image"):
+        from transformers import AutoImageProcessor
+        processor = AutoImageProcessor.from_pretrained(path)
+    else:
+        from transformers import AutoTokenizer
+        processor = AutoTokenizer.from_pretrained(path)
+    processor.save_pretrained(out_dir)
+    return out_dir
+
+
+def _build_int8(model, out_dir: str) -> str:
+    """Dynamically quantize the linear layers to int8 and save the whole module."""
+    import torch
+
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    out_path = os.path.join(out_dir, "model.int8.pt")
+    torch.save(quantized, out_path)
+    return out_path
+
+
+def _build_onnx(model, path: str, task: str, out_dir: str) -> str:
+    """Export the model to ONNX with dynamic batch (and sequence) axes."""
+    import torch
+
+    if task.startswith("image"):
+        size = getattr(model.config, "image_size", 224)
+        size = size if isinstance(size, int) else size[0]
+        inputs = {"pixel_values": torch.zeros(1, getattr(model.config, "num_channels", 3), size, size)}
+        dynamic_axes = {"pixel_values": {0: "batch"}}
+    else:
+        from transformers import AutoTokenizer
+        encoded = AutoTokenizer.from_pretrained(path)("Sample text for export", return_tensors="pt")
+        inputs = {name: encoded[name] for name in ("input_ids", "attention_mask")}
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in inputs}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    out_path = os.path.join(out_dir, "model.onnx")
+    with _onnx_lock:
+        torch.onnx.export(
+            model, (), out_path,
+            kwargs=inputs,
+            input_names=list(inputs),
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False
+        )
+    return out_path
+
+
+def build_artifacts(path: str, task: str, out_dir: str, formats: Iterable[str] = DEFAULT_FORMATS) -> Dict[str, Dict[str, Any]]:
+    """
+    Build optimized artifacts for a local model.
+
+    A failing artifact (e.g. ONNX export without the onnx package) is recorded
+    with its error instead of failing the whole model.
+
+    Args:
+        path (str): Local model directory
+        task (str): Pipeline task of the model
+        out_dir (str): Directory receiving the artifacts
+        formats (Iterable[str]): Subset of ARTIFACT_FORMATS to build
+
+    Returns:
+        Dict[str, Dict]: Artifact name -> {path, sha256, build_seconds} or {error}
+    """
+    formats = [f for f in ARTIFACT_FORMATS if f in set(formats)]
+    os.makedirs(out_dir, exist_ok=True)
+    artifacts: Dict[str, Dict[str, Any]] = {}
+    model = None
+
+    for fmt in formats:
+        start = time.perf_counter()
+        try:
+            if fmt == "tokenizer":
+                artifact_path = _build_tokenizer(path, task, os.path.join(out_dir, "tokenizer"))
+            else:
+                model = model if model is not None else _load_model(path, task)
+                if fmt == "int8":
+                    artifact_path = _build_int8(model, out_dir)
+                else:
+                    artifact_path = _build_onnx(model, path, task, out_dir)
+        except Exception as e:
+            logger.warning(f"Could not build {fmt} artifact for {path}: {e}")
+            artifacts[fmt] = {"error": str(e)[:200]}
+            continue
+
+        artifact = {"path": artifact_path, "build_seconds": round(time.perf_counter() - start, 2)}
+        if os.path.isfile(artifact_path):
+            artifact["sha256"] = model_cache.sha256_file(artifact_path)
+        artifacts[fmt] = artifact
+
+    return artifacts
+
+
+def _artifact_dir(spec: ModelSpec) -> str:
+    name = spec.model.strip("/").replace("/", "--")
+    return os.path.join(ARTIFACTS_DIR, f"{name}@{spec.revision}" if spec.revision else name)
+
+
+def prepare_model(
+    spec: ModelSpec,
+    mirror: Optional[str] = None,
+    formats: Iterable[str] = DEFAULT_FORMATS,
+    previous: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Fetch, verify and optimize one model.
+
+    Args:
+        spec (ModelSpec): Model to prepare
+        mirror (str): Optional local mirror directory
+        formats (Iterable[str]): Artifacts to build (empty: fetch and verify only,
+                                 also against the hashes of the previous entry)
+        previous (Dict): The model's existing manifest entry, if any
+        token (str): Optional Hugging Face token
+
+    Returns:
+        Dict[str, Any]: Manifest entry {path, source, task, revision, files, artifacts, prepared_at}
+
+    Raises:
+        ModelUnavailableError: If the model cannot be found
+        ModelIntegrityError: If a file fails checksum verification
+    """
+    resolution = fetch_model(spec.model, spec.revision, mirror=mirror, token=token)
+
+    # Hashes from an earlier run only apply to the same directory. They are
+    # enforced when only verifying; otherwise changed files trigger a rebuild.
+    previous = previous or {}
+    recorded = previous.get("files") if previous.get("path") == resolution.location else None
+    formats = list(formats)
+    files = verify_files(resolution.location, recorded if not formats else None)
+
+    revision = spec.revision
+    if resolution.source in ("hf-cache", "hub"):
+        revision = revision or os.path.basename(resolution.location)
+
+    artifacts = previous.get("artifacts", {}) if recorded == files else {}
+    formats = [f for f in formats if f not in artifacts or "error" in artifacts[f]]
+    if formats:
+        artifacts = dict(artifacts, **build_artifacts(resolution.location, spec.task, _artifact_dir(spec), formats))
+
+    return {
+        "path": resolution.location,
+        "source": resolution.source,
+        "task": spec.task,
+        "revision": revision,
+        "files": files,
+        "artifacts": artifacts,
+        "prepared_at": time.time(),
+    }
+
+
+def prepare_all(
+    specs: Optional[List[ModelSpec]] = None,
+    mirror: Optional[str] = None,
+    formats: Iterable[str] = DEFAULT_FORMATS,
+    manifest_path: Optional[str] = None,
+    max_workers: int = 4,
+    token: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Prepare several models concurrently and write the manifest.
+
+    Models that fail keep their previous manifest entry (if any).
+
+    Args:
+        specs (List[ModelSpec]): Models to prepare (default: configured_models())
+        mirror (str): Optional local mirror directory
+        formats (Iterable[str]): Artifacts to build
+        manifest_path (str): Manifest to update (default: MODEL_MANIFEST)
+        max_workers (int): Models prepared in parallel
+        token (str): Optional Hugging Face token
+
+    Returns:
+        Dict[str, Dict]: Manifest key -> {"ok": bool, "entry": ... or "error": str}
+
+    Example:
+        >>> results = prepare_all(mirror="/mnt/models", formats=["tokenizer", "int8"])
+        >>> all(r["ok"] for r in results.values())
+        True
+    """
+    specs = specs if specs is not None else configured_models()
+    formats = list(formats)
+    manifest = model_cache.load_manifest(manifest_path)
+    models = dict(manifest.get("models", {}))
+    results: Dict[str, Dict[str, Any]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(specs) or 1)), thread_name_prefix="prepare") as executor:
+        futures = {
+            executor.submit(
+                prepare_model, spec, mirror, formats,
+                models.get(model_cache.manifest_key(spec.model, spec.revision)), token
+            ): spec
+            for spec in specs
+        }
+        for future in as_completed(futures):
+            spec = futures[future]
+            key = model_cache.manifest_key(spec.model, spec.revision)
+            try:
+                entry = future.result()
+            except Exception as e:
+                logger.error(f"Failed to prepare {key}: {e}")
+                results[key] = {"ok": False, "error": str(e)}
+                continue
+            models[key] = entry
+            results[key] = {"ok": True, "entry": entry}
+            logger.info(f"Prepared {key} from {entry['source']}")
+
+    model_cache.write_manifest({"version": 1, "models": models}, manifest_path)
+    return results
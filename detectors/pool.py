@@ -0,0 +1,174 @@
+"""
+Pipeline Replica Pool Module
+
+A Hugging Face pipeline is not safe to call from several threads at once
+(fast tokenizers raise "Already borrowed", and concurrent calls fight over the
+same torch threads). This module keeps a bounded pool of N replicas of a
+pipeline so concurrent sessions each get their own:
+
+- Replicas share the model weights (the same torch module); only the
+  tokenizer / image processor and per-call pipeline state are copied
+- Callers check a replica out through a context manager and block (or time
+  out) while all replicas are busy
+- A registry handle (ManagedModel) stays the source of the weights: each
+  checkout pins the model, so the registry still accounts for it and can
+  evict and reload it between requests
+- Intra-op threads are split across replicas so the total matches the cores
+  (set once for the process when the pool is built); a single-replica pool
+  only serializes callers and leaves the thread count alone
+
+A pool can be used wherever a pipeline is expected: calling it runs one
+request on a free replica, and other attributes are forwarded to the base.
+"""
+
+import copy
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Optional
+
+from . import tuning
+from .registry import ManagedModel
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Replicas per model in the app (1 disables pooling)
+MODEL_POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "1"))
+
+# Per-call preprocessing state that must not be shared between replicas
+_PREPROCESSORS = ("tokenizer", "image_processor", "feature_extractor", "processor")
+
+
+def _copy_preprocessors(pipe: Any) -> Dict[str, Any]:
+    """Private copies of a pipeline's preprocessing objects."""
+    return {
+        name: copy.deepcopy(value)
+        for name in _PREPROCESSORS
+        if (value := getattr(pipe, name, None)) is not None
+    }
+
+
+def _replicate(pipe: Any, preprocessors: Optional[Dict[str, Any]] = None) -> Any:
+    """Copy a pipeline, sharing its model but not its preprocessing objects."""
+    replica = copy.copy(pipe)
+    for name, value in (preprocessors if preprocessors is not None else _copy_preprocessors(pipe)).items():
+        setattr(replica, name, value)
+    return replica
+
+
+class PipelinePool:
+    """
+    Bounded pool of pipeline replicas that share weights.
+
+    Example:
+        >>> pool = PipelinePool(fake_news.load_text_model(), size=4)
+        >>> with pool.checkout() as pipe:
+        ...     pipe("Some news text")
+        >>> pool("Some news text")  # Same, in one call
+    """
+
+    def __init__(self, base: Any, size: int = 2, threads_per_replica: Optional[int] = None):
+        """
+        Args:
+            base: Pipeline to replicate, or a registry ManagedModel (pinned per checkout,
+                  so eviction and reloads keep working)
+            size (int): Number of replicas
+            threads_per_replica (int): Intra-op threads per replica (default: cores // size, at least 1);
+                  set process-wide once, overriding tuned per-model counts. With size=1 and no
+                  explicit count the threads are left as they are (tuned counts stay in effect)
+
+        Raises:
+            ValueError: If size is smaller than 1
+        """
+        if size < 1:
+            raise ValueError("A pipeline pool needs at least one replica")
+
+        self.base = base
+        self.size = size
+        if threads_per_replica is None and size > 1:
+            threads_per_replica = max(1, (os.cpu_count() or 1) // size)
+        self.threads_per_replica = threads_per_replica
+
+        # Each slot holds private preprocessors (slot 0 uses the base's own). The
+        # pipeline itself is re-bound per checkout, so no slot keeps weights alive
+        # after the registry evicted them.
+        pipe = base.pipeline if isinstance(base, ManagedModel) else base
+        self._replicas: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        for i in range(size):
+            self._replicas.put(None if i == 0 else _copy_preprocessors(pipe))
+
+        # torch's intra-op thread count is process-wide: set it once, here
+        if self.threads_per_replica:
+            tuning.set_threads(self.threads_per_replica, pin=True)
+
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._waits = 0
+
+        logger.info(f"Pipeline pool: {size} replicas x {self.threads_per_replica or 'default'} threads")
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Borrow a replica for the duration of a `with` block.
+
+        Args:
+            timeout (float): Seconds to wait for a free replica (default: forever)
+
+        Yields:
+            Pipeline: A replica no other thread is using
+
+        Raises:
+            TimeoutError: If no replica became free within the timeout
+        """
+        try:
+            preprocessors = self._replicas.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self._waits += 1
+            try:
+                preprocessors = self._replicas.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No pipeline replica free after {timeout}s") from None
+
+        with self._lock:
+            self._in_use += 1
+        try:
+            pinned = self.base.pinned() if isinstance(self.base, ManagedModel) else nullcontext(self.base)
+            with pinned as pipe:
+                yield pipe if preprocessors is None else _replicate(pipe, preprocessors)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._replicas.put(preprocessors)
+
+    def __call__(self, *args, **kwargs):
+        with self.checkout() as replica:
+            return replica(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.base, name)
+
+    def stats(self) -> dict:
+        """
+        Pool usage.
+
+        Returns:
+            dict: size, threads_per_replica (None if left unset), in_use and waits (checkouts that had to block)
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "threads_per_replica": self.threads_per_replica,
+                "in_use": self._in_use,
+                "waits": self._waits,
+            }
+
+    def __repr__(self) -> str:
+        return f"PipelinePool(size={self.size}, threads_per_replica={self.threads_per_replica})"
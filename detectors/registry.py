@@ -0,0 +1,582 @@
+"""
+Model Registry Module
+
+Process-wide registry of loaded Hugging Face pipelines. Every loader in the
+project goes through this module, so each distinct model is loaded at most
+once per process and shared between callers, regardless of which entry point
+asked for it first.
+
+Entries are keyed by (task, model, revision, device, precision).
+
+The registry also manages memory: models idle for longer than
+MODEL_IDLE_TIMEOUT seconds, or least recently used models once the loaded
+weights exceed MODEL_MEMORY_BUDGET_MB (or free system memory drops below
+MODEL_MIN_FREE_MB), are evicted. Loaders hand out ManagedModel handles that
+reload an evicted model transparently on the next call.
+
+A host tuning profile (see tuning.py / autotune.py) is applied to every
+pipeline the registry builds, and with MODEL_COMPILE=1 classifiers run
+through torch.compile (see compiled.py).
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from . import compiled, model_cache, tuning
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Accepted precision names, mapped to the dtype string passed to transformers
+# ("int8" loads the prebuilt quantized model from the manifest instead)
+PRECISIONS = {
+    "fp32": "float32",
+    "fp16": "float16",
+    "bf16": "bfloat16",
+    "int8": "qint8",
+}
+
+# Precision used when a loader does not ask for one (e.g. MODEL_PRECISION=int8)
+MODEL_PRECISION = os.getenv("MODEL_PRECISION") or None
+
+# Tasks switched to torch.compile when MODEL_COMPILE=1
+COMPILABLE_TASKS = ("text-classification", "image-classification")
+
+# Memory management settings (0 disables each limit)
+MODEL_MEMORY_BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+MODEL_IDLE_TIMEOUT = float(os.getenv("MODEL_IDLE_TIMEOUT", "0"))
+MODEL_MIN_FREE_MB = float(os.getenv("MODEL_MIN_FREE_MB", "0"))
+
+
+class ModelKey(NamedTuple):
+    """Identity of a loaded pipeline."""
+    task: str
+    model: str
+    revision: Optional[str] = None
+    device: Any = -1
+    precision: Optional[str] = None
+
+    def __str__(self) -> str:
+        parts = [self.task, self.model]
+        if self.revision:
+            parts.append(f"@{self.revision}")
+        parts.append(f"device={self.device}")
+        if self.precision:
+            parts.append(self.precision)
+        return " ".join(parts)
+
+
+class _Entry:
+    """A loaded pipeline plus bookkeeping."""
+
+    def __init__(self, pipe: Any, load_seconds: float):
+        self.pipe = pipe
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.weights_bytes = _weights_bytes(pipe)
+
+
+def _default_factory(*args, **kwargs):
+    """Build a pipeline with transformers (imported on first use)."""
+    from transformers import pipeline
+    return pipeline(*args, **kwargs)
+
+
+def _weights_bytes(pipe: Any) -> int:
+    """
+    Count the bytes held by a pipeline model's parameters and buffers.
+
+    Tensors that share storage (tied weights) are only counted once.
+    """
+    model = getattr(pipe, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return 0
+
+    try:
+        seen = set()
+        total = 0
+        tensors = list(model.parameters()) + list(model.buffers())
+        for tensor in tensors:
+            storage = tensor.untyped_storage()
+            if storage.data_ptr() in seen:
+                continue
+            seen.add(storage.data_ptr())
+            total += storage.nbytes()
+        return total
+    except Exception as e:
+        logger.debug(f"Could not measure model memory: {e}")
+        return 0
+
+
+def _system_available_bytes() -> Optional[int]:
+    """Available system memory from /proc/meminfo, or None where unsupported."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class ManagedModel:
+    """
+    Handle to a registry model that survives eviction.
+
+    Calling the handle runs the underlying pipeline, reloading it first if it
+    was evicted, and pins the model so it cannot be evicted mid-inference.
+    Other attribute access (e.g. `.model`, `.tokenizer`) is forwarded to the
+    current pipeline.
+
+    Example:
+        >>> pipe = registry.load("text-classification", "jy46604790/Fake-News-Bert-Detect")
+        >>> pipe("Some news text")
+    """
+
+    def __init__(self, registry: "ModelRegistry", key: ModelKey):
+        self._registry = registry
+        self.key = key
+
+    @property
+    def pipeline(self) -> Any:
+        """The current underlying pipeline (loaded on demand)."""
+        return self._registry._get(self.key)
+
+    @property
+    def tuned_batch_size(self) -> Optional[int]:
+        """This host's tuned batch size for the model (from the tuning profile), or None."""
+        return (self._registry._tuned.get(self.key) or {}).get("batch_size")
+
+    @contextmanager
+    def pinned(self):
+        """
+        Pin the model for a `with` block and yield its current pipeline.
+
+        The model is reloaded first if it was evicted and cannot be evicted until
+        the block exits (used by PipelinePool to run replicas on these weights).
+        """
+        pipe = self._registry._get(self.key, pin=True)
+        try:
+            yield pipe
+        finally:
+            self._registry._unpin(self.key)
+
+    def __call__(self, *args, **kwargs):
+        with self.pinned() as pipe:
+            return pipe(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.pipeline, name)
+
+    def __repr__(self) -> str:
+        return f"ManagedModel({self.key})"
+
+
+class ModelRegistry:
+    """
+    Thread-safe, load-once store of Hugging Face pipelines with eviction.
+
+    Concurrent requests for the same key wait on a single load; different
+    keys load in parallel.
+
+    Example:
+        >>> registry = ModelRegistry(memory_budget_mb=2048, idle_timeout=600)
+        >>> pipe = registry.load("text-classification", "jy46604790/Fake-News-Bert-Detect")
+        >>> registry.memory_report()
+        >>> registry.stats()
+    """
+
+    def __init__(self, memory_budget_mb: float = 0, idle_timeout: float = 0, min_free_mb: float = 0):
+        """
+        Args:
+            memory_budget_mb (float): Maximum loaded weight memory in MB (0: unlimited)
+            idle_timeout (float): Seconds without use before a model is evicted (0: never)
+            min_free_mb (float): Evict when free system memory falls below this (0: off)
+        """
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.idle_timeout = idle_timeout
+        self.min_free_bytes = int(min_free_mb * 1024 * 1024)
+
+        self._entries: Dict[ModelKey, _Entry] = {}
+        self._specs: Dict[ModelKey, Dict[str, Any]] = {}
+        self._handles: Dict[ModelKey, ManagedModel] = {}
+        self._known_sizes: Dict[ModelKey, int] = {}
+        self._tuned: Dict[ModelKey, Dict[str, Any]] = {}
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        self._evicted: set = set()
+        self._evictions: Dict[str, int] = defaultdict(int)
+        self._reload_seconds: Dict[ModelKey, List[float]] = defaultdict(list)
+        self._reaper: Optional[threading.Thread] = None
+
+    def _key_lock(self, key: ModelKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _make_key(task, model, revision, device, precision) -> ModelKey:
+        precision = precision or MODEL_PRECISION
+        if precision is not None and precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision: {precision} (expected one of {', '.join(PRECISIONS)})")
+        return ModelKey(task, model, revision, device, precision)
+
+    def get_pipeline(
+        self,
+        task: str,
+        model: str,
+        revision: Optional[str] = None,
+        device: Any = -1,
+        precision: Optional[str] = None,
+        token: Optional[str] = None,
+        factory: Optional[Callable[..., Any]] = None
+    ) -> Any:
+        """
+        Return the shared pipeline for a model, loading it on first use.
+
+        The returned object is the raw pipeline: holding on to it keeps the
+        weights alive even after eviction. Long-lived callers should use load().
+
+        Args:
+            task (str): Pipeline task, e.g. "text-classification"
+            model (str): Hugging Face model id or local path
+            revision (str): Optional model revision (branch, tag or commit)
+            device: Device to run inference on (-1 for CPU)
+            precision (str): Optional weight precision: "fp32", "fp16", "bf16" or "int8"
+                             (int8 requires a prepared artifact, see prepare_models.py)
+            token (str): Optional Hugging Face token (not part of the key)
+            factory (Callable): Pipeline constructor (default: transformers.pipeline)
+
+        Returns:
+            Pipeline: The loaded (possibly shared) pipeline
+
+        Raises:
+            ValueError: If the precision is not supported
+            ModelUnavailableError: If the model is not cached and the hub is unreachable
+            Exception: If model loading fails
+        """
+        key = self._make_key(task, model, revision, device, precision)
+        with self._lock:
+            if key not in self._specs or factory is not None or token:
+                self._specs[key] = {"factory": factory, "token": token}
+        return self._get(key)
+
+    def load(
+        self,
+        task: str,
+        model: str,
+        revision: Optional[str] = None,
+        device: Any = -1,
+        precision: Optional[str] = None,
+        token: Optional[str] = None,
+        factory: Optional[Callable[..., Any]] = None
+    ) -> ManagedModel:
+        """
+        Load a model now and return an eviction-safe handle to it.
+
+        Takes the same arguments as get_pipeline(). Loading happens eagerly so
+        errors surface here; later calls through the handle reload the model
+        transparently if it has been evicted in the meantime.
+
+        Returns:
+            ManagedModel: Shared handle for the key
+        """
+        self.get_pipeline(task, model, revision, device, precision, token=token, factory=factory)
+        key = self._make_key(task, model, revision, device, precision)
+        with self._lock:
+            return self._handles.setdefault(key, ManagedModel(self, key))
+
+    def _get(self, key: ModelKey, pin: bool = False) -> Any:
+        """Return the pipeline for a key, loading it if needed; optionally pin it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                if pin:
+                    entry.in_use += 1
+                return entry.pipe
+
+        self.evict_idle()
+
+        with self._key_lock(key):
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.last_used = time.monotonic()
+                    if pin:
+                        entry.in_use += 1
+                    return entry.pipe
+                spec = self._specs.get(key, {})
+
+            self._make_room(self._known_sizes.get(key, 0), exclude=key)
+
+            # Prefer weights already on disk; fails fast when offline and not cached
+            resolution = model_cache.resolve_model(key.model, key.revision)
+
+            pipeline_kwargs = {"model": resolution.location, "device": key.device}
+            if key.revision and not resolution.is_local:
+                pipeline_kwargs["revision"] = key.revision
+            pipeline_kwargs.update(model_cache.pipeline_kwargs(resolution, key.task))
+            if key.precision == "int8" and not (resolution.artifacts or {}).get("int8"):
+                # MODEL_PRECISION=int8 applies to every model; those never quantized load as fp32
+                logger.warning(f"No int8 artifact for {key.model}; loading fp32 weights (run prepare_models.py to build one)")
+            elif key.precision == "int8":
+                pipeline_kwargs["model"] = model_cache.load_quantized(resolution)
+                pipeline_kwargs.pop("model_kwargs", None)
+                preprocessor = "image_processor" if key.task.startswith("image") else "tokenizer"
+                pipeline_kwargs.setdefault(preprocessor, resolution.location)
+            elif key.precision:
+                pipeline_kwargs["torch_dtype"] = PRECISIONS[key.precision]
+            if spec.get("token"):
+                pipeline_kwargs["token"] = spec["token"]
+
+            start = time.perf_counter()
+            pipe = (spec.get("factory") or _default_factory)(key.task, **pipeline_kwargs)
+            entry = _Entry(pipe, time.perf_counter() - start)
+
+            try:
+                tuned = tuning.settings_for(key.task, key.model)
+            except Exception as e:
+                logger.warning(f"Could not read tuning profile for {key}: {e}")
+                tuned = None
+            if tuned:
+                # Batch size is passed per call (tuned_batch_size); threads are process-wide, set once here
+                tuning.set_threads(tuned.get("intra_op_threads"))
+                logger.info(f"Tuning profile for {key.model}: batch {tuned.get('batch_size')}, "
+                            f"{tuned.get('intra_op_threads')} threads")
+
+            if compiled.MODEL_COMPILE and key.task in COMPILABLE_TASKS:
+                compiled.compile_pipeline(pipe)
+
+            with self._lock:
+                if pin:
+                    entry.in_use += 1
+                self._entries[key] = entry
+                self._known_sizes[key] = entry.weights_bytes
+                if tuned:
+                    self._tuned[key] = tuned
+                if key in self._evicted:
+                    self._evicted.discard(key)
+                    self._reload_seconds[key].append(entry.load_seconds)
+                    logger.info(f"Reloaded {key} in {entry.load_seconds:.1f}s")
+
+            logger.info(f"Registered {key} ({entry.weights_bytes / 1e6:.1f} MB, {entry.load_seconds:.1f}s)")
+
+        # The new model may have pushed us over budget; make room among the others
+        self._make_room(0, exclude=key)
+        return pipe
+
+    def _unpin(self, key: ModelKey):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.in_use > 0:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def _evict(self, key: ModelKey, reason: str) -> bool:
+        """Remove an unpinned entry. Caller must hold self._lock."""
+        entry = self._entries.get(key)
+        if entry is None or entry.in_use > 0:
+            return False
+        del self._entries[key]
+        self._evicted.add(key)
+        self._evictions[reason] += 1
+        logger.info(f"Evicted {key} ({reason}, {entry.weights_bytes / 1e6:.1f} MB)")
+        return True
+
+    def _over_limits(self, incoming_bytes: int) -> Optional[str]:
+        """Return the reason we need to free memory, or None. Caller must hold self._lock."""
+        if self.memory_budget_bytes:
+            resident = sum(e.weights_bytes for e in self._entries.values())
+            if resident + incoming_bytes > self.memory_budget_bytes:
+                return "budget"
+        if self.min_free_bytes:
+            available = _system_available_bytes()
+            if available is not None and available - incoming_bytes < self.min_free_bytes:
+                return "pressure"
+        return None
+
+    def _make_room(self, incoming_bytes: int, exclude: Optional[ModelKey] = None):
+        """
+        Evict least recently used models until the limits allow `incoming_bytes` more.
+
+        One model is evicted at a time and its memory released before the
+        limits are checked again, so system memory readings reflect the eviction.
+        """
+        while True:
+            with self._lock:
+                reason = self._over_limits(incoming_bytes)
+                if reason is None:
+                    return
+                candidates = sorted(
+                    (e.last_used, k) for k, e in self._entries.items()
+                    if k != exclude and e.in_use == 0
+                )
+                if not candidates:
+                    logger.warning("Model memory limit exceeded but every other model is in use")
+                    return
+                evicted = self._evict(candidates[0][1], reason)
+            if evicted:
+                _release_memory()
+
+    def evict_idle(self) -> int:
+        """
+        Evict models that have not been used for `idle_timeout` seconds.
+
+        Returns:
+            int: Number of models evicted
+        """
+        if not self.idle_timeout:
+            return 0
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [k for k, e in self._entries.items() if e.last_used < cutoff and e.in_use == 0]
+            evicted = sum(self._evict(k, "idle") for k in idle)
+        if evicted:
+            _release_memory()
+        return evicted
+
+    def start_reaper(self, interval: float = 30.0):
+        """
+        Start a daemon thread that evicts idle models periodically.
+
+        Does nothing if no idle timeout is configured or the reaper already runs.
+        """
+        if not self.idle_timeout or (self._reaper and self._reaper.is_alive()):
+            return
+
+        def _loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.evict_idle()
+                    self._make_room(0)
+                except Exception as e:
+                    logger.warning(f"Model reaper failed: {e}")
+
+        self._reaper = threading.Thread(target=_loop, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+    def unload(self, task: str, model: str, revision: Optional[str] = None, device: Any = -1, precision: Optional[str] = None) -> bool:
+        """
+        Drop a model from the registry so its memory can be reclaimed.
+
+        Callers that still hold a reference to the raw pipeline keep it alive;
+        handles from load() reload it on their next call.
+
+        Returns:
+            bool: True if the model was loaded and has been removed
+        """
+        key = self._make_key(task, model, revision, device, precision)
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        del entry
+        _release_memory()
+        logger.info(f"Unloaded {key}")
+        return True
+
+    def clear(self):
+        """Unload every model and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._handles.clear()
+            self._specs.clear()
+            self._known_sizes.clear()
+            self._tuned.clear()
+            self._evicted.clear()
+            self._evictions.clear()
+            self._reload_seconds.clear()
+        _release_memory()
+
+    def loaded(self) -> List[ModelKey]:
+        """Keys of the currently loaded models."""
+        with self._lock:
+            return list(self._entries)
+
+    def memory_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report the resident weight memory and load time of each loaded model.
+
+        Returns:
+            Dict[str, Dict]: Key description -> {weights_bytes, load_seconds, loaded_at, idle_seconds}
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            str(key): {
+                "weights_bytes": entry.weights_bytes,
+                "load_seconds": entry.load_seconds,
+                "loaded_at": entry.loaded_at,
+                "idle_seconds": now - entry.last_used,
+            }
+            for key, entry in entries
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Eviction and reload statistics for tuning the memory settings.
+
+        Returns:
+            Dict[str, Any]: resident_bytes, budget_bytes, evictions by reason,
+                            total reloads and reload latency per model
+        """
+        with self._lock:
+            resident = sum(e.weights_bytes for e in self._entries.values())
+            reloads = {
+                str(key): {
+                    "count": len(samples),
+                    "mean_seconds": sum(samples) / len(samples),
+                    "last_seconds": samples[-1],
+                }
+                for key, samples in self._reload_seconds.items() if samples
+            }
+            return {
+                "resident_bytes": resident,
+                "budget_bytes": self.memory_budget_bytes,
+                "evictions": dict(self._evictions),
+                "reloads": sum(r["count"] for r in reloads.values()),
+                "reload_latency": reloads,
+            }
+
+
+def _release_memory():
+    """Collect garbage and return cached GPU memory, if any."""
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+# The process-wide registry used by all loaders
+registry = ModelRegistry(
+    memory_budget_mb=MODEL_MEMORY_BUDGET_MB,
+    idle_timeout=MODEL_IDLE_TIMEOUT,
+    min_free_mb=MODEL_MIN_FREE_MB
+)
+
+get_pipeline = registry.get_pipeline
+load = registry.load
+unload = registry.unload
+memory_report = registry.memory_report
+stats = registry.stats
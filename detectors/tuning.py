@@ -0,0 +1,263 @@
+"""
+Inference Tuning Module
+
+The best batch size and torch intra-op thread count differ between small and
+large hosts. This module sweeps both on synthetic inputs for a loaded
+pipeline, picks the highest-throughput setting that meets a latency SLO and
+stores it in a per-host profile (written by autotune.py).
+
+The registry applies a matching profile automatically: its handles expose the
+tuned batch size (`tuned_batch_size`), which the classify functions pass per
+call, and the tuned thread count is set once when the model loads.
+torch.set_num_threads is process-wide, so a replica pool (pool.py) pins its
+own per-replica split instead, and tuned counts are ignored from then on.
+
+A profile is ignored on a host whose CPU differs from the one it was tuned on.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from . import model_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TUNING_PROFILE = os.getenv(
+    "MODEL_TUNING_PROFILE",
+    os.path.join(model_cache.MODEL_CACHE_DIR, f"tuning-{socket.gethostname()}.json")
+)
+
+DEFAULT_BATCH_SIZES = [1, 2, 4, 8, 16]
+
+# Synthetic text long enough to hit the models' 512-token truncation
+_TUNING_TEXT_REPEAT = 40
+
+_profile_cache = {"path": None, "mtime": None, "data": {}}
+_lock = threading.Lock()
+
+# Intra-op thread count pinned by a replica pool (tuned counts no longer apply)
+_pinned_threads: Optional[int] = None
+
+
+def host_signature() -> Dict[str, Any]:
+    """Describe the CPU a profile applies to."""
+    cpu_model = None
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu_model = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return {"host": socket.gethostname(), "cpu_count": os.cpu_count(), "cpu_model": cpu_model}
+
+
+def profile_key(task: str, model: str) -> str:
+    """Profile entry name for a model."""
+    return f"{task} {model}"
+
+
+def default_thread_counts() -> List[int]:
+    """Powers of two up to the core count, plus the core count itself."""
+    cores = os.cpu_count() or 1
+    counts = []
+    n = 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    counts.append(cores)
+    return counts
+
+
+def load_profile(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the tuning profile for this host (re-read only when the file changes).
+
+    Returns:
+        Dict[str, Any]: Profile {"host": ..., "models": {...}}, or {} if missing
+                        or tuned on different hardware
+    """
+    path = path or TUNING_PROFILE
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+
+    with _lock:
+        if _profile_cache["path"] == path and _profile_cache["mtime"] == mtime:
+            return _profile_cache["data"]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable tuning profile {path}: {e}")
+        data = {}
+
+    host = data.get("host", {})
+    current = host_signature()
+    if data and (host.get("cpu_count"), host.get("cpu_model")) != (current["cpu_count"], current["cpu_model"]):
+        logger.warning(f"Ignoring tuning profile {path}: tuned on different hardware ({host.get('cpu_count')} cores)")
+        data = {}
+
+    with _lock:
+        _profile_cache.update(path=path, mtime=mtime, data=data)
+    return data
+
+
+def settings_for(task: str, model: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Look up the tuned settings of a model.
+
+    Returns:
+        Dict[str, Any]: {batch_size, intra_op_threads, ...}, or None if the model is not tuned
+    """
+    return load_profile(path).get("models", {}).get(profile_key(task, model))
+
+
+def save_profile(models: Dict[str, Dict[str, Any]], path: Optional[str] = None):
+    """
+    Merge tuned settings into the profile and write it atomically.
+
+    Args:
+        models (Dict[str, Dict]): profile_key() -> chosen settings
+        path (str): Profile path (default: TUNING_PROFILE)
+    """
+    path = path or TUNING_PROFILE
+    existing = load_profile(path)
+    data = {
+        "host": host_signature(),
+        "updated_at": time.time(),
+        "models": dict(existing.get("models", {}), **models),
+    }
+    model_cache.write_json(path, data)
+
+
+def set_threads(count: Optional[int], pin: bool = False):
+    """
+    Set torch's intra-op thread count for the process (no-op if unchanged).
+
+    torch.set_num_threads changes the default every thread uses, not just the
+    caller's, so it is set once per owner rather than per call: the registry
+    when a tuned model loads, or a replica pool with pin=True. Once pinned,
+    unpinned calls are ignored.
+
+    Args:
+        count (int): Threads (None / 0: leave unchanged)
+        pin (bool): Keep this count even when tuned models load later
+    """
+    global _pinned_threads
+    if not count:
+        return
+    with _lock:
+        if pin:
+            _pinned_threads = count
+        elif _pinned_threads is not None:
+            return
+    import torch
+    if torch.get_num_threads() != count:
+        torch.set_num_threads(count)
+
+
+def _synthetic_inputs(task: str, batch_size: int) -> List[Any]:
+    from .warmup import WARMUP_TEXT, dummy_inputs
+    if task.startswith("image"):
+        return dummy_inputs(task, batch_size)
+    return [" ".join([WARMUP_TEXT] * _TUNING_TEXT_REPEAT)] * batch_size
+
+
+def sweep(
+    pipe,
+    task: str,
+    slo_ms: float,
+    batch_sizes: Optional[List[int]] = None,
+    thread_counts: Optional[List[int]] = None,
+    repeats: int = 3
+) -> Dict[str, Any]:
+    """
+    Measure every batch size / thread count combination and pick the best.
+
+    The chosen setting has the highest throughput among those whose p95
+    latency per batch stays within the SLO; if none does, the lowest-latency
+    setting is chosen and marked with slo_met=False.
+
+    Args:
+        pipe: Loaded pipeline (raw or registry handle)
+        task (str): Pipeline task ("text-classification" or "image-classification")
+        slo_ms (float): Latency objective per batch in milliseconds
+        batch_sizes (List[int]): Batch sizes to try (default: DEFAULT_BATCH_SIZES)
+        thread_counts (List[int]): Intra-op thread counts to try (default: default_thread_counts())
+        repeats (int): Timed calls per combination (after one untimed warm-up call)
+
+    Returns:
+        Dict[str, Any]: {"best": settings, "trials": [per-combination measurements]}
+
+    Raises:
+        RuntimeError: If every combination failed
+
+    Example:
+        >>> result = sweep(pipe, "text-classification", slo_ms=500)
+        >>> result["best"]
+        {'batch_size': 8, 'intra_op_threads': 4, 'throughput': 41.2, 'p95_ms': 194.0, 'slo_met': True, ...}
+    """
+    import torch
+
+    batch_sizes = batch_sizes or DEFAULT_BATCH_SIZES
+    thread_counts = thread_counts or default_thread_counts()
+    # Same truncation as fake_news.classify_text
+    call_kwargs = {} if task.startswith("image") else {"truncation": True, "max_length": 512}
+    original_threads = torch.get_num_threads()
+
+    trials = []
+    try:
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            for batch_size in batch_sizes:
+                inputs = _synthetic_inputs(task, batch_size)
+                latencies = []
+                try:
+                    pipe(inputs, batch_size=batch_size, **call_kwargs)
+                    for _ in range(max(1, repeats)):
+                        start = time.perf_counter()
+                        pipe(inputs, batch_size=batch_size, **call_kwargs)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                except Exception as e:
+                    # e.g. out of memory at large batches
+                    logger.warning(f"threads={threads} batch={batch_size} failed: {e}")
+                    continue
+
+                latencies.sort()
+                p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+                mean = sum(latencies) / len(latencies)
+                trials.append({
+                    "batch_size": batch_size,
+                    "intra_op_threads": threads,
+                    "mean_ms": round(mean, 2),
+                    "p95_ms": round(p95, 2),
+                    "throughput": round(batch_size / (mean / 1000), 2),
+                    "slo_met": p95 <= slo_ms,
+                })
+                logger.info(f"threads={threads} batch={batch_size}: {trials[-1]['throughput']} items/s, p95 {p95:.0f} ms")
+    finally:
+        torch.set_num_threads(original_threads)
+
+    if not trials:
+        raise RuntimeError("Every tuning trial failed")
+
+    within_slo = [t for t in trials if t["slo_met"]]
+    if within_slo:
+        best = max(within_slo, key=lambda t: (t["throughput"], -t["intra_op_threads"]))
+    else:
+        logger.warning(f"No setting meets the {slo_ms} ms SLO; choosing the lowest latency")
+        best = min(trials, key=lambda t: t["p95_ms"])
+
+    return {"best": dict(best, slo_ms=slo_ms, tuned_at=time.time()), "trials": trials}
+
@@ -0,0 +1,180 @@
+"""
+Model Warm-up Module
+
+Loads the application's models in a background thread when a server process
+starts, then runs a dummy forward pass for each supported batch size so lazy
+kernel / allocator initialization happens before the first real request.
+
+Loading goes through the model registry, whose per-model lock makes a request
+that arrives mid-warm-up wait for the same load instead of starting another.
+Readiness is exposed through status(), is_ready() and wait().
+
+Warm-up is opt-in: set MODEL_WARMUP=1.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "0") == "1"
+
+# Batch sizes exercised by the dummy passes (the face / tile paths batch up to 8)
+WARMUP_BATCH_SIZES = [int(n) for n in os.getenv("MODEL_WARMUP_BATCH_SIZES", "1,8").split(",") if n.strip()]
+
+WARMUP_TEXT = "Officials confirmed the report on Tuesday, according to a statement published by the agency."
+
+
+class WarmupTarget(NamedTuple):
+    """A model to warm up: its task and a loader returning a callable pipeline (or None)."""
+    name: str
+    task: str
+    loader: Callable[[], Any]
+
+
+def _load_text_model():
+    from . import fake_news_offline
+    model_info = fake_news_offline.load_text_model_with_fallback(device=-1)
+    # Rule-based fallback: nothing to warm up
+    return model_info["model"] if model_info["type"] == "huggingface" else None
+
+
+def _load_image_model():
+    from . import deepfake
+    return deepfake.load_image_model(device=-1)
+
+
+def default_targets() -> List[WarmupTarget]:
+    """The models the Streamlit app loads on its first text and image requests."""
+    return [
+        WarmupTarget("text", "text-classification", _load_text_model),
+        WarmupTarget("image", "image-classification", _load_image_model),
+    ]
+
+
+def dummy_inputs(task: str, batch_size: int) -> List[Any]:
+    """Synthetic inputs for a task: mid-gray 224x224 images or a short news sentence."""
+    if task.startswith("image"):
+        from PIL import Image
+        return [Image.new("RGB", (224, 224), (128, 128, 128)) for _ in range(batch_size)]
+    return [WARMUP_TEXT] * batch_size
+
+
+class ModelWarmup:
+    """
+    Background warm-up of a set of models with readiness tracking.
+
+    Example:
+        >>> warmup = ModelWarmup()
+        >>> warmup.start()
+        >>> warmup.status()
+        {'text': 'loading', 'image': 'pending'}
+        >>> warmup.wait(timeout=60)
+        True
+    """
+
+    def __init__(self, batch_sizes: Optional[List[int]] = None):
+        """
+        Args:
+            batch_sizes (List[int]): Batch sizes for the dummy passes (default: WARMUP_BATCH_SIZES)
+        """
+        self.batch_sizes = batch_sizes or WARMUP_BATCH_SIZES
+        self._status: Dict[str, str] = {}
+        self._seconds: Dict[str, float] = {}
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self, targets: Optional[List[WarmupTarget]] = None) -> bool:
+        """
+        Start warming up in a daemon thread (once per process).
+
+        Args:
+            targets (List[WarmupTarget]): Models to warm up (default: default_targets())
+
+        Returns:
+            bool: True if a warm-up thread was started
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            targets = targets if targets is not None else default_targets()
+            self._status = {target.name: "pending" for target in targets}
+            self._done.clear()
+            self._thread = threading.Thread(target=self._run, args=(targets,), name="model-warmup", daemon=True)
+            self._thread.start()
+        logger.info(f"🔥 Warming up models in the background: {', '.join(self._status)}")
+        return True
+
+    def _set(self, name: str, state: str):
+        with self._lock:
+            self._status[name] = state
+
+    def _run(self, targets: List[WarmupTarget]):
+        for target in targets:
+            start = time.perf_counter()
+            self._set(target.name, "loading")
+            try:
+                pipe = target.loader()
+                if pipe is not None:
+                    self._set(target.name, "warming")
+                    for batch_size in self.batch_sizes:
+                        pipe(dummy_inputs(target.task, batch_size), batch_size=batch_size)
+                seconds = time.perf_counter() - start
+                with self._lock:
+                    self._seconds[target.name] = seconds
+                    self._status[target.name] = "ready"
+                logger.info(f"✓ Warmed up {target.name} model in {seconds:.1f}s")
+            except Exception as e:
+                self._set(target.name, f"failed: {str(e)[:100]}")
+                logger.warning(f"Warm-up of {target.name} model failed: {e}")
+        self._done.set()
+
+    def status(self) -> Dict[str, str]:
+        """
+        Current state per model: "pending", "loading", "warming", "ready" or "failed: <reason>".
+        """
+        with self._lock:
+            return dict(self._status)
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """
+        Check whether one model (or every model) finished warming up successfully.
+
+        Args:
+            name (str): Target name, e.g. "text" (default: all targets)
+        """
+        status = self.status()
+        if name is not None:
+            return status.get(name) == "ready"
+        return bool(status) and all(state == "ready" for state in status.values())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the warm-up has finished (successfully or not).
+
+        Returns:
+            bool: True if the warm-up finished within the timeout
+        """
+        if self._thread is None:
+            return True
+        return self._done.wait(timeout)
+
+    def timings(self) -> Dict[str, float]:
+        """Seconds spent loading and warming up each finished model."""
+        with self._lock:
+            return dict(self._seconds)
+
+
+# The process-wide warm-up used by the app
+warmup = ModelWarmup()
+
+start = warmup.start
+status = warmup.status
+is_ready = warmup.is_ready
+wait = warmup.wait
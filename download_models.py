@@ -1,13 +1,16 @@
 """
 Download and Test Models Script
 This script downloads the AI models and tests them to ensure they work.
+Files are fetched and checksummed by detectors.model_prep (see prepare_models.py
+for building optimized artifacts as well).
 """
 
 import os
 from dotenv import load_dotenv
-from transformers import pipeline
 import sys
 
+from detectors import model_prep, registry
+
 # Load environment variables
 load_dotenv()
 
@@ -19,18 +22,23 @@ def download_model(model_name, task, description):
     print(f"{'='*70}")
     
     try:
-        print(f"⏳ Initializing pipeline...")
-        model = pipeline(task, model=model_name)
-        print(f"✅ Successfully loaded {description}!")
+        print(f"⏳ Fetching and verifying files...")
+        results = model_prep.prepare_all([model_prep.ModelSpec(model_name, task)], formats=[])
+        result = next(iter(results.values()))
+        if not result["ok"]:
+            raise Exception(result["error"])
+        entry = result["entry"]
+        print(f"✅ Successfully downloaded {description}! ({entry['source']}, {len(entry['files'])} files verified)")
         
         # Test the model
         print(f"🧪 Testing model...")
         if task == "text-classification":
+            model = registry.get_pipeline(task, model_name)
             test_text = "This is a test article about politics and news."
             result = model(test_text)
             print(f"✅ Test successful! Result: {result}")
         elif task == "image-classification":
-            print(f"✅ Model loaded successfully (image test requires actual image)")
+            print(f"✅ Model downloaded successfully (image test requires actual image)")
         
         return True
     except Exception as e:
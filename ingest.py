@@ -0,0 +1,89 @@
+"""
+Ingest Script
+
+Incrementally pulls NewsAPI results for one or more queries and classifies
+only the articles not seen in earlier runs (see utils/ingest.py). Meant to
+be run on a schedule, e.g. from cron:
+
+    */30 * * * * cd /app && python ingest.py "election fraud" "vaccine" --classify
+
+Usage:
+    python ingest.py QUERY [QUERY ...] [--classify] [--db path.sqlite] [--max-requests 5]
+"""
+
+import argparse
+import json
+import sys
+
+from dotenv import load_dotenv
+
+# Load environment variables before the NewsAPI key is read
+load_dotenv()
+
+from utils import ingest, newsapi_client  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental NewsAPI ingestion")
+    parser.add_argument("queries", nargs="+", help="NewsAPI search queries")
+    parser.add_argument("--classify", action="store_true", help="Run the fake news classifier on new articles")
+    parser.add_argument("--db", default=None, help="Watermark / seen-URL database (default: INGEST_DB_PATH)")
+    parser.add_argument("--max-requests", type=int, default=None, help="NewsAPI page budget per query")
+    parser.add_argument("--language", default="en", help="Article language")
+    parser.add_argument("--output", "-o", help="Append new articles (and verdicts) as JSON lines")
+    args = parser.parse_args()
+
+    if not newsapi_client.is_newsapi_configured():
+        print("❌ NEWSAPI_KEY is not set", file=sys.stderr)
+        return 1
+
+    store = ingest.IngestStore(args.db) if args.db else ingest.get_store()
+    pruned = store.prune()
+    if pruned:
+        print(f"🧹 Forgot {pruned} URLs older than {ingest.INGEST_SEEN_DAYS:g} days")
+
+    classify = None
+    if args.classify:
+        from detectors import fake_news
+        model = fake_news.load_text_model()
+
+        def classify(articles):
+            verdicts = []
+            for article in articles:
+                text = newsapi_client.extract_article_text(article)
+                try:
+                    verdicts.append(fake_news.classify_text(model, text) if text else None)
+                except ValueError:
+                    verdicts.append(None)
+            return verdicts
+
+    out = open(args.output, "a", encoding="utf-8") if args.output else None
+    try:
+        for query in args.queries:
+            report = ingest.ingest(query, classify=classify, store=store,
+                                   language=args.language, max_requests=args.max_requests)
+            print(f"📰 {query!r}: {report['fetched']} fetched, {report['new']} new, "
+                  f"{report['duplicates']} duplicates (watermark {report['watermark'] or '-'}, {report['seconds']:.1f}s)")
+            if report["backfill"]:
+                since, until = report["backfill"]
+                print(f"   ⏳ stopped early ({report['ended']}); articles from {since or 'the start'} "
+                      f"to {until} are fetched on the next runs")
+
+            verdicts = report["verdicts"] or [None] * len(report["articles"])
+            for article, verdict in zip(report["articles"], verdicts):
+                if verdict:
+                    print(f"   {verdict['label']:<5} {verdict['score']:.0%}  {article.get('title', '')[:80]}")
+                if out:
+                    record = {"query": query, "url": article.get("url"), "title": article.get("title"),
+                              "publishedAt": article.get("publishedAt")}
+                    if verdict:
+                        record.update(label=verdict["label"], score=verdict["score"])
+                    out.write(json.dumps(record) + "\n")
+    finally:
+        if out:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Prepare Models Script
+
+Resolves every configured model (from a local mirror, the Hugging Face cache
+or the hub), verifies file checksums, builds optimized artifacts and writes
+the manifest the loaders read. Run this once per deployment so production
+nodes never download or convert anything at startup.
+
+Usage:
+    python prepare_models.py [--mirror /mnt/models] [--formats tokenizer,int8,onnx]
+    python prepare_models.py --model image-classification:dima806/deepfake_vs_real_image_detection
+    python prepare_models.py --verify-only
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from detectors import model_cache, model_prep
+
+# Load environment variables
+load_dotenv()
+
+
+def parse_model(value):
+    """Parse "task:model[@revision]" into a ModelSpec."""
+    task, sep, model = value.partition(":")
+    if not sep or not model:
+        raise argparse.ArgumentTypeError("expected task:model[@revision], e.g. text-classification:org/name")
+    model, _, revision = model.partition("@")
+    return model_prep.ModelSpec(model, task, revision or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch, verify and optimize models ahead of deployment")
+    parser.add_argument("--mirror", default=os.getenv("MODEL_MIRROR_DIR"), help="Local mirror directory checked before any cache")
+    parser.add_argument("--model", action="append", type=parse_model, help="task:model[@revision] (repeatable; default: all configured models)")
+    parser.add_argument("--formats", default=",".join(model_prep.DEFAULT_FORMATS), help=f"Artifacts to build (comma-separated, from: {', '.join(model_prep.ARTIFACT_FORMATS)})")
+    parser.add_argument("--verify-only", action="store_true", help="Fetch and verify checksums without building artifacts")
+    parser.add_argument("--manifest", default=model_cache.MODEL_MANIFEST, help="Manifest path to write")
+    parser.add_argument("--workers", type=int, default=4, help="Models prepared in parallel")
+    args = parser.parse_args()
+
+    formats = [] if args.verify_only else [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(model_prep.ARTIFACT_FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+
+    specs = args.model or model_prep.configured_models()
+
+    print("\n" + "=" * 70)
+    print("🛠️  MODEL PREPARATION")
+    print("=" * 70)
+    print(f"Mirror:    {args.mirror or '-'}")
+    print(f"Manifest:  {args.manifest}")
+    print(f"Artifacts: {', '.join(formats) or '-'}")
+    print(f"\n📋 Models ({len(specs)}):")
+    for spec in specs:
+        print(f"  • {spec.task}: {model_cache.manifest_key(spec.model, spec.revision)}")
+
+    results = model_prep.prepare_all(
+        specs,
+        mirror=args.mirror,
+        formats=formats,
+        manifest_path=args.manifest,
+        max_workers=args.workers,
+        token=os.getenv("HUGGINGFACE_TOKEN")
+    )
+
+    print(f"\n{'=' * 70}")
+    print("📊 PREPARATION SUMMARY")
+    print(f"{'=' * 70}")
+    for key, result in results.items():
+        if not result["ok"]:
+            print(f"❌ {key}: {result['error']}")
+            continue
+        entry = result["entry"]
+        print(f"✅ {key} ({entry['source']}, {len(entry['files'])} files verified)")
+        for name, artifact in entry["artifacts"].items():
+            if "error" in artifact:
+                print(f"     ⚠️  {name}: {artifact['error']}")
+            else:
+                print(f"     • {name}: {artifact['path']}")
+
+    if all(r["ok"] for r in results.values()):
+        print(f"\n🎉 Manifest written to {args.manifest}")
+        return 0
+
+    print(f"\n⚠️ Some models could not be prepared; their previous manifest entries were kept.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
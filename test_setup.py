@@ -127,6 +127,12 @@ def test_image_model():
         
         print("\n✓ Deepfake detection model is ready!")
         print("  (Image/video testing requires actual media files)")
+        
+        # Both loaders share the process-wide registry; show what it holds
+        from detectors import registry
+        print("\nLoaded models:")
+        for key, info in registry.memory_report().items():
+            print(f"  {key}: {info['weights_bytes'] / 1e6:.1f} MB")
         return True
         
     except Exception as e:
@@ -72,6 +72,20 @@ class TestFakeNewsDetector:
         with pytest.raises(ValueError, match="Input text cannot be empty"):
             fake_news.classify_text(mock_pipe, "")
     
+    def test_classify_texts_batches_and_skips_empty(self):
+        """Test many texts go through one batched pipeline call."""
+        from detectors import fake_news
+        
+        mock_pipe = Mock(return_value=[{"label": "LABEL_0", "score": 0.9}, {"label": "LABEL_1", "score": 0.8}])
+        mock_pipe.model.config.id2label = {0: "Fake", 1: "Real"}
+        mock_pipe.tuned_batch_size = 4
+        
+        results = fake_news.classify_texts(mock_pipe, ["First article.", "  ", "Second article."])
+        
+        mock_pipe.assert_called_once_with(["First article.", "Second article."], truncation=True, max_length=512, batch_size=4)
+        assert [r and r["label"] for r in results] == ["Fake", None, "Real"]
+        assert results[2]["score"] == 0.8
+    
     def test_label_mapping(self):
         """Test label mapping from LABEL_X to human-readable."""
         from detectors.fake_news import _map_label_to_human
@@ -137,6 +151,771 @@ class TestDeepfakeDetector:
         assert "raw" in result
         assert 0 <= result["score"] <= 1
 
+    @patch('utils.face_utils.detect_faces')
+    @patch('utils.face_utils.load_rgb_array')
+    def test_classify_image_faces_batches_crops(self, mock_load, mock_detect):
+        """Test that all face crops go through one batched call and are aggregated."""
+        import numpy as np
+        from detectors import deepfake
+
+        mock_load.return_value = np.zeros((200, 300, 3), dtype=np.uint8)
+        mock_detect.return_value = [(10, 10, 50, 50), (150, 20, 60, 60)]
+
+        mock_pipe = Mock()
+        mock_pipe.return_value = [
+            [{"label": "Real", "score": 0.9}, {"label": "Fake", "score": 0.1}],
+            [{"label": "Fake", "score": 0.8}, {"label": "Real", "score": 0.2}],
+        ]
+
+        result = deepfake.classify_image_faces(mock_pipe, "test_image.jpg")
+
+        # One pipeline call with both crops
+        mock_pipe.assert_called_once()
+        assert len(mock_pipe.call_args[0][0]) == 2
+
+        # Max aggregation: one manipulated face flags the image
+        assert result["label"] == "Deepfake"
+        assert result["score"] == pytest.approx(0.8)
+        assert result["face_count"] == 2
+        assert result["raw"]["method"] == "faces"
+
+    @patch('utils.face_utils.detect_faces')
+    @patch('utils.face_utils.load_rgb_array')
+    def test_classify_image_faces_without_faces(self, mock_load, mock_detect):
+        """Test the whole-frame fallback when no face is detected."""
+        import numpy as np
+        from detectors import deepfake
+
+        mock_load.return_value = np.zeros((200, 300, 3), dtype=np.uint8)
+        mock_detect.return_value = []
+
+        mock_pipe = Mock()
+        mock_pipe.return_value = [{"label": "Real", "score": 0.7}, {"label": "Fake", "score": 0.3}]
+
+        result = deepfake.classify_image_faces(mock_pipe, "test_image.jpg")
+
+        assert result["label"] == "Real"
+        assert result["score"] == pytest.approx(0.7)
+        assert result["face_count"] == 0
+        assert result["raw"]["method"] == "whole-frame"
+
+    @patch('utils.face_utils.detect_faces')
+    @patch('utils.face_utils.load_rgb_array')
+    def test_video_faces_classified_in_chunks(self, mock_load, mock_detect):
+        """Test frames are decoded and classified a chunk at a time and a failing chunk only drops its frames."""
+        import numpy as np
+        from detectors import deepfake
+
+        mock_load.return_value = np.zeros((120, 160, 3), dtype=np.uint8)
+        mock_detect.return_value = []
+        loaded_at_call = []
+
+        def fake_pipe(images, batch_size=8):
+            loaded_at_call.append(mock_load.call_count)
+            if len(loaded_at_call) == 2:
+                raise RuntimeError("out of memory")
+            return [[{"label": "Fake", "score": 0.2}, {"label": "Real", "score": 0.8}] for _ in images]
+
+        frame_paths = [f"frame_{i}.jpg" for i in range(10)]
+        results = deepfake._classify_frames_by_faces(Mock(side_effect=fake_pipe), frame_paths, batch_size=4)
+
+        # Chunks of 4, 4 and 2 frames, each classified before the next is decoded
+        assert loaded_at_call == [4, 8, 10]
+        assert len(results) == 6
+        assert all(r["label"] == "Real" for r in results)
+
+    def test_classify_image_tiled_respects_budget(self, tmp_path):
+        """Test that tiles are classified in one batch and mapped to a heatmap."""
+        from PIL import Image
+        from detectors import deepfake
+
+        image_path = str(tmp_path / "large.png")
+        Image.new("RGB", (2000, 1200)).save(image_path)
+
+        def fake_pipe(images, batch_size=8):
+            return [[{"label": "Fake", "score": 0.1 * (i % 10)}] for i in range(len(images))]
+
+        mock_pipe = Mock(side_effect=fake_pipe)
+        mock_pipe.image_processor.size = {"height": 224, "width": 224}
+
+        result = deepfake.classify_image_tiled(mock_pipe, image_path, max_tiles=12)
+
+        mock_pipe.assert_called_once()
+        rows, cols = result["heatmap"].shape
+        assert rows * cols == result["tile_count"] <= 12
+        assert result["raw"]["tile_size"] > 224
+        assert result["label"] == "Deepfake"
+
+
+class TestImageEnsemble:
+    """Tests for the multi-model deepfake ensemble."""
+
+    @staticmethod
+    def _member(fake_logit):
+        import torch
+
+        pipe = Mock()
+        pipe.image_processor.to_dict.return_value = {"size": {"height": 224, "width": 224}}
+        pipe.image_processor.return_value = {"pixel_values": torch.zeros(1, 3, 4, 4)}
+        pipe.model.return_value = Mock(logits=torch.tensor([[0.0, fake_logit]]))
+        pipe.model.device = "cpu"
+        pipe.model.dtype = torch.float32
+        pipe.model.config.id2label = {0: "Real", 1: "Fake"}
+        return pipe
+
+    def test_shared_preprocessing_and_fusion(self, tmp_path):
+        """Test that matching processors preprocess once and scores are averaged."""
+        from PIL import Image
+        from detectors.ensemble import ImageEnsemble
+
+        image_path = str(tmp_path / "face.png")
+        Image.new("RGB", (64, 64)).save(image_path)
+
+        first, second = self._member(2.0), self._member(-2.0)
+        ensemble = ImageEnsemble({"first": first, "second": second})
+
+        result = ensemble.classify(image_path)
+
+        first.image_processor.assert_called_once()
+        second.image_processor.assert_not_called()
+        assert result["raw"]["fake_probability"] == pytest.approx(0.5)
+        assert set(result["raw"]["members"]) == {"first", "second"}
+        assert ensemble.latency_report()["second"]["calls"] == 1
+
+    def test_drop_slow_keeps_fastest(self):
+        """Test that slow members are dropped but one member always remains."""
+        from detectors.ensemble import ImageEnsemble
+
+        ensemble = ImageEnsemble({"fast": self._member(0.0), "slow": self._member(0.0)})
+        ensemble._latencies["fast"].extend([10.0, 12.0])
+        ensemble._latencies["slow"].extend([900.0, 1100.0])
+
+        assert ensemble.drop_slow(max_latency_ms=1.0) == ["slow"]
+        assert list(ensemble.members) == ["fast"]
+
+    def test_drop_slow_during_classify(self, tmp_path):
+        """Test that dropping a member mid-call does not break the running classification."""
+        import torch
+        from PIL import Image
+        from detectors.ensemble import ImageEnsemble
+
+        image_path = str(tmp_path / "face.png")
+        Image.new("RGB", (64, 64)).save(image_path)
+
+        fast, slow = self._member(0.0), self._member(0.0)
+        ensemble = ImageEnsemble({"fast": fast, "slow": slow})
+        ensemble._latencies["fast"].extend([10.0, 12.0])
+        ensemble._latencies["slow"].extend([900.0, 1100.0])
+
+        def forward(**kwargs):
+            ensemble.drop_slow(max_latency_ms=1.0)
+            return Mock(logits=torch.tensor([[0.0, 0.0]]))
+
+        slow.model.side_effect = forward
+        result = ensemble.classify(image_path)
+
+        assert set(result["raw"]["members"]) == {"fast", "slow"}
+        assert list(ensemble.members) == ["fast"]
+
+
+class TestModelRegistry:
+    """Tests for the process-wide model registry."""
+
+    def test_loads_each_model_once_across_threads(self):
+        """Test that concurrent requests for one key share a single load."""
+        import threading
+        import time
+        from detectors.registry import ModelRegistry
+
+        calls = []
+
+        def slow_factory(task, **kwargs):
+            calls.append((task, kwargs))
+            time.sleep(0.05)
+            return Mock()
+
+        registry = ModelRegistry()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                registry.get_pipeline("text-classification", "some/model", factory=slow_factory)
+            ))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+        # A different precision is a different model
+        registry.get_pipeline("text-classification", "some/model", precision="fp16", factory=slow_factory)
+        assert calls[-1][1]["torch_dtype"] == "float16"
+        assert len(registry.loaded()) == 2
+
+    def test_unload_and_memory_report(self):
+        """Test memory reporting and explicit unload."""
+        import torch
+        from detectors.registry import ModelRegistry
+
+        pipe = Mock()
+        pipe.model = torch.nn.Linear(10, 10)  # 110 float32 values
+
+        registry = ModelRegistry()
+        registry.get_pipeline("image-classification", "some/model", factory=lambda task, **kw: pipe)
+
+        report = registry.memory_report()
+        assert list(report.values())[0]["weights_bytes"] == 110 * 4
+
+        assert registry.unload("image-classification", "some/model") is True
+        assert registry.unload("image-classification", "some/model") is False
+        assert registry.memory_report() == {}
+
+    @patch('detectors.fake_news.pipeline')
+    def test_loaders_share_registry(self, mock_pipeline):
+        """Test that repeated loader calls reuse the registered pipeline."""
+        from detectors import fake_news
+
+        mock_pipeline.return_value = Mock()
+
+        first = fake_news.load_text_model(device=-1)
+        second = fake_news.load_text_model(device=-1)
+
+        assert first is second
+        mock_pipeline.assert_called_once()
+
+    def test_budget_evicts_lru_and_handles_reload(self):
+        """Test LRU eviction under a memory budget and transparent reload."""
+        import torch
+        from detectors.registry import ModelRegistry
+
+        def factory(task, model, **kwargs):
+            pipe = Mock(return_value=[{"label": model, "score": 1.0}])
+            pipe.model = torch.nn.Linear(256, 256)  # ~0.25 MB each
+            return pipe
+
+        registry = ModelRegistry(memory_budget_mb=0.4)
+        text = registry.load("text-classification", "text/model", factory=factory)
+        image = registry.load("image-classification", "image/model", factory=factory)
+
+        # Loading the second model evicted the least recently used one
+        assert [k.model for k in registry.loaded()] == ["image/model"]
+        assert registry.stats()["evictions"] == {"budget": 1}
+
+        # The handle reloads the evicted model on its next call
+        assert text("hello")[0]["label"] == "text/model"
+        stats = registry.stats()
+        assert stats["reloads"] == 1
+        assert stats["evictions"] == {"budget": 2}
+        assert [k.model for k in registry.loaded()] == ["text/model"]
+
+    def test_int8_without_artifact_falls_back_to_fp32(self, tmp_path):
+        """Test that MODEL_PRECISION=int8 does not break models that were never quantized."""
+        from detectors import model_cache
+        from detectors.registry import ModelRegistry
+
+        calls = []
+
+        def factory(task, **kwargs):
+            calls.append(kwargs)
+            return Mock()
+
+        registry = ModelRegistry()
+        resolution = model_cache.Resolution(str(tmp_path), "manifest")
+        with patch.object(model_cache, "resolve_model", return_value=resolution):
+            registry.load("text-classification", "org/bert", precision="int8", factory=factory)
+
+        assert calls[0]["model"] == str(tmp_path)
+        assert "torch_dtype" not in calls[0]
+
+    def test_memory_pressure_evicts_only_what_is_needed(self):
+        """Test that free memory is re-read after each eviction's release."""
+        from detectors import registry as registry_module
+        from detectors.registry import ModelRegistry
+
+        mb = 1024 * 1024
+        available = {"bytes": 100 * mb}
+
+        def release():
+            available["bytes"] += 200 * mb
+
+        registry = ModelRegistry()
+        for name in ("a", "b", "c"):
+            registry.load("text-classification", name, factory=lambda task, **kw: Mock())
+        registry.min_free_bytes = 200 * mb
+
+        with patch.object(registry_module, "_system_available_bytes", lambda: available["bytes"]), \
+                patch.object(registry_module, "_release_memory", release):
+            registry._make_room(0)
+
+        assert [k.model for k in registry.loaded()] == ["b", "c"]
+        assert registry.stats()["evictions"] == {"pressure": 1}
+
+    def test_idle_eviction(self):
+        """Test that models idle past the timeout are evicted."""
+        import time
+        from detectors.registry import ModelRegistry
+
+        registry = ModelRegistry(idle_timeout=0.05)
+        registry.load("text-classification", "some/model", factory=lambda task, **kw: Mock())
+
+        assert registry.evict_idle() == 0
+        time.sleep(0.1)
+        assert registry.evict_idle() == 1
+        assert registry.loaded() == []
+        assert registry.stats()["evictions"] == {"idle": 1}
+
+
+class TestModelCache:
+    """Tests for offline-first model resolution."""
+
+    def test_manifest_entry_wins(self, tmp_path):
+        """Test that a prepared model resolves to its local directory."""
+        import json
+        from detectors import model_cache
+
+        model_dir = tmp_path / "bert"
+        model_dir.mkdir()
+        (model_dir / "model.safetensors").write_bytes(b"")
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"version": 1, "models": {"org/bert": {"path": str(model_dir)}}}))
+
+        resolution = model_cache.resolve_model("org/bert", manifest_path=str(manifest))
+
+        assert resolution == model_cache.Resolution(str(model_dir), "manifest")
+        with patch.object(model_cache, "_lazy_loading_supported", return_value=False):
+            assert model_cache.pipeline_kwargs(resolution) == {"model_kwargs": {"use_safetensors": True}}
+        with patch.object(model_cache, "_lazy_loading_supported", return_value=True):
+            assert model_cache.pipeline_kwargs(resolution)["model_kwargs"] == {
+                "use_safetensors": True, "low_cpu_mem_usage": True
+            }
+
+    def test_offline_fails_fast(self, tmp_path, monkeypatch):
+        """Test that an uncached model raises at once when the hub is unreachable."""
+        from detectors import model_cache
+
+        with patch('detectors.model_cache.network_available', return_value=False):
+            with pytest.raises(model_cache.ModelUnavailableError):
+                model_cache.resolve_model("org/missing", manifest_path=str(tmp_path / "none.json"))
+
+        # HF_HUB_OFFLINE short-circuits the network probe entirely
+        monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+        assert model_cache._env_offline() is True
+
+
+class TestModelWarmup:
+    """Tests for background model warm-up."""
+
+    def test_warms_each_batch_size_and_reports_readiness(self):
+        """Test dummy passes per batch size and that one failure does not stop the rest."""
+        from detectors.warmup import ModelWarmup, WarmupTarget
+
+        text_pipe = Mock(return_value=[])
+        image_pipe = Mock(return_value=[])
+
+        def broken_loader():
+            raise RuntimeError("out of memory")
+
+        warmup = ModelWarmup(batch_sizes=[1, 4])
+        assert warmup.start([
+            WarmupTarget("text", "text-classification", lambda: text_pipe),
+            WarmupTarget("broken", "text-classification", broken_loader),
+            WarmupTarget("image", "image-classification", lambda: image_pipe),
+        ])
+        assert not warmup.start()  # Only once per process
+
+        assert warmup.wait(timeout=10)
+        status = warmup.status()
+        assert status["text"] == "ready" and status["image"] == "ready"
+        assert status["broken"].startswith("failed")
+        assert warmup.is_ready("text") and not warmup.is_ready()
+
+        assert [len(c.args[0]) for c in text_pipe.call_args_list] == [1, 4]
+        assert [c.kwargs["batch_size"] for c in image_pipe.call_args_list] == [1, 4]
+
+
+class TestPipelinePool:
+    """Tests for the pipeline replica pool."""
+
+    class _FakeTokenizer:
+        """Tokenizer stand-in that cannot be used by two threads at once (like a fast tokenizer)."""
+
+        def __init__(self, vocab=1):
+            import threading
+            self.vocab = vocab
+            self.busy = threading.Lock()
+
+        def __deepcopy__(self, memo):
+            return type(self)(self.vocab)
+
+    class _FakePipeline:
+        """Pipeline stand-in that fails if two threads use its tokenizer at once."""
+
+        def __init__(self):
+            self.model = object()
+            self.tokenizer = TestPipelinePool._FakeTokenizer()
+
+        def __call__(self, text):
+            import time
+            if not self.tokenizer.busy.acquire(blocking=False):
+                raise RuntimeError("Already borrowed")
+            try:
+                time.sleep(0.002)
+                return [{"label": text.upper(), "score": 1.0}]
+            finally:
+                self.tokenizer.busy.release()
+
+    def test_replicas_share_weights_not_preprocessing(self):
+        """Test that replicas reuse the model but get their own tokenizer."""
+        from detectors.pool import _replicate
+
+        base = self._FakePipeline()
+        replica = _replicate(base)
+
+        assert replica.model is base.model
+        assert replica.tokenizer is not base.tokenizer and replica.tokenizer.vocab == base.tokenizer.vocab
+
+    def test_concurrent_stress(self):
+        """Stress test: many threads, correct results, no replica used twice at once, p50/p99 measured."""
+        import threading
+        import time
+        from detectors.pool import PipelinePool
+
+        base = self._FakePipeline()
+        with patch('detectors.tuning._pinned_threads', None):
+            pool = PipelinePool(base, size=3, threads_per_replica=1)
+
+        latencies, failures = [], []
+        lock = threading.Lock()
+
+        def worker(n):
+            for i in range(20):
+                text = f"item-{n}-{i}"
+                start = time.perf_counter()
+                try:
+                    result = pool(text)
+                except Exception as e:
+                    with lock:
+                        failures.append(e)
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+                    if result[0]["label"] != text.upper():
+                        failures.append(result)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert failures == []
+        assert len(latencies) == 160
+        ordered = sorted(latencies)
+        p50, p99 = ordered[len(ordered) // 2], ordered[int(0.99 * len(ordered))]
+        assert 0 < p50 <= p99
+        stats = pool.stats()
+        assert stats["in_use"] == 0 and stats["waits"] > 0
+
+        # With every replica checked out, a bounded wait times out
+        with pool.checkout(), pool.checkout(), pool.checkout():
+            with pytest.raises(TimeoutError):
+                with pool.checkout(timeout=0.01):
+                    pass
+
+    def test_single_replica_serializes_without_touching_threads(self):
+        """Test a one-replica pool runs concurrent callers one at a time on the base pipeline."""
+        import threading
+        from detectors.pool import PipelinePool
+
+        base = self._FakePipeline()
+        with patch('detectors.tuning.set_threads') as set_threads:
+            pool = PipelinePool(base, size=1)
+        set_threads.assert_not_called()
+
+        failures = []
+
+        def worker(n):
+            for i in range(10):
+                try:
+                    pool(f"item-{n}-{i}")
+                except Exception as e:
+                    failures.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert failures == []
+        with pool.checkout() as pipe:
+            assert pipe is base
+        assert pool.stats()["threads_per_replica"] is None
+
+
+    def test_pool_over_managed_model_pins_it(self):
+        """Test that a pool built on a registry handle keeps eviction working and pins during use."""
+        from detectors.pool import PipelinePool
+        from detectors.registry import ModelRegistry
+
+        registry = ModelRegistry()
+        handle = registry.load("text-classification", "org/bert", factory=lambda task, **kw: self._FakePipeline())
+        with patch('detectors.tuning._pinned_threads', None):
+            pool = PipelinePool(handle, size=2, threads_per_replica=1)
+
+        with pool.checkout() as first, pool.checkout() as second:
+            assert first.model is second.model
+            assert first.tokenizer is not second.tokenizer
+            with registry._lock:
+                assert not registry._evict(handle.key, "budget")
+
+        with registry._lock:
+            assert registry._evict(handle.key, "budget")
+        assert pool("after reload") == [{"label": "AFTER RELOAD", "score": 1.0}]
+        assert registry.stats()["reloads"] == 1
+
+
+class TestTuning:
+    """Tests for the batch size / thread autotuner."""
+
+    def test_sweep_respects_slo_and_profile_is_applied(self, tmp_path):
+        """Test the best in-SLO setting is chosen, saved per host and applied by the registry."""
+        import time
+        from detectors import registry, tuning
+
+        def fake_pipe(inputs, batch_size=1, **kwargs):
+            time.sleep((2 + 2 * batch_size) / 1000)  # 2 ms overhead + 2 ms per item
+            return [{"label": "REAL", "score": 0.9}] * len(inputs)
+
+        result = tuning.sweep(fake_pipe, "text-classification", slo_ms=26, batch_sizes=[1, 4, 8, 16], thread_counts=[1], repeats=2)
+
+        assert result["best"]["batch_size"] == 8
+        assert result["best"]["slo_met"]
+        assert [t["slo_met"] for t in result["trials"]] == [True, True, True, False]
+
+        profile = str(tmp_path / "tuning.json")
+        tuning.save_profile({tuning.profile_key("text-classification", "org/bert"): result["best"]}, profile)
+
+        pipe = Mock()
+        with patch('detectors.tuning.TUNING_PROFILE', profile), \
+                patch('detectors.tuning._pinned_threads', None), \
+                patch('detectors.tuning.set_threads') as mock_set_threads:
+            handle = registry.load("text-classification", "org/bert", factory=Mock(return_value=pipe))
+            handle("Some text")
+            handle("More text")
+
+        # Batch size is passed per call; the process-wide thread count is set once at load
+        assert handle.tuned_batch_size == 8
+        mock_set_threads.assert_called_once_with(1)
+
+    def test_pool_thread_count_wins_over_tuned(self):
+        """Test that once a pool pins the thread count, tuned counts no longer change it."""
+        import torch
+        from detectors import tuning
+
+        original = torch.get_num_threads()
+        try:
+            with patch('detectors.tuning._pinned_threads', None):
+                tuning.set_threads(1, pin=True)
+                tuning.set_threads(2)
+                assert torch.get_num_threads() == 1
+        finally:
+            torch.set_num_threads(original)
+
+
+class TestCompiledModel:
+    """Tests for bucketed torch.compile execution."""
+
+    @staticmethod
+    def _tiny_model():
+        import torch
+        from transformers.modeling_outputs import SequenceClassifierOutput
+
+        class Tiny(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.config = Mock(pad_token_id=0)
+                self.seen_shapes = []
+
+            def forward(self, input_ids, attention_mask):
+                self.seen_shapes.append(tuple(input_ids.shape))
+                masked = (input_ids * attention_mask).float().sum(dim=1, keepdim=True)
+                return SequenceClassifierOutput(logits=torch.cat([masked, -masked], dim=1))
+
+        return Tiny()
+
+    @patch('detectors.compiled.enable_disk_cache')
+    def test_inputs_padded_to_buckets(self, mock_cache):
+        """Test that any batch/length runs as a fixed bucket shape and results are unchanged."""
+        import torch
+        from detectors.compiled import CompiledModel
+
+        model = self._tiny_model()
+        with patch('torch.compile', side_effect=lambda m, **kw: m):
+            compiled = CompiledModel(model, batch_buckets=[1, 4], seq_buckets=[16, 32])
+
+        input_ids = torch.randint(1, 10, (3, 10))
+        attention_mask = torch.ones_like(input_ids)
+        out = compiled(input_ids=input_ids, attention_mask=attention_mask)
+
+        assert model.seen_shapes == [(4, 16)]
+        assert out.logits.shape == (3, 2)
+        assert torch.equal(out.logits[:, 0], input_ids.sum(dim=1).float())
+        assert compiled.stats()["compiled_buckets"] == [(4, 16)]
+
+        # Longer than every bucket: eager, no new compiled shape
+        long_ids = torch.ones((1, 40), dtype=torch.long)
+        compiled(input_ids=long_ids, attention_mask=long_ids)
+        assert compiled.stats()["eager_calls"] == 1
+
+    @patch('detectors.compiled.enable_disk_cache')
+    def test_falls_back_to_eager_when_compilation_fails(self, mock_cache):
+        """Test the automatic eager fallback."""
+        import torch
+        from detectors.compiled import CompiledModel
+
+        def broken(**inputs):
+            raise RuntimeError("inductor: C++ compiler not found")
+
+        model = self._tiny_model()
+        with patch('torch.compile', return_value=broken):
+            compiled = CompiledModel(model, batch_buckets=[1], seq_buckets=[16])
+
+        input_ids = torch.tensor([[1, 2, 3]])
+        out = compiled(input_ids=input_ids, attention_mask=torch.ones_like(input_ids))
+
+        assert out.logits[0, 0].item() == 6
+        assert "C++ compiler" in compiled.stats()["fallback"]
+        assert compiled.config.pad_token_id == 0  # Attributes forwarded to the model
+
+    @patch('detectors.compiled.enable_disk_cache')
+    def test_falls_back_when_a_compiled_bucket_fails_later(self, mock_cache):
+        """Test that a failing recompile of an already compiled bucket also falls back to eager."""
+        import torch
+        from detectors.compiled import CompiledModel
+
+        model = self._tiny_model()
+        calls = []
+
+        def flaky(**inputs):
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError("guard failure: recompile failed")
+            return model(**inputs)
+
+        with patch('torch.compile', return_value=flaky):
+            compiled = CompiledModel(model, batch_buckets=[1], seq_buckets=[16])
+
+        input_ids = torch.tensor([[1, 2, 3]])
+        compiled(input_ids=input_ids, attention_mask=torch.ones_like(input_ids))
+        out = compiled(input_ids=input_ids, attention_mask=torch.ones_like(input_ids))
+
+        assert out.logits[0, 0].item() == 6
+        assert "guard failure" in compiled.stats()["fallback"]
+        assert compiled.stats()["eager_calls"] == 1
+
+    def test_disk_cache_configured_once(self, tmp_path, monkeypatch):
+        """Test that the process-wide inductor cache directory is only set by the first call."""
+        from detectors import compiled
+
+        monkeypatch.setattr(compiled, "_disk_cache", {"dir": None})
+        monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", "unchanged")
+        first, second = str(tmp_path / "first"), str(tmp_path / "second")
+
+        assert compiled.enable_disk_cache(first) == first
+        assert compiled.enable_disk_cache(second) == first
+        assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == first
+
+
+class TestModelPrep:
+    """Tests for ahead-of-time model preparation."""
+
+    def _mirror(self, tmp_path, checksum=None):
+        import hashlib
+
+        model_dir = tmp_path / "mirror" / "org" / "bert"
+        model_dir.mkdir(parents=True)
+        (model_dir / "config.json").write_text('{"model_type": "bert"}')
+        (model_dir / "model.safetensors").write_bytes(b"weights")
+        digest = checksum or hashlib.sha256(b'{"model_type": "bert"}').hexdigest()
+        (model_dir / "SHA256SUMS").write_text(f"{digest}  config.json\n")
+        return model_dir
+
+    def test_prepare_from_mirror_writes_manifest(self, tmp_path):
+        """Test that a verified mirror model is recorded and then resolved from the manifest."""
+        from detectors import model_cache, model_prep
+
+        model_dir = self._mirror(tmp_path)
+        manifest = str(tmp_path / "manifest.json")
+
+        results = model_prep.prepare_all(
+            [model_prep.ModelSpec("org/bert", "text-classification")],
+            mirror=str(tmp_path / "mirror"), formats=[], manifest_path=manifest
+        )
+
+        assert results["org/bert"]["ok"]
+        entry = model_cache.manifest_entry("org/bert", manifest_path=manifest)
+        assert entry["source"] == "mirror"
+        assert set(entry["files"]) == {"config.json", "model.safetensors"}
+        assert model_cache.resolve_model("org/bert", manifest_path=manifest).location == str(model_dir)
+
+    def test_mirror_without_weights_is_skipped(self, tmp_path, monkeypatch):
+        """Test that a partial model directory (config only) is not treated as available."""
+        from detectors import model_cache, model_prep
+
+        model_dir = self._mirror(tmp_path)
+        (model_dir / "model.safetensors").unlink()
+        monkeypatch.setattr(model_cache, "network_available", lambda force=False: False)
+
+        with pytest.raises(model_cache.ModelUnavailableError):
+            model_prep.fetch_model("org/bert", mirror=str(tmp_path / "mirror"))
+
+    def test_has_weights_requires_every_shard(self, tmp_path):
+        import json
+        from detectors import model_cache
+
+        (tmp_path / "model.safetensors.index.json").write_text(json.dumps({"weight_map": {
+            "a.weight": "model-00001-of-00002.safetensors", "b.weight": "model-00002-of-00002.safetensors"
+        }}))
+        (tmp_path / "model-00001-of-00002.safetensors").write_bytes(b"")
+        assert not model_cache.has_weights(str(tmp_path))
+
+        (tmp_path / "model-00002-of-00002.safetensors").write_bytes(b"")
+        assert model_cache.has_weights(str(tmp_path))
+
+    def test_checksum_mismatch_keeps_model_out_of_manifest(self, tmp_path):
+        """Test that a corrupted file fails verification."""
+        from detectors import model_cache, model_prep
+
+        self._mirror(tmp_path, checksum="0" * 64)
+        manifest = str(tmp_path / "manifest.json")
+
+        results = model_prep.prepare_all(
+            [model_prep.ModelSpec("org/bert", "text-classification")],
+            mirror=str(tmp_path / "mirror"), formats=[], manifest_path=manifest
+        )
+
+        assert not results["org/bert"]["ok"]
+        assert "checksum mismatch" in results["org/bert"]["error"]
+        assert model_cache.manifest_entry("org/bert", manifest_path=manifest) is None
+
+    def test_prebuilt_tokenizer_is_used(self, tmp_path):
+        """Test that loaders pick up the tokenizer artifact from the manifest."""
+        from detectors import model_cache
+
+        tokenizer_dir = tmp_path / "tokenizer"
+        tokenizer_dir.mkdir()
+        resolution = model_cache.Resolution(str(tmp_path), "manifest", {"tokenizer": {"path": str(tokenizer_dir)}})
+
+        assert model_cache.pipeline_kwargs(resolution, "text-classification") == {"tokenizer": str(tokenizer_dir)}
+        assert model_cache.pipeline_kwargs(resolution, "image-classification") == {"image_processor": str(tokenizer_dir)}
+
+        with pytest.raises(model_cache.ModelUnavailableError):
+            model_cache.load_quantized(resolution)
+
 
 # ============================================================================
 # UTILS TESTS
@@ -145,8 +924,10 @@ class TestDeepfakeDetector:
 class TestScraper:
     """Tests for web scraper module."""
     
-    @patch('utils.scraper.Article')
-    def test_get_text_from_url_valid(self, mock_article_class):
+    @patch('utils.page_cache.PAGE_CACHE_ENABLED', False)
+    @patch('utils.scraper.fetch_page', return_value=Mock(status_code=200, text="<html>page</html>", headers={}))
+    @patch('utils.extractors._newspaper_article')
+    def test_get_text_from_url_valid(self, mock_article_class, mock_fetch):
         """Test URL scraping with valid input."""
         from utils import scraper
         
@@ -160,7 +941,7 @@ class TestScraper:
         result = scraper.get_text_from_url("https://example.com/article")
         
         # Verify Article methods were called
-        mock_article.download.assert_called_once()
+        mock_article.download.assert_called_once_with(input_html="<html>page</html>")
         mock_article.parse.assert_called_once()
         
         # Verify result
@@ -218,6 +999,39 @@ class TestVideoUtils:
             assert len(frames) > 0
 
 
+class TestFaceUtils:
+    """Tests for face detection and tracking utilities."""
+
+    def test_expand_box_clipped_to_image(self):
+        """Test that expanded face boxes are square and stay inside the image."""
+        from utils.face_utils import expand_box
+
+        x, y, w, h = expand_box((600, 400, 60, 60), (480, 640), margin=0.25)
+
+        assert w == h == 90
+        assert x >= 0 and y >= 0
+        assert x + w <= 640 and y + h <= 480
+
+    @patch('utils.face_utils.detect_faces')
+    def test_tracker_redetects_periodically(self, mock_detect):
+        """Test that full-frame detection only runs every few frames."""
+        import numpy as np
+        from utils.face_utils import FaceTracker
+
+        # Full-frame detection finds one face; local searches find it slightly moved
+        mock_detect.side_effect = lambda image, **kwargs: (
+            [(100, 100, 80, 80)] if image.shape[0] == 480 else [(42, 40, 80, 80)]
+        )
+
+        tracker = FaceTracker(redetect_every=5)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        boxes = [tracker.update(frame) for _ in range(6)]
+
+        assert tracker.full_detections == 2
+        assert boxes[0] == [(100, 100, 80, 80)]
+        assert boxes[1] == [(102, 100, 80, 80)]
+
+
 # ============================================================================
 # INTEGRATION TESTS
 # ============================================================================
@@ -247,10 +1061,65 @@ class TestIntegration:
         assert result["score"] == 0.92
 
 
+class TestImportBudget:
+    """Importing an entry point must not load heavy dependencies it does not need."""
+
+    HEAVY = {"torch", "transformers", "cv2", "newspaper", "newsapi"}
+
+    # Entry point -> heavy modules it may load at import
+    # (import-time budgets are checked by benchmarks/bench_imports.py, not here)
+    ENTRY_POINTS = {
+        "detectors": set(),
+        "detectors.fake_news_offline": set(),
+        "detectors.fake_news": set(),
+        "detectors.deepfake": {"cv2"},
+        "detectors.ensemble": {"cv2"},
+        "utils": set(),
+        "utils.scraper": set(),
+        "utils.newsapi_client": set(),
+    }
+
+    @staticmethod
+    def _imported(module):
+        """Run `python -X importtime -c "import <module>"`; return the loaded module names."""
+        import subprocess
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=root, capture_output=True, text=True, check=True
+        )
+        return {
+            line.rsplit("|", 1)[1].strip()
+            for line in proc.stderr.splitlines()
+            if line.startswith("import time:") and "|" in line
+        }
+
+    @pytest.mark.parametrize("module", list(ENTRY_POINTS))
+    def test_entry_point_import_is_light(self, module):
+        """Test heavy dependencies are deferred to first use."""
+        allowed = self.ENTRY_POINTS[module]
+
+        heavy = {name.split(".")[0] for name in self._imported(module)} & self.HEAVY
+
+        assert heavy <= allowed, f"{module} imports {sorted(heavy - allowed)} at import time"
+
+
 # ============================================================================
 # FIXTURES
 # ============================================================================
 
+@pytest.fixture(autouse=True)
+def reset_model_registry():
+    """Start every test with an empty model registry, a reachable hub and no HF cache hits."""
+    from detectors import registry
+    registry.registry.clear()
+    with patch('detectors.model_cache.network_available', return_value=True), \
+            patch('detectors.model_cache._hf_cache_snapshot', return_value=None):
+        yield
+    registry.registry.clear()
+
+
 @pytest.fixture
 def sample_text():
     """Sample text for testing."""
@@ -0,0 +1,1428 @@
+"""
+Unit Tests for the web-facing utils (shared HTTP client, scraper, page
+cache, extractors, crawler, TTL cache, Bloom filter, ingestion, search
+enrichment, thumbnails, domain reputation, NewsAPI, VirusTotal and Gemini
+clients).
+
+Requests go to a local stub HTTP server, so no test touches the network.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ============================================================================
+# STUB SERVER
+# ============================================================================
+
+class StubServer:
+    """
+    Local HTTP/1.1 server driven by a route table.
+
+    routes maps "METHOD /path" to a handler(request) returning
+    (status, headers, body); every request is recorded in `requests`.
+    A generator body is streamed chunk by chunk without a Content-Length.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                path, _, query = self.path.partition("?")
+                length = int(self.headers.get("Content-Length") or 0)
+                request = {
+                    "method": self.command,
+                    "path": path,
+                    "query": query,
+                    "headers": dict(self.headers),
+                    "body": self.rfile.read(length) if length else b"",
+                    "client_port": self.client_address[1],
+                    "time": time.monotonic(),
+                }
+                with stub._lock:
+                    stub.requests.append(request)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    route = stub.routes.get(f"{self.command} {path}")
+                    status, headers, body = route(request) if route else (404, {}, b"not found")
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body).encode()
+                    headers = dict({"Content-Type": "application/json"}, **headers)
+                elif isinstance(body, str):
+                    body = body.encode()
+                elif not isinstance(body, bytes):
+                    # Generator of chunks: stream without Content-Length, end by closing
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.close_connection = True
+                    try:
+                        for chunk in body:
+                            self.wfile.write(chunk)
+                            self.wfile.flush()
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass  # the client stopped reading
+                    return
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server(tmp_path):
+    """Local stub HTTP server; the shared HTTP session and caches are fresh for each test."""
+    from utils import http_client, newsapi_client, page_cache, ttl_cache
+    http_client.close()
+    server = StubServer()
+    with patch.object(http_client, "HTTP_BACKOFF_BASE", 0.01), \
+         patch.object(page_cache, "page_cache", page_cache.PageCache(str(tmp_path / "pages"))), \
+         patch.object(newsapi_client, "response_cache", ttl_cache.TTLCache(ttl=300, name="newsapi")):
+        yield server
+    http_client.close()
+    server.close()
+
+
+ARTICLE_HTML = """<html><head><title>Council approves new budget</title></head>
+<body><article><h1>Council approves new budget</h1>
+<p>The city council approved the annual budget on Tuesday after a lengthy debate about road repairs and school funding.</p>
+<p>Officials said the plan keeps property taxes unchanged while adding money for public transport and parks across the city.</p>
+<p>The mayor is expected to sign the budget next week, according to a statement released by her office on Tuesday evening.</p>
+</article></body></html>"""
+
+
+# ============================================================================
+# SHARED HTTP CLIENT TESTS
+# ============================================================================
+
+class TestHttpClient:
+    """Tests for the shared HTTP transport."""
+
+    def test_connections_are_kept_alive(self, stub_server):
+        """Test consecutive requests reuse one pooled connection."""
+        from utils import http_client
+
+        stub_server.routes["GET /ping"] = lambda req: (200, {}, "pong")
+
+        for _ in range(3):
+            assert http_client.get(f"{stub_server.url}/ping").text == "pong"
+
+        assert len({r["client_port"] for r in stub_server.requests}) == 1
+
+    def test_retries_with_backoff(self, stub_server):
+        """Test 5xx responses and 429 are retried until success."""
+        from utils import http_client
+
+        statuses = iter([503, 429, 200])
+        stub_server.routes["GET /flaky"] = lambda req: (next(statuses), {"Retry-After": "0"}, "ok")
+
+        resp = http_client.get(f"{stub_server.url}/flaky")
+
+        assert resp.status_code == 200
+        assert len(stub_server.requests) == 3
+
+    def test_gives_up_after_max_retries(self, stub_server):
+        """Test the last error response is returned once retries are exhausted."""
+        from utils import http_client
+
+        stub_server.routes["GET /down"] = lambda req: (500, {}, "boom")
+
+        resp = http_client.get(f"{stub_server.url}/down", retries=2)
+
+        assert resp.status_code == 500
+        assert len(stub_server.requests) == 3
+
+    def test_post_not_retried_after_server_error(self, stub_server):
+        """Test a POST that may have been processed (500) is not resent."""
+        from utils import http_client
+
+        stub_server.routes["POST /submit"] = lambda req: (500, {}, "boom")
+
+        assert http_client.post(f"{stub_server.url}/submit", data={"a": 1}).status_code == 500
+        assert len(stub_server.requests) == 1
+
+    def test_per_host_concurrency_limit(self, stub_server):
+        """Test no more than HTTP_PER_HOST_LIMIT requests hit one host at once."""
+        from utils import http_client
+
+        def slow(req):
+            time.sleep(0.05)
+            return 200, {}, "ok"
+
+        stub_server.routes["GET /slow"] = slow
+
+        with patch.object(http_client, "HTTP_PER_HOST_LIMIT", 2):
+            threads = [threading.Thread(target=http_client.get, args=(f"{stub_server.url}/slow",)) for _ in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert len(stub_server.requests) == 6
+        assert stub_server.max_active == 2
+
+    def test_streamed_response_holds_host_slot_until_closed(self, stub_server):
+        """Test a streamed body download counts against the per-host limit until close()."""
+        from utils import http_client
+
+        stub_server.routes["GET /page"] = lambda req: (200, {}, "ok")
+
+        with patch.object(http_client, "HTTP_PER_HOST_LIMIT", 1):
+            streamed = http_client.get(f"{stub_server.url}/page", stream=True)
+            second = threading.Thread(target=http_client.get, args=(f"{stub_server.url}/page",))
+            second.start()
+            second.join(0.2)
+            assert second.is_alive() and len(stub_server.requests) == 1
+
+            streamed.close()
+            second.join(5)
+            assert not second.is_alive() and len(stub_server.requests) == 2
+
+    def test_async_api(self, stub_server):
+        """Test async_get runs requests concurrently without blocking the loop."""
+        from utils import http_client
+
+        stub_server.routes["GET /item"] = lambda req: (200, {}, req["query"])
+
+        async def fetch_all():
+            return await asyncio.gather(*(http_client.async_get(f"{stub_server.url}/item", params={"n": n}) for n in range(4)))
+
+        responses = asyncio.run(fetch_all())
+
+        assert [r.text for r in responses] == [f"n={n}" for n in range(4)]
+
+
+# ============================================================================
+# CLIENT TESTS
+# ============================================================================
+
+class TestScraperHttp:
+    """Tests for scraping through the shared HTTP client."""
+
+    def test_get_text_from_url(self, stub_server):
+        """Test the page is fetched once over HTTP and parsed by newspaper3k."""
+        from utils import scraper
+
+        stub_server.routes["GET /news/budget"] = lambda req: (200, {"Content-Type": "text/html; charset=utf-8"}, ARTICLE_HTML)
+
+        text = scraper.get_text_from_url(f"{stub_server.url}/news/budget")
+
+        assert text.startswith("Council approves new budget")
+        assert "property taxes unchanged" in text
+        assert len(stub_server.requests) == 1
+
+    def test_http_error_is_reported(self, stub_server):
+        """Test an error status surfaces as an extraction failure."""
+        from utils import scraper
+
+        with pytest.raises(Exception, match="Could not extract text"):
+            scraper.get_text_from_url(f"{stub_server.url}/missing")
+
+
+class TestBoundedDownload:
+    """Tests for streaming downloads with content-type, size and time limits."""
+
+    def test_non_html_rejected(self, stub_server):
+        """Test non-HTML responses are refused from their headers."""
+        from utils import scraper
+
+        stub_server.routes["GET /report.pdf"] = lambda req: (200, {"Content-Type": "application/pdf"}, b"%PDF" * 1000)
+
+        with pytest.raises(scraper.DownloadRejected, match="Not an HTML page"):
+            scraper.fetch_page(f"{stub_server.url}/report.pdf")
+
+    def test_declared_size_over_cap(self, stub_server):
+        """Test a Content-Length above the cap is refused before reading."""
+        from utils import scraper
+
+        stub_server.routes["GET /huge"] = lambda req: (200, {"Content-Type": "text/html"}, b"x" * 50000)
+
+        with patch.object(scraper, "SCRAPER_MAX_BYTES", 10000):
+            with pytest.raises(scraper.DownloadRejected, match="too large"):
+                scraper.fetch_page(f"{stub_server.url}/huge")
+
+    def test_streamed_size_over_cap(self, stub_server):
+        """Test a body without Content-Length is cut off at the byte cap."""
+        from utils import scraper
+
+        stub_server.routes["GET /endless"] = lambda req: (200, {"Content-Type": "text/html"}, (b"<div>" * 1000 for _ in range(1000)))
+
+        with patch.object(scraper, "SCRAPER_MAX_BYTES", 50000):
+            with pytest.raises(scraper.DownloadRejected, match="exceeded 50000 bytes"):
+                scraper.fetch_page(f"{stub_server.url}/endless")
+
+    def test_slow_drip_hits_time_cap(self, stub_server):
+        """Test a server that trickles bytes cannot hold a worker past the time cap."""
+        from utils import scraper
+
+        def drip():
+            for _ in range(30):
+                yield b"<p>tick</p>"
+                time.sleep(0.1)
+
+        stub_server.routes["GET /drip"] = lambda req: (200, {"Content-Type": "text/html"}, drip())
+
+        start = time.monotonic()
+        with patch.object(scraper, "SCRAPER_MAX_SECONDS", 0.5):
+            with pytest.raises(scraper.DownloadRejected, match="exceeded"):
+                scraper.fetch_page(f"{stub_server.url}/drip")
+        assert time.monotonic() - start < 1.5
+
+    def test_stops_when_enough_text(self, stub_server):
+        """Test reading stops once enough paragraph text has arrived."""
+        from utils import scraper
+
+        paragraph = b"<p>" + b"Words of the article body. " * 4 + b"</p>\n"
+        stub_server.routes["GET /long"] = lambda req: (
+            200, {"Content-Type": "text/html; charset=utf-8"}, (paragraph * 50 for _ in range(200))
+        )
+
+        with patch.object(scraper, "SCRAPER_ENOUGH_TEXT_CHARS", 5000):
+            page = scraper.fetch_page(f"{stub_server.url}/long")
+
+        assert page.truncated
+        assert 5000 <= len(page.text) < len(paragraph) * 50 * 200 / 10
+
+    def test_charset_from_meta(self, stub_server):
+        """Test pages without a header charset are decoded from their <meta charset>."""
+        from utils import scraper
+
+        html = '<html><head><meta charset="windows-1252"></head><body><p>Caf\u00e9 \u2013 news</p></body></html>'
+        stub_server.routes["GET /cafe"] = lambda req: (200, {"Content-Type": "text/html"}, html.encode("cp1252"))
+
+        assert "Caf\u00e9 \u2013 news" in scraper.fetch_page(f"{stub_server.url}/cafe").text
+
+
+class TestScraperBatch:
+    """Tests for concurrent multi-URL extraction."""
+
+    def test_results_stream_with_errors_captured(self, stub_server):
+        """Test every URL yields one result and failures do not stop the batch."""
+        from utils import scraper
+
+        stub_server.routes["GET /a"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+        stub_server.routes["GET /b"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+        urls = [f"{stub_server.url}/a", "not-a-url", f"{stub_server.url}/missing", f"{stub_server.url}/b"]
+
+        results = {r["url"]: r for r in scraper.get_texts_from_urls(urls, parse_processes=0)}
+
+        assert set(results) == set(urls)
+        assert results[f"{stub_server.url}/a"]["ok"] and "Council approves" in results[f"{stub_server.url}/a"]["text"]
+        assert results[f"{stub_server.url}/b"]["ok"]
+        assert not results["not-a-url"]["ok"]
+        assert "404" in results[f"{stub_server.url}/missing"]["error"]
+
+    def test_per_domain_cap(self, stub_server):
+        """Test downloads are capped per host but run in parallel across hosts."""
+        from utils import scraper
+
+        def slow(req):
+            time.sleep(0.1)
+            return 200, {"Content-Type": "text/html"}, ARTICLE_HTML
+
+        stub_server.routes["GET /slow"] = slow
+        port = stub_server.url.rsplit(":", 1)[1]
+        # Two host names for the same server count as two domains
+        urls = [f"http://{host}:{port}/slow?{n}" for n in range(4) for host in ("127.0.0.1", "localhost")]
+
+        results = list(scraper.get_texts_from_urls(urls, per_domain=1, max_workers=8, parse_processes=0))
+
+        assert all(r["ok"] for r in results)
+        assert stub_server.max_active == 2
+
+    def test_slow_host_times_out(self, stub_server):
+        """Test a URL over its time budget is reported without stalling the others."""
+        from utils import scraper
+
+        def hang(req):
+            time.sleep(1.5)
+            return 200, {}, ARTICLE_HTML
+
+        stub_server.routes["GET /hang"] = hang
+        stub_server.routes["GET /fast"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+
+        start = time.monotonic()
+        results = list(scraper.get_texts_from_urls(
+            [f"{stub_server.url}/hang", f"{stub_server.url}/fast"], timeout=0.3, parse_processes=0
+        ))
+
+        assert time.monotonic() - start < 1.2
+        assert [r["ok"] for r in results] == [True, False]
+        assert "Timed out" in results[1]["error"]
+
+    def test_parsing_in_process_pool(self, stub_server):
+        """Test pages are parsed by the worker process pool."""
+        from utils import scraper
+
+        stub_server.routes["GET /a"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+
+        try:
+            results = list(scraper.get_texts_from_urls([f"{stub_server.url}/a"] * 2, parse_processes=1))
+        finally:
+            scraper._reset_parse_pool(scraper._parse_pool)
+
+        assert [r["ok"] for r in results] == [True, True]
+        assert all(r["text"].startswith("Council approves new budget") for r in results)
+
+
+class TestPageCache:
+    """Tests for the HTTP-semantics page cache."""
+
+    def test_canonical_url(self):
+        """Test tracking parameters, case, default ports and fragments are normalized away."""
+        from utils.page_cache import canonical_url
+
+        assert canonical_url("HTTP://News.Example.COM:80/a/story?utm_source=tw&id=7&fbclid=x#comments") == \
+            "https://news.example.com/a/story?id=7"
+        assert canonical_url("https://news.example.com/a/story?id=7&utm_medium=social") == \
+            canonical_url("http://news.example.com/a/story?id=7")
+        assert canonical_url("https://example.com:8443?b=2&a=1") == "https://example.com:8443/?a=1&b=2"
+
+    def test_freshness_lifetime(self):
+        """Test Cache-Control, Expires and heuristic freshness."""
+        from utils.page_cache import freshness_lifetime
+
+        date = "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert freshness_lifetime({"Cache-Control": "public, max-age=300", "Age": "100"}) == 200
+        assert freshness_lifetime({"Cache-Control": "no-store, max-age=300"}) is None
+        assert freshness_lifetime({"Cache-Control": "no-cache", "ETag": '"a"'}) == 0
+        assert freshness_lifetime({"Date": date, "Expires": "Mon, 01 Jan 2024 00:10:00 GMT"}) == 600
+        assert freshness_lifetime({"Date": date, "Expires": "0"}) == 0
+        # 10% of the time since the last modification
+        assert freshness_lifetime({"Date": date, "Last-Modified": "Sun, 31 Dec 2023 22:00:00 GMT"}) == 720
+
+    def test_fresh_page_served_from_cache(self, stub_server):
+        """Test a page within max-age is not downloaded again, even via a tracking link."""
+        from utils import scraper
+
+        stub_server.routes["GET /news"] = lambda req: (
+            200, {"Content-Type": "text/html", "Cache-Control": "max-age=600"}, ARTICLE_HTML
+        )
+
+        first = scraper.get_text_from_url(f"{stub_server.url}/news")
+        second = scraper.get_text_from_url(f"{stub_server.url}/news?utm_source=newsletter")
+
+        assert first == second
+        assert len(stub_server.requests) == 1
+
+    def test_not_modified_skips_parsing(self, stub_server):
+        """Test stale pages are revalidated with the ETag and a 304 reuses the stored text."""
+        from utils import scraper
+
+        def page(req):
+            if req["headers"].get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"Content-Type": "text/html", "Cache-Control": "no-cache", "ETag": '"v1"'}, ARTICLE_HTML
+
+        stub_server.routes["GET /news"] = page
+
+        with patch("utils.scraper.extract_text", wraps=scraper.extract_text) as extract:
+            first = scraper.get_text_from_url(f"{stub_server.url}/news")
+            second = scraper.get_text_from_url(f"{stub_server.url}/news")
+
+        assert first == second
+        assert len(stub_server.requests) == 2
+        assert stub_server.requests[1]["headers"]["If-None-Match"] == '"v1"'
+        extract.assert_called_once()
+
+    def test_no_store_is_not_cached(self, stub_server):
+        """Test no-store responses are downloaded every time."""
+        from utils import scraper
+
+        stub_server.routes["GET /news"] = lambda req: (
+            200, {"Content-Type": "text/html", "Cache-Control": "no-store", "ETag": '"v1"'}, ARTICLE_HTML
+        )
+
+        scraper.get_text_from_url(f"{stub_server.url}/news")
+        scraper.get_text_from_url(f"{stub_server.url}/news")
+
+        assert len(stub_server.requests) == 2
+        assert "If-None-Match" not in stub_server.requests[1]["headers"]
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used page is evicted once the size cap is exceeded."""
+        from utils.page_cache import PageCache
+
+        cache = PageCache(str(tmp_path), max_bytes=4500)
+        headers = {"Cache-Control": "max-age=600"}
+        for name in ("a", "b", "c"):
+            cache.put(f"https://example.com/{name}", headers, "x" * 1000, name)
+            time.sleep(0.01)
+        cache.get("https://example.com/a")  # a is now the most recently used
+        cache.put("https://example.com/d", headers, "x" * 1000, "d")
+
+        assert cache.get("https://example.com/b") is None
+        assert [cache.get(f"https://example.com/{n}")["text"] for n in ("a", "c", "d")] == ["a", "c", "d"]
+        assert cache.stats()["bytes"] <= 4500
+
+
+class TestExtractors:
+    """Tests for the pluggable article extractors."""
+
+    FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+    @staticmethod
+    def _words(text):
+        import re
+        return set(re.findall(r"\w+", text.lower()))
+
+    @pytest.mark.parametrize("page", ["news_article", "blog_post", "wire_story"])
+    def test_density_extractor_on_fixtures(self, page):
+        """Test the density extractor keeps the article body and drops page chrome."""
+        from utils import extractors
+
+        with open(os.path.join(self.FIXTURES, f"{page}.html"), encoding="utf-8") as f:
+            html = f.read()
+        with open(os.path.join(self.FIXTURES, f"{page}.txt"), encoding="utf-8") as f:
+            expected = f.read()
+
+        result = extractors.get_extractor("density").extract(f"https://example.com/{page}", html)
+
+        got, want = self._words(result["text"]), self._words(expected)
+        assert len(got & want) / len(want) > 0.95
+        assert len(got & want) / len(got) > 0.9
+        assert result["title"] and result["title"] not in result["text"]
+        for boilerplate in ("cookies", "Subscribe", "Most read", "Trending", "thoughts on this post"):
+            assert boilerplate not in result["text"]
+
+    @patch("utils.extractors._newspaper_article")
+    def test_auto_falls_back_to_newspaper(self, mock_article_class):
+        """Test the auto chain uses newspaper3k when the density extractor finds too little."""
+        from utils import extractors
+
+        mock_article_class.return_value.title = "Title"
+        mock_article_class.return_value.text = "Body sentence. " * 30
+
+        result = extractors.extract("https://example.com/x", "<html><body><div>Short teaser</div></body></html>", "auto")
+
+        assert result["extractor"] == "newspaper"
+        mock_article_class.return_value.download.assert_called_once()
+
+    def test_auto_prefers_density_result(self):
+        """Test newspaper3k is not run when the fast extractor succeeds."""
+        from utils import extractors
+
+        with open(os.path.join(self.FIXTURES, "news_article.html"), encoding="utf-8") as f:
+            html = f.read()
+
+        with patch("utils.extractors._newspaper_article") as mock_article_class:
+            result = extractors.extract("https://example.com/news", html, "auto")
+
+        assert result["extractor"] == "density"
+        mock_article_class.assert_not_called()
+
+    def test_unknown_extractor(self):
+        """Test an unknown extractor name is rejected."""
+        from utils import extractors
+
+        with pytest.raises(ValueError, match="Unknown extractor"):
+            extractors.extract("https://example.com/x", "<html></html>", "magic")
+
+
+class TestTokenBucket:
+    """Tests for the token bucket rate limiter."""
+
+    def test_burst_then_refill(self):
+        """Test the bucket allows a burst, then refills at the configured rate."""
+        from utils.rate_limit import TokenBucket
+
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+        now[0] += 0.5
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+        bucket.set_rate(10)
+        now[0] += 0.15
+        assert bucket.try_acquire()
+
+    def test_acquire_blocks_until_available(self):
+        """Test acquire() waits for the next token and honours its timeout."""
+        from utils.rate_limit import TokenBucket
+
+        bucket = TokenBucket(rate=20, capacity=1)
+        assert bucket.acquire()
+
+        start = time.monotonic()
+        assert bucket.acquire()
+        assert 0.03 < time.monotonic() - start < 0.5
+        assert bucket.acquire(timeout=0.001) is False
+
+
+class TestCrawlScheduler:
+    """Tests for the polite crawl scheduler."""
+
+    @staticmethod
+    def _site(stub_server):
+        """127.0.0.1 publishes a robots.txt with a crawl delay; localhost has none."""
+        def robots(req):
+            if req["headers"]["Host"].startswith("127.0.0.1"):
+                return 200, {"Content-Type": "text/plain"}, "User-agent: *\nDisallow: /private\nCrawl-delay: 0.3\n"
+            return 404, {}, "no robots"
+
+        stub_server.routes["GET /robots.txt"] = robots
+        stub_server.routes["GET /story"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+        return stub_server.url.rsplit(":", 1)[1]
+
+    def test_robots_rules_and_crawl_delay(self, stub_server):
+        """Test disallowed URLs are skipped and the crawl delay spaces requests."""
+        from utils.crawler import CrawlScheduler
+
+        port = self._site(stub_server)
+        urls = [f"http://127.0.0.1:{port}/story?{n}" for n in range(3)] + [f"http://127.0.0.1:{port}/private/x"]
+
+        results = {r["url"]: r for r in CrawlScheduler(domain_rate=100, domain_burst=5).crawl(urls)}
+
+        assert results[urls[3]]["error"] == "Disallowed by robots.txt"
+        assert all(results[u]["ok"] for u in urls[:3])
+        times = [r["time"] for r in stub_server.requests if r["path"] == "/story"]
+        assert len(times) == 3
+        assert all(b - a >= 0.25 for a, b in zip(times, times[1:]))
+
+    def test_other_domains_not_held_up(self, stub_server):
+        """Test a slow (crawl-delayed) domain does not delay other domains."""
+        from utils.crawler import CrawlScheduler
+
+        port = self._site(stub_server)
+        slow = [f"http://127.0.0.1:{port}/story?slow{n}" for n in range(3)]
+        fast = [f"http://localhost:{port}/story?fast{n}" for n in range(3)]
+        # Interleaved input, slow domain first
+        urls = [u for pair in zip(slow, fast) for u in pair]
+
+        order = [r["url"] for r in CrawlScheduler(domain_rate=100, domain_burst=5, concurrency=4).crawl(urls)]
+
+        assert set(order) == set(urls)
+        assert set(order[:4]) >= set(fast)
+
+    def test_backs_off_on_429(self, stub_server):
+        """Test a domain answering 429 gets a lower request rate."""
+        from utils.crawler import CrawlScheduler
+
+        port = self._site(stub_server)
+        stub_server.routes["GET /busy"] = lambda req: (429, {"Retry-After": "0"}, "slow down")
+
+        scheduler = CrawlScheduler(domain_rate=50, domain_burst=5, respect_robots=False)
+        results = list(scheduler.crawl([f"http://localhost:{port}/busy"]))
+
+        assert not results[0]["ok"]
+        stats = scheduler.stats()[f"localhost:{port}"]
+        assert stats["throttled"] == 1
+        assert stats["rate"] == 25
+
+    def test_429_in_url_is_not_a_rate_limit(self, stub_server):
+        """Test only an actual 429 response throttles, not "429" in the error text."""
+        from utils.crawler import CrawlScheduler
+
+        port = self._site(stub_server)
+        stub_server.routes["GET /story-429"] = lambda req: (500, {}, "broken")
+
+        scheduler = CrawlScheduler(domain_rate=50, domain_burst=5, respect_robots=False)
+        results = list(scheduler.crawl([f"http://localhost:{port}/story-429"]))
+
+        assert not results[0]["ok"]
+        assert "429" in results[0]["error"]
+        assert scheduler.stats()[f"localhost:{port}"]["throttled"] == 0
+
+
+class FakeClock:
+    """Manually advanced time source for cache and rate limit tests."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for the TTL response cache."""
+
+    def test_fresh_hit_then_stale_while_revalidate(self):
+        """Test expired entries are served at once and refreshed in the background."""
+        from utils.ttl_cache import TTLCache
+
+        clock = FakeClock()
+        cache = TTLCache(ttl=60, stale_ttl=120, clock=clock)
+        calls = []
+
+        def loader():
+            calls.append(clock.now)
+            return f"v{len(calls)}"
+
+        assert cache.get_or_load("k", loader) == "v1"
+        clock.now += 30
+        assert cache.get_or_load("k", loader) == "v1"
+        assert len(calls) == 1
+
+        clock.now += 60  # expired, within the stale window
+        assert cache.get_or_load("k", loader) == "v1"
+        cache.drain(timeout=5)
+        assert len(calls) == 2
+        assert cache.get_or_load("k", loader) == "v2"
+
+        clock.now += 500  # past the stale window: load synchronously
+        assert cache.get_or_load("k", loader) == "v3"
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_concurrent_misses_share_one_load(self):
+        """Test callers missing the same key wait for a single load."""
+        from utils.ttl_cache import TTLCache
+
+        cache = TTLCache(ttl=60)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    def test_errors_not_cached(self):
+        """Test a failed load is retried on the next call."""
+        from utils.ttl_cache import TTLCache
+
+        cache = TTLCache(ttl=60)
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("k", lambda: (_ for _ in ()).throw(RuntimeError("down")))
+        assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+    def test_persistent_tier_and_lru_bound(self, tmp_path):
+        """Test entries survive a new instance and memory stays bounded."""
+        from utils.ttl_cache import TTLCache, make_key
+
+        path = str(tmp_path / "cache.sqlite")
+        cache = TTLCache(ttl=60, max_entries=2, path=path)
+        for i in range(3):
+            cache.set(make_key("everything", {"q": f"topic {i}"}), {"articles": [i]})
+        assert cache.stats()["entries"] == 2
+
+        reopened = TTLCache(ttl=60, path=path)
+        assert reopened.get(make_key("everything", {"q": "topic 0"})) == {"articles": [0]}
+        assert make_key("x", {"a": 1, "b": None}) == make_key("x", {"a": 1})
+
+
+class TestNewsApiClient:
+    """Tests for the NewsAPI REST client."""
+
+    def test_search_news(self, stub_server):
+        """Test search parameters and the API key are sent to /everything."""
+        from utils import newsapi_client
+
+        stub_server.routes["GET /v2/everything"] = lambda req: (
+            200, {}, {"status": "ok", "totalResults": 1, "articles": [{"title": "AI news"}]}
+        )
+
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            result = newsapi_client.search_news("ai", page_size=5, from_date="2024-01-01")
+
+        assert result["articles"] == [{"title": "AI news"}]
+        request = stub_server.requests[0]
+        assert request["headers"]["X-Api-Key"] == "test-key"
+        assert "q=ai" in request["query"] and "pageSize=5" in request["query"] and "from=2024-01-01" in request["query"]
+
+    def test_api_error_message(self, stub_server):
+        """Test NewsAPI error payloads are returned as error dicts."""
+        from utils import newsapi_client
+
+        stub_server.routes["GET /v2/top-headlines/sources"] = lambda req: (
+            401, {}, {"status": "error", "code": "apiKeyInvalid", "message": "Your API key is invalid."}
+        )
+
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "bad-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            result = newsapi_client.get_sources()
+
+        assert result["status"] == "error"
+        assert result["message"] == "Your API key is invalid."
+        assert result["sources"] == []
+
+    def test_responses_cached_by_normalized_query(self, stub_server):
+        """Test equivalent searches cost one API call and sources outlive searches."""
+        from utils import newsapi_client
+
+        stub_server.routes["GET /v2/everything"] = lambda req: (200, {}, {"status": "ok", "totalResults": 0, "articles": []})
+        stub_server.routes["GET /v2/top-headlines/sources"] = lambda req: (200, {}, {"status": "ok", "sources": []})
+        clock = FakeClock()
+        newsapi_client.response_cache._clock = clock
+
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            newsapi_client.search_news("Climate  Change OR Floods", sort_by="publishedAt", from_date="2024-01-01")
+            newsapi_client.search_news("climate change OR floods", sort_by="publishedAt", from_date="2024-01-01")
+            newsapi_client.get_sources()
+            assert len(stub_server.requests) == 2
+            assert "q=climate+change+OR+floods" in stub_server.requests[0]["query"]
+            assert "sortBy=publishedAt" in stub_server.requests[0]["query"]
+
+            # Past the search TTL (and stale window) but well inside the sources TTL
+            clock.now += 3600
+            newsapi_client.search_news("climate change OR floods", sort_by="publishedAt", from_date="2024-01-01")
+            newsapi_client.get_sources()
+
+        paths = [r["path"] for r in stub_server.requests]
+        assert paths == ["/v2/everything", "/v2/top-headlines/sources", "/v2/everything"]
+
+
+class TestIterNews:
+    """Tests for paginated NewsAPI iteration."""
+
+    @staticmethod
+    def _paged_api(stub_server, total, per_page=100, plan_limit=None):
+        """Route /v2/everything to `total` numbered articles, `per_page` at a time."""
+        from urllib.parse import parse_qs
+
+        def handler(req):
+            page = int(parse_qs(req["query"])["page"][0])
+            if plan_limit and page * per_page > plan_limit:
+                return 426, {}, {"status": "error", "code": "maximumResultsReached", "message": "Upgrade your plan."}
+            start = (page - 1) * per_page
+            articles = [{"url": f"https://news.example.com/{i}", "title": f"Story {i}"}
+                        for i in range(start, min(start + per_page, total))]
+            return 200, {}, {"status": "ok", "totalResults": total, "articles": articles}
+
+        stub_server.routes["GET /v2/everything"] = handler
+
+    @staticmethod
+    def _pages(stub_server):
+        return [int(r["query"].split("page=")[1].split("&")[0]) for r in stub_server.requests]
+
+    def test_pages_through_all_results_with_prefetch(self, stub_server):
+        """Test every page is fetched once and the next page is requested ahead of the caller."""
+        from utils import newsapi_client
+
+        self._paged_api(stub_server, total=250)
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            articles = newsapi_client.iter_news("election", max_requests=10)
+            first = next(articles)
+            # Page 2 is requested while the caller is still on page 1
+            deadline = time.monotonic() + 5
+            while len(stub_server.requests) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(stub_server.requests) == 2
+            rest = list(articles)
+
+        titles = [first["title"]] + [a["title"] for a in rest]
+        assert titles == [f"Story {i}" for i in range(250)]
+        assert articles.ended == "complete"
+        assert self._pages(stub_server) == [1, 2, 3]
+        assert "pageSize=100" in stub_server.requests[0]["query"]
+
+    def test_stops_at_request_budget_and_max_results(self, stub_server):
+        """Test the quota budget and result cap bound the pages requested."""
+        from utils import newsapi_client
+
+        self._paged_api(stub_server, total=1000, per_page=50)
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            articles = newsapi_client.iter_news("election", page_size=50, max_requests=3)
+            assert len(list(articles)) == 150
+            assert articles.ended == "budget" and not articles.complete
+            assert self._pages(stub_server) == [1, 2, 3]
+
+            stub_server.requests.clear()
+            articles = newsapi_client.iter_news("election", page_size=50, max_results=60)
+            assert len(list(articles)) == 60
+            assert articles.ended == "max_results"
+            assert self._pages(stub_server) == [1, 2]
+
+    def test_plan_limit_ends_iteration(self, stub_server):
+        """Test maximumResultsReached ends the iteration instead of failing it."""
+        from utils import newsapi_client
+
+        self._paged_api(stub_server, total=500, plan_limit=100)
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            iteration = newsapi_client.iter_news("election")
+            articles = list(iteration)
+
+        assert len(articles) == 100
+        assert iteration.ended == "plan_limit"
+        assert self._pages(stub_server) == [1, 2]
+
+    def test_error_ends_iteration_and_is_reported(self, stub_server):
+        """Test a failing page ends the iteration with ended == "error" and the exception."""
+        from urllib.parse import parse_qs
+        from utils import newsapi_client
+
+        def handler(req):
+            if parse_qs(req["query"])["page"][0] == "2":
+                return 400, {}, {"status": "error", "code": "unexpectedError", "message": "Try again later."}
+            articles = [{"url": f"https://news.example.com/{i}"} for i in range(100)]
+            return 200, {}, {"status": "ok", "totalResults": 300, "articles": articles}
+
+        stub_server.routes["GET /v2/everything"] = handler
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            iteration = newsapi_client.iter_news("election", max_requests=5)
+            assert len(list(iteration)) == 100
+
+        assert iteration.ended == "error"
+        assert iteration.error.code == "unexpectedError"
+
+
+class TestBloomFilter:
+    """Tests for the Bloom filter."""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        """Test every added item is found and the error rate stays near target."""
+        from utils.bloom import BloomFilter
+
+        bloom = BloomFilter.from_items((f"https://example.com/{i}" for i in range(5000)), capacity=5000, error_rate=0.01)
+        assert all(f"https://example.com/{i}" in bloom for i in range(5000))
+        false_positives = sum(f"https://other.org/{i}" in bloom for i in range(5000))
+        assert false_positives < 5000 * 0.03
+        assert len(bloom) <= 5000 and not bloom.is_full
+
+    def test_prehashed_int_items(self):
+        """Test 64-bit hash items are used as-is."""
+        from utils.bloom import BloomFilter
+
+        bloom = BloomFilter.from_items(range(0, 2 ** 64, 2 ** 52), capacity=4096)
+        assert 2 ** 52 * 7 in bloom
+
+
+class TestIngest:
+    """Tests for incremental NewsAPI ingestion."""
+
+    def test_second_run_fetches_since_watermark_and_skips_seen(self, stub_server, tmp_path):
+        """Test watermark, URL dedupe and that only new articles are classified."""
+        from utils import ingest, newsapi_client
+
+        feed = [
+            {"url": "https://news.example.com/b?utm_source=feed", "publishedAt": "2024-05-02T09:00:00Z", "title": "B"},
+            {"url": "https://news.example.com/a", "publishedAt": "2024-05-01T09:00:00Z", "title": "A"},
+        ]
+        stub_server.routes["GET /v2/everything"] = lambda req: (
+            200, {}, {"status": "ok", "totalResults": len(feed), "articles": feed}
+        )
+        classified = []
+
+        def classify(articles):
+            classified.append([a["title"] for a in articles])
+            return ["Real"] * len(articles)
+
+        store = ingest.IngestStore(str(tmp_path / "ingest.sqlite"))
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            first = ingest.ingest("Election", classify=classify, store=store)
+            assert (first["fetched"], first["new"], first["duplicates"]) == (2, 2, 0)
+            assert first["verdicts"] == ["Real", "Real"]
+            assert "from" not in stub_server.requests[0]["query"]
+
+            # The watermark article comes back (NewsAPI's "from" is inclusive) next to a new one
+            feed[:] = [
+                {"url": "https://news.example.com/c", "publishedAt": "2024-05-03T09:00:00Z", "title": "C"},
+                {"url": "https://news.example.com/b", "publishedAt": "2024-05-02T09:00:00Z", "title": "B"},
+            ]
+            reopened = ingest.IngestStore(str(tmp_path / "ingest.sqlite"))
+            second = ingest.ingest("election", classify=classify, store=reopened)
+
+        assert (second["fetched"], second["new"], second["duplicates"]) == (2, 1, 1)
+        assert classified == [["B", "A"], ["C"]]
+        assert "from=2024-05-02T09%3A00%3A00" in stub_server.requests[1]["query"]
+        assert reopened.watermark("election") == "2024-05-03T09:00:00Z"
+        assert reopened.stats()["seen_urls"] == 3
+
+    def test_budget_cut_runs_backfill_with_the_same_budget(self, stub_server, tmp_path):
+        """Test runs limited to one page each drain a large backlog, then return to new articles."""
+        from urllib.parse import parse_qs
+        from utils import ingest, newsapi_client
+
+        # 250 articles, newest first, one minute apart
+        feed = [{"url": f"https://news.example.com/{i}", "publishedAt": f"2024-05-01T{23 - i // 60:02d}:{59 - i % 60:02d}:00Z"}
+                for i in range(250)]
+
+        def handler(req):
+            query = parse_qs(req["query"])
+            page, size = int(query["page"][0]), int(query["pageSize"][0])
+            since, until = query.get("from", [""])[0], query.get("to", ["9999"])[0]
+            matching = [a for a in feed if since <= a["publishedAt"].rstrip("Z") <= until]
+            return 200, {}, {"status": "ok", "totalResults": len(matching),
+                             "articles": matching[(page - 1) * size:page * size]}
+
+        stub_server.routes["GET /v2/everything"] = handler
+        store = ingest.IngestStore(str(tmp_path / "ingest.sqlite"))
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            runs = [ingest.ingest("election", store=store, max_requests=1) for _ in range(3)]
+
+            assert [(r["ended"], r["new"]) for r in runs] == [("budget", 100), ("budget", 99), ("complete", 51)]
+            assert runs[0]["watermark"] == feed[0]["publishedAt"]
+            assert runs[0]["backfill"] == (None, feed[99]["publishedAt"])
+            assert runs[1]["backfill"] == (None, feed[198]["publishedAt"])
+            assert runs[2]["backfill"] is None
+            assert store.stats()["seen_urls"] == 250
+            assert "to=" in stub_server.requests[1]["query"]
+
+            # Backlog drained: the next run asks for articles since the watermark again
+            feed.insert(0, {"url": "https://news.example.com/new", "publishedAt": "2024-05-02T08:00:00Z"})
+            latest = ingest.ingest("election", store=store, max_requests=1)
+
+        assert (latest["ended"], latest["new"]) == ("complete", 1)
+        assert "to=" not in stub_server.requests[-1]["query"]
+        assert store.watermark("election") == "2024-05-02T08:00:00Z"
+
+    def test_failed_classification_commits_nothing(self, stub_server, tmp_path):
+        """Test articles stay new when the classifier fails."""
+        from utils import ingest, newsapi_client
+
+        stub_server.routes["GET /v2/everything"] = lambda req: (200, {}, {
+            "status": "ok", "totalResults": 1,
+            "articles": [{"url": "https://news.example.com/a", "publishedAt": "2024-05-01T09:00:00Z"}]
+        })
+
+        def broken(articles):
+            raise RuntimeError("model unavailable")
+
+        store = ingest.IngestStore(str(tmp_path / "ingest.sqlite"))
+        with patch.object(newsapi_client, "NEWSAPI_KEY", "test-key"), \
+             patch.object(newsapi_client, "NEWSAPI_BASE_URL", f"{stub_server.url}/v2"):
+            with pytest.raises(RuntimeError):
+                ingest.ingest("election", classify=broken, store=store)
+            assert store.watermark("election") is None
+            assert ingest.ingest("election", store=store)["new"] == 1
+
+
+class TestEnrichment:
+    """Tests for background enrichment of search results."""
+
+    def test_scrapes_and_scores_in_batches(self, stub_server):
+        """Test full text is used when scraped, the NewsAPI snippet otherwise."""
+        from utils.enrichment import EnrichmentJob
+
+        stub_server.routes["GET /story-1"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+        stub_server.routes["GET /story-2"] = lambda req: (200, {"Content-Type": "text/html"}, ARTICLE_HTML)
+        articles = [
+            {"url": f"{stub_server.url}/story-1", "title": "Budget", "description": "Council vote"},
+            {"url": f"{stub_server.url}/story-2", "title": "Budget again", "description": "Same story"},
+            {"url": f"{stub_server.url}/gone", "title": "Gone", "description": "Deleted story", "content": "Short stub"},
+        ]
+        batches = []
+
+        def classify_batch(texts):
+            batches.append(len(texts))
+            return [{"label": "Real", "score": 0.9} for _ in texts]
+
+        job = EnrichmentJob(articles, classify_batch, batch_size=2, min_chars=100).start()
+        assert job.join(timeout=30)
+
+        assert job.progress() == (3, 3)
+        assert sorted(batches) == [1, 2]
+        full = job.get(f"{stub_server.url}/story-1")
+        assert full["full_text"] and "city council approved" in full["text"]
+        assert full["verdict"]["label"] == "Real"
+        fallback = job.get(f"{stub_server.url}/gone")
+        assert not fallback["full_text"] and fallback["text"] == "Gone Deleted story Short stub"
+
+    def test_classifier_failure_is_recorded(self, stub_server):
+        """Test a failing batch leaves results without a verdict instead of killing the job."""
+        from utils.enrichment import EnrichmentJob
+
+        def broken(texts):
+            raise RuntimeError("model unavailable")
+
+        job = EnrichmentJob([{"url": f"{stub_server.url}/gone", "title": "Gone"}], broken).start()
+        assert job.join(timeout=30)
+        result = job.get(f"{stub_server.url}/gone")
+        assert result["verdict"] is None and result["error"] == "model unavailable"
+
+
+class TestThumbnails:
+    """Tests for the thumbnail proxy cache."""
+
+    @staticmethod
+    def _image(width, height, color="navy"):
+        import io
+        from PIL import Image
+
+        out = io.BytesIO()
+        Image.new("RGB", (width, height), color).save(out, "PNG")
+        return out.getvalue()
+
+    def test_fetched_once_resized_and_cached(self, stub_server, tmp_path):
+        """Test the original is downloaded once and a small JPEG is served."""
+        from PIL import Image
+        from utils.thumbnails import ThumbnailCache
+
+        original = self._image(2400, 1600)
+        stub_server.routes["GET /photo.png"] = lambda req: (200, {"Content-Type": "image/png"}, original)
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), width=320)
+        url = f"{stub_server.url}/photo.png"
+
+        assert cache.get_thumbnail(url, timeout=10) is not None
+        path = cache.get_thumbnail(url)
+        with Image.open(path) as thumb:
+            assert thumb.format == "JPEG" and thumb.size == (320, 213)
+        assert os.path.getsize(path) < len(original) / 10
+        assert len(stub_server.requests) == 1
+
+    def test_bounded_pool_and_failures_remembered(self, stub_server, tmp_path):
+        """Test concurrent downloads are capped and non-images are not retried."""
+        from utils.thumbnails import ThumbnailCache
+
+        def slow_image(req):
+            time.sleep(0.1)
+            return 200, {"Content-Type": "image/png"}, self._image(50, 50)
+
+        stub_server.routes["GET /img"] = slow_image
+        stub_server.routes["GET /page.html"] = lambda req: (200, {"Content-Type": "text/html"}, "<html></html>")
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), workers=2)
+
+        futures = cache.prefetch(f"{stub_server.url}/img?n={i}" for i in range(6))
+        for future in futures:
+            future.result(timeout=10)
+        assert stub_server.max_active <= 2
+        assert cache.stats()["entries"] == 6
+
+        bad = f"{stub_server.url}/page.html"
+        assert cache.get_thumbnail(bad, timeout=10) is None
+        assert cache.get_thumbnail(bad, timeout=10) is None
+        assert sum(r["path"] == "/page.html" for r in stub_server.requests) == 1
+
+    def test_slow_drip_hits_time_cap(self, stub_server):
+        """Test an image trickled in small pieces cannot hold a worker past the deadline."""
+        from utils.thumbnails import ThumbnailError, _download
+
+        def drip():
+            for _ in range(30):
+                yield b"\x89PNG"
+                time.sleep(0.1)
+
+        stub_server.routes["GET /drip.png"] = lambda req: (200, {"Content-Type": "image/png"}, drip())
+
+        start = time.monotonic()
+        with pytest.raises(ThumbnailError, match="timed out"):
+            _download(f"{stub_server.url}/drip.png", timeout=0.5, max_bytes=1024 * 1024)
+        assert time.monotonic() - start < 1.5
+
+    def test_lru_eviction(self, stub_server, tmp_path):
+        """Test least recently used thumbnails are evicted over the size cap."""
+        from utils.thumbnails import ThumbnailCache
+
+        stub_server.routes["GET /img"] = lambda req: (200, {"Content-Type": "image/png"}, self._image(200, 200, req["query"]))
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), max_bytes=2000)
+        colors = ["red", "green", "blue", "white"]
+        for color in colors:
+            assert cache.get_thumbnail(f"{stub_server.url}/img?{color}", timeout=10)
+            time.sleep(0.02)
+
+        assert cache.stats()["bytes"] <= 2000
+        assert cache.cached(f"{stub_server.url}/img?white") is not None
+        assert cache.cached(f"{stub_server.url}/img?red") is None
+
+
+class TestDomainReputation:
+    """Tests for the local domain reputation index."""
+
+    LIST = "domain,label\n# comment\nfake-news.example,fabricator\nsatire.example,satire\nwire.example,wire\n"
+
+    def _write(self, path, text):
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def test_lookup_matches_subdomains(self, tmp_path):
+        """Test a subdomain inherits its listed site's label."""
+        from utils.domain_reputation import DomainReputation
+
+        reputation = DomainReputation(self._write(tmp_path / "domains.csv", self.LIST))
+        info = reputation.lookup("https://www.politics.fake-news.example:443/story?id=1")
+        assert info["name"] == "politics.fake-news.example"
+        assert info["matched"] == "fake-news.example"
+        assert info["hint"] == "Fake"
+        assert reputation.lookup("https://satire.example/a")["hint"] == "Satire"
+        assert reputation.lookup("https://example/a") is None
+        assert reputation.lookup("https://unlisted.org/a") is None
+
+    def test_malformed_json_entries_are_skipped(self, tmp_path):
+        """Test non-object JSON list entries are skipped instead of failing the load."""
+        from utils.domain_reputation import DomainReputation
+
+        path = self._write(tmp_path / "domains.json", json.dumps(
+            ["fake.com", 7, None, {"domain": 5, "label": "fake"}, {"domain": "bad.example", "label": "fabricator"}]
+        ))
+        reputation = DomainReputation(path)
+
+        assert reputation.lookup("https://fake.com/a") is None
+        assert reputation.lookup("https://bad.example/a")["hint"] == "Fake"
+
+    def test_verdict_only_for_decisive_hints(self, tmp_path):
+        from utils.domain_reputation import DomainReputation
+
+        reputation = DomainReputation(self._write(tmp_path / "domains.csv", self.LIST))
+        assert reputation.verdict("https://wire.example/x")["label"] == "Real"
+        assert reputation.verdict("https://wire.example/x")["method"] == "domain-reputation"
+        assert reputation.verdict("https://satire.example/x") is None
+
+    def test_json_list(self, tmp_path):
+        from utils.domain_reputation import DomainReputation
+
+        path = self._write(tmp_path / "domains.json", json.dumps([{"domain": "WWW.Bad.example", "label": "Unreliable"}]))
+        assert DomainReputation(path).lookup("bad.example/page")["label"] == "unreliable"
+
+    def test_compact_index_matches_dict_index(self):
+        """Test the hashed + Bloom filter form answers like the plain table."""
+        from utils.domain_reputation import DomainIndex
+
+        entries = [(f"site{i}.example", "unreliable" if i % 2 else "reliable") for i in range(2000)]
+        compact = DomainIndex(entries, compact_threshold=100)
+        plain = DomainIndex(entries, compact_threshold=10 ** 6)
+        assert compact.compact and not plain.compact
+        for i in range(0, 2000, 7):
+            assert compact.match(f"news.site{i}.example") == plain.match(f"news.site{i}.example")
+        assert sum(compact.match(f"other{i}.org") is not None for i in range(2000)) == 0
+
+    def test_hot_reload_on_file_change(self, tmp_path):
+        """Test an edited list is picked up in the background."""
+        from utils.domain_reputation import DomainReputation
+
+        path = tmp_path / "domains.csv"
+        reputation = DomainReputation(self._write(path, self.LIST), reload_interval=0)
+        assert reputation.lookup("new.example") is None
+
+        self._write(path, self.LIST + "new.example,conspiracy\n")
+        os.utime(path, (time.time() + 5, time.time() + 5))
+        deadline = time.monotonic() + 5
+        while reputation.lookup("new.example") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reputation.lookup("new.example")["hint"] == "Unreliable"
+        assert reputation.lookup("fake-news.example")["hint"] == "Fake"
+
+    def test_bundled_list_loads(self):
+        from utils.domain_reputation import DomainReputation
+
+        assert DomainReputation().lookup("https://www.theonion.com/article")["hint"] == "Satire"
+
+
+class TestVirusTotalClient:
+    """Tests for the VirusTotal client."""
+
+    @pytest.fixture
+    def vt(self, stub_server):
+        """VirusTotal client pointed at the stub server with a fresh quota bucket and verdict cache."""
+        from utils import virustotal_client
+        from utils.rate_limit import TokenBucket
+        from utils.ttl_cache import TTLCache
+
+        with patch.object(virustotal_client, "API_KEY", "vt-key"), \
+             patch.object(virustotal_client, "BASE", f"{stub_server.url}/api/v3"), \
+             patch.object(virustotal_client, "_bucket", TokenBucket(100, capacity=100)), \
+             patch.object(virustotal_client, "verdict_cache", TTLCache(ttl=60)), \
+             patch.object(virustotal_client, "pending_analyses", TTLCache(ttl=60)):
+            yield virustotal_client
+
+    def test_url_analyze(self, vt, stub_server):
+        """Test an unknown URL is submitted, then polled with growing delays."""
+        polls = []
+        stub_server.routes["POST /api/v3/urls"] = lambda req: (200, {}, {"data": {"id": "an-1"}})
+
+        def analysis(req):
+            polls.append(1)
+            status = "completed" if len(polls) == 3 else "queued"
+            return 200, {}, {"data": {"attributes": {"status": status, "stats": {"malicious": 0, "suspicious": 1, "harmless": 60}}}}
+
+        stub_server.routes["GET /api/v3/analyses/an-1"] = analysis
+
+        with patch("utils.virustotal_client.time.sleep") as sleep, \
+             patch.object(vt, "POLL_BLOCK", 30):
+            result = vt.url_analyze("https://example.com/story", quota_wait=None)
+
+        assert result["ok"] is True
+        assert result["verdict"] == "suspicious"
+        assert result["source"] == "scan"
+        assert [c.args[0] for c in sleep.call_args_list] == [2.0, 4.0, 8.0]
+        # The existing report is looked up first (unknown: 404)
+        assert stub_server.requests[0]["path"] == f"/api/v3/urls/{vt.url_id('https://example.com/story')}"
+        assert stub_server.requests[1]["body"] == b"url=https%3A%2F%2Fexample.com%2Fstory"
+        assert all(r["headers"]["x-apikey"] == "vt-key" for r in stub_server.requests)
+
+    def test_slow_scan_returns_pending_then_polls_on_recheck(self, vt, stub_server):
+        """Test a check blocks only briefly, and a re-check polls the same analysis without resubmitting."""
+        from utils.rate_limit import TokenBucket
+
+        status = {"value": "queued"}
+        stub_server.routes["POST /api/v3/urls"] = lambda req: (200, {}, {"data": {"id": "an-2"}})
+        stub_server.routes["GET /api/v3/analyses/an-2"] = lambda req: (200, {}, {"data": {"attributes": {
+            "status": status["value"], "stats": {"harmless": 70}}}})
+        url = "https://example.com/slow"
+
+        with patch("utils.virustotal_client.time.sleep") as sleep:
+            first = vt.url_analyze(url)
+            assert first["pending"] and first["analysis_id"] == "an-2" and not first["ok"]
+            assert sum(c.args[0] for c in sleep.call_args_list) <= vt.POLL_BLOCK
+
+            # No quota token free: the re-check gives up at once instead of waiting for one
+            with patch.object(vt, "_bucket", TokenBucket(rate=0.001, capacity=1)) as bucket:
+                bucket.try_acquire()
+                start = time.monotonic()
+                assert vt.url_analyze(url)["pending"]
+                assert time.monotonic() - start < 1
+
+            status["value"] = "completed"
+            done = vt.url_analyze(url)
+
+        assert done["ok"] and done["verdict"] == "clean" and done["source"] == "scan"
+        assert sum(r["method"] == "POST" for r in stub_server.requests) == 1
+
+    def test_batch_larger_than_burst_waits_for_quota(self, vt, stub_server):
+        """Test a batch bigger than the bucket's burst completes, while one check's wait stays bounded."""
+        from utils.rate_limit import TokenBucket
+
+        urls = [f"https://example.com/b{i}" for i in range(6)]
+        stub_server.routes.update({
+            f"GET /api/v3/urls/{vt.url_id(u)}": (lambda req: (200, {}, {"data": {"attributes": {
+                "last_analysis_date": int(time.time()), "last_analysis_stats": {"harmless": 70},
+            }}}))
+            for u in urls
+        })
+
+        # Burst of 2, then one request every 0.25s: the last checks wait ~1s for quota
+        with patch.object(vt, "_bucket", TokenBucket(rate=4, capacity=2)):
+            results = vt.url_analyze_many(urls)
+        assert all(r["ok"] for r in results.values())
+
+        # A single interactive check gives up once its budget is spent
+        with patch.object(vt, "_bucket", TokenBucket(rate=0.01, capacity=1)) as bucket:
+            bucket.try_acquire()
+            start = time.monotonic()
+            result = vt.url_analyze("https://example.com/other", quota_wait=0.2)
+        assert not result["ok"] and "quota" in result["error"]
+        assert time.monotonic() - start < 1
+
+    def test_calls_are_not_retried(self, vt, stub_server):
+        """Test a failing API call is not retried by the HTTP client (retries would spend quota)."""
+        stub_server.routes[f"GET /api/v3/urls/{vt.url_id('https://example.com/x')}"] = lambda req: (503, {}, "busy")
+
+        result = vt.url_analyze("https://example.com/x")
+
+        assert result["error"] == "HTTP 503"
+        assert len(stub_server.requests) == 1
+
+    def test_existing_report_and_cache(self, vt, stub_server):
+        """Test a recent report avoids a scan and the verdict is cached."""
+        url = "https://example.com/known"
+        assert vt.url_id(url) == "aHR0cHM6Ly9leGFtcGxlLmNvbS9rbm93bg"
+        stub_server.routes[f"GET /api/v3/urls/{vt.url_id(url)}"] = lambda req: (200, {}, {"data": {"attributes": {
+            "last_analysis_date": int(time.time()) - 3600,
+            "last_analysis_stats": {"malicious": 2, "suspicious": 0, "harmless": 50, "undetected": 10},
+        }}})
+
+        first = vt.url_analyze(url)
+        second = vt.url_analyze(url)
+
+        assert first["verdict"] == "malicious" and first["source"] == "report" and not first["cached"]
+        assert second["cached"] and second["malicious"] == 2
+        assert len(stub_server.requests) == 1
+
+    def test_quota_bucket_paces_batch_checks(self, vt, stub_server):
+        """Test concurrent batch checks never exceed the request quota."""
+        from utils.rate_limit import TokenBucket
+
+        stub_server.routes.update({
+            f"GET /api/v3/urls/{vt.url_id(f'https://example.com/{i}')}": (lambda req: (200, {}, {"data": {"attributes": {
+                "last_analysis_date": int(time.time()), "last_analysis_stats": {"harmless": 70},
+            }}}))
+            for i in range(4)
+        })
+
+        with patch.object(vt, "_bucket", TokenBucket(rate=10, capacity=2)):
+            start = time.monotonic()
+            results = vt.url_analyze_many([f"https://example.com/{i}" for i in range(4)] + ["https://example.com/0"])
+            elapsed = time.monotonic() - start
+
+        assert list(results) == [f"https://example.com/{i}" for i in range(4)]
+        assert all(r["verdict"] == "clean" for r in results.values())
+        # Burst of 2, then 10 requests/s: the last two wait ~0.1s each
+        assert elapsed >= 0.15
+        times = sorted(r["time"] for r in stub_server.requests)
+        assert times[-1] - times[0] >= 0.15
+
+
+class TestGeminiClient:
+    """Tests for the Gemini client."""
+
+    def test_summarize_and_verify(self, stub_server):
+        """Test the prompt is posted and the reply text extracted."""
+        from utils import gemini_client
+
+        stub_server.routes["POST /v1beta/models/test:generateContent"] = lambda req: (200, {}, {
+            "candidates": [{"content": {"parts": [{"text": " Summary. Verdict: Real "}]}}]
+        })
+
+        with patch.object(gemini_client, "API_KEY", "g-key"), \
+             patch.object(gemini_client, "BASE_URL", f"{stub_server.url}/v1beta"), \
+             patch.object(gemini_client, "MODEL", "models/test"):
+            result = gemini_client.summarize_and_verify("Some article text")
+
+        assert result["ok"] is True
+        assert result["text"] == "Summary. Verdict: Real"
+        body = json.loads(stub_server.requests[0]["body"])
+        assert "Some article text" in body["contents"][0]["parts"][0]["text"]
+        assert stub_server.requests[0]["query"] == "key=g-key"
+
+
+# ============================================================================
+# RUN TESTS
+# ============================================================================
+
+if __name__ == "__main__":
+    # Run tests with pytest
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -2,6 +2,23 @@
 Utils package for FakeNews + Deepfake Detector
 
 This package contains utility modules for web scraping and video processing.
+
+Submodules are imported on first attribute access (PEP 562); heavy
+dependencies (cv2, lxml, newspaper3k) are only loaded by the modules that use them.
 """
 
-__all__ = ['scraper', 'video_utils']
+import importlib
+
+__all__ = ['scraper', 'video_utils', 'face_utils']
+
+_SUBMODULES = set(__all__) | {'gemini_client', 'newsapi_client', 'virustotal_client', 'http_client', 'page_cache', 'extractors', 'rate_limit', 'crawler', 'ttl_cache', 'bloom', 'ingest', 'enrichment', 'thumbnails', 'domain_reputation', 'disk_lru'}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,333 @@
+"""
+Crawl Scheduler Module
+
+Polite large-batch URL fetching on top of the scraper. Feeding thousands of
+links from one outlet through get_texts_from_urls() would hammer that host;
+the crawl scheduler instead:
+
+- paces every domain with its own token bucket (CRAWL_DOMAIN_RATE requests
+  per second, bursts of CRAWL_DOMAIN_BURST)
+- reads each domain's robots.txt first: disallowed URLs are skipped and a
+  Crawl-delay / Request-rate slows that domain's bucket down
+- halves a domain's rate when it answers 429 Too Many Requests
+- caps concurrent fetches globally (CRAWL_CONCURRENCY) and per domain
+- hands out slots round-robin across domains, so while one host waits for
+  its next token the others keep the workers busy
+
+Example:
+    >>> from utils.crawler import CrawlScheduler
+    >>> for result in CrawlScheduler().crawl(urls):
+    ...     print(result["url"], result["ok"], len(result["text"]))
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from . import http_client, scraper
+from .rate_limit import TokenBucket
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "8"))
+CRAWL_DOMAIN_RATE = float(os.getenv("CRAWL_DOMAIN_RATE", "1.0"))
+CRAWL_DOMAIN_BURST = float(os.getenv("CRAWL_DOMAIN_BURST", "2"))
+CRAWL_PER_DOMAIN = int(os.getenv("CRAWL_PER_DOMAIN", "1"))
+# Product token matched against robots.txt User-agent lines
+CRAWL_USER_AGENT = os.getenv("CRAWL_USER_AGENT", "FakeNewsDetector")
+ROBOTS_TIMEOUT = float(os.getenv("CRAWL_ROBOTS_TIMEOUT", "10"))
+
+# Slowest pace a domain is throttled down to after repeated 429s (requests per second)
+MIN_DOMAIN_RATE = 1 / 60
+
+
+class DomainState:
+    """Scheduling state of one domain: queue, bucket, robots rules and in-flight count."""
+
+    def __init__(self, host: str, rate: float, burst: float):
+        self.host = host
+        self.queue: deque = deque()
+        self.bucket = TokenBucket(rate, burst)
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_loaded = False
+        self.in_flight = 0
+        self.fetched = 0
+        self.throttled = 0
+
+
+def fetch_robots(scheme: str, host: str, timeout: Optional[float] = None) -> Optional[RobotFileParser]:
+    """
+    Download and parse a host's robots.txt.
+
+    A missing robots.txt (4xx) allows everything, as RFC 9309 specifies. An
+    unreachable one (5xx or network error) is deliberately treated the same
+    way, although RFC 9309 asks crawlers to assume complete disallow: the
+    URLs come from users, not from link discovery, and a flaky server should
+    not block them (the domain is still rate limited).
+
+    Returns:
+        RobotFileParser: Parsed rules, or None if there are none
+    """
+    url = f"{scheme}://{host}/robots.txt"
+    try:
+        resp = http_client.get(url, timeout=timeout or ROBOTS_TIMEOUT, retries=1)
+    except Exception as e:
+        logger.info(f"robots.txt unavailable for {host}: {e}")
+        return None
+    if resp.status_code != 200:
+        return None
+
+    lines = resp.text.splitlines()
+    parser = RobotFileParser(url)
+    parser.parse(lines)
+    parser.delays = _crawl_delays(lines)
+    return parser
+
+
+def _crawl_delays(lines) -> Dict[str, float]:
+    """
+    Crawl-delay per user-agent token (lower-case) from robots.txt lines.
+
+    urllib.robotparser only accepts whole seconds; sites commonly use decimals.
+    """
+    delays: Dict[str, float] = {}
+    agents, in_rules = [], False
+    for line in lines:
+        key, _, value = line.split("#", 1)[0].partition(":")
+        key, value = key.strip().lower(), value.strip()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+        elif key:
+            in_rules = True
+            if key == "crawl-delay":
+                try:
+                    for agent in agents:
+                        delays[agent] = float(value)
+                except ValueError:
+                    pass
+    return delays
+
+
+def crawl_delay(robots: RobotFileParser, user_agent: str) -> Optional[float]:
+    """Seconds between requests robots.txt asks of this user agent (Crawl-delay or Request-rate)."""
+    delays = getattr(robots, "delays", {})
+    token = user_agent.lower()
+    delay = next((d for agent, d in delays.items() if agent != "*" and agent in token), delays.get("*"))
+    request_rate = robots.request_rate(user_agent)
+    if request_rate and request_rate.requests:
+        delay = max(delay or 0.0, request_rate.seconds / request_rate.requests)
+    return delay
+
+
+def _is_rate_limited(error: BaseException) -> bool:
+    """True if an HTTP 429 response is anywhere in the error's cause/context chain."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        response = getattr(error, "response", None)
+        if isinstance(error, requests.HTTPError) and getattr(response, "status_code", None) == 429:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class CrawlScheduler:
+    """
+    Fetch article text for many URLs politely (see module docstring).
+
+    Results have the same shape as scraper.get_texts_from_urls():
+    {"url", "ok", "text", "error", "seconds"}, in completion order.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        domain_rate: Optional[float] = None,
+        domain_burst: Optional[float] = None,
+        per_domain: Optional[int] = None,
+        respect_robots: bool = True,
+        user_agent: Optional[str] = None
+    ):
+        """
+        Args:
+            concurrency (int): Global cap on concurrent fetches (default: CRAWL_CONCURRENCY)
+            domain_rate (float): Requests per second per domain (default: CRAWL_DOMAIN_RATE)
+            domain_burst (float): Burst size per domain (default: CRAWL_DOMAIN_BURST)
+            per_domain (int): Concurrent fetches per domain (default: CRAWL_PER_DOMAIN)
+            respect_robots (bool): Honour robots.txt rules and crawl delays
+            user_agent (str): Product token for robots.txt matching (default: CRAWL_USER_AGENT)
+        """
+        self.concurrency = max(1, concurrency or CRAWL_CONCURRENCY)
+        self.domain_rate = domain_rate or CRAWL_DOMAIN_RATE
+        self.domain_burst = domain_burst or CRAWL_DOMAIN_BURST
+        self.per_domain = max(1, per_domain or CRAWL_PER_DOMAIN)
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent or CRAWL_USER_AGENT
+        self.domains: Dict[str, DomainState] = {}
+        self._lock = threading.Lock()
+
+    def _domain(self, host: str) -> DomainState:
+        with self._lock:
+            if host not in self.domains:
+                self.domains[host] = DomainState(host, self.domain_rate, self.domain_burst)
+            return self.domains[host]
+
+    def _load_robots(self, domain: DomainState, scheme: str):
+        """Worker job: fetch robots.txt and apply its crawl delay to the domain's bucket."""
+        domain.robots = fetch_robots(scheme, domain.host)
+        if domain.robots is not None:
+            delay = crawl_delay(domain.robots, self.user_agent)
+            if delay and 1 / delay < domain.bucket.rate:
+                logger.info(f"{domain.host}: crawl delay {delay:.1f}s from robots.txt")
+                domain.bucket.set_rate(1 / delay, capacity=1)
+
+    def _fetch(self, url: str) -> str:
+        return scraper.get_text_from_url(url)
+
+    def _throttle(self, domain: DomainState):
+        """Halve a domain's rate after a 429."""
+        domain.throttled += 1
+        rate = max(MIN_DOMAIN_RATE, domain.bucket.rate / 2)
+        domain.bucket.set_rate(rate, capacity=1)
+        logger.warning(f"{domain.host} is rate limiting us; slowing to {rate * 60:.1f} requests/min")
+
+    def crawl(self, urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch every URL, yielding results as they complete.
+
+        Args:
+            urls (Iterable[str]): Article URLs (any mix of domains)
+
+        Yields:
+            Dict[str, Any]: {"url", "ok", "text", "error", "seconds"} per URL
+        """
+        # Round-robin order of domains that still have queued URLs
+        ready: "OrderedDict[str, DomainState]" = OrderedDict()
+        remaining = 0
+        for url in urls:
+            try:
+                scraper._validate_url(url)
+            except ValueError as e:
+                yield scraper._batch_result(url, error=str(e))
+                continue
+            domain = self._domain(http_client.host_key(url))
+            domain.queue.append(url)
+            ready[domain.host] = domain
+            remaining += 1
+
+        workers = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawler")
+        # future -> (kind, domain, url, started)
+        pending: Dict[Any, Any] = {}
+        robots_pending = set()
+
+        def dispatch() -> Optional[float]:
+            """Start fetches round-robin; returns seconds until the next blocked domain frees up."""
+            next_wake = None
+            for host in list(ready):
+                if len(pending) >= self.concurrency:
+                    break
+                domain = ready[host]
+                if not domain.robots_loaded:
+                    if not self.respect_robots:
+                        domain.robots_loaded = True
+                    else:
+                        # The domain's URLs wait until its robots.txt is known
+                        if host not in robots_pending:
+                            robots_pending.add(host)
+                            future = workers.submit(self._load_robots, domain, urlsplit(domain.queue[0]).scheme)
+                            pending[future] = ("robots", domain, None, time.monotonic())
+                        continue
+                if domain.in_flight >= self.per_domain:
+                    continue
+                if not domain.bucket.try_acquire():
+                    wake = domain.bucket.wait_time()
+                    next_wake = wake if next_wake is None else min(next_wake, wake)
+                    continue
+
+                url = domain.queue.popleft()
+                if not domain.queue:
+                    del ready[host]
+                else:
+                    ready.move_to_end(host)
+                future = workers.submit(self._fetch, url)
+                pending[future] = ("fetch", domain, url, time.monotonic())
+                domain.in_flight += 1
+            return next_wake
+
+        def skip_disallowed(domain: DomainState) -> Iterator[Dict[str, Any]]:
+            """Drop queued URLs robots.txt forbids (called once robots.txt is known)."""
+            if domain.robots is None:
+                return
+            allowed = deque()
+            for url in domain.queue:
+                if domain.robots.can_fetch(self.user_agent, url):
+                    allowed.append(url)
+                else:
+                    yield scraper._batch_result(url, error="Disallowed by robots.txt")
+            domain.queue = allowed
+            if not allowed:
+                ready.pop(domain.host, None)
+
+        try:
+            while remaining:
+                wake = dispatch()
+                if not pending:
+                    if wake is None:
+                        raise RuntimeError("Crawl scheduler stalled with URLs left")
+                    # Every domain is waiting for its next token
+                    time.sleep(wake)
+                    continue
+                done, _ = wait(list(pending), timeout=wake, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    kind, domain, url, started = pending.pop(future)
+                    if kind == "robots":
+                        robots_pending.discard(domain.host)
+                        domain.robots_loaded = True
+                        if future.exception() is not None:
+                            logger.warning(f"robots.txt check failed for {domain.host}: {future.exception()}")
+                            domain.robots = None
+                        for result in skip_disallowed(domain):
+                            remaining -= 1
+                            yield result
+                        continue
+
+                    domain.in_flight -= 1
+                    domain.fetched += 1
+                    remaining -= 1
+                    seconds = time.monotonic() - started
+                    error = future.exception()
+                    if error is None:
+                        yield scraper._batch_result(url, text=future.result(), seconds=seconds)
+                    else:
+                        if _is_rate_limited(error):
+                            self._throttle(domain)
+                        yield scraper._batch_result(url, error=str(error)[:300], seconds=seconds)
+        finally:
+            workers.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-domain counters: fetched, throttled, current rate (requests/s) and robots status."""
+        with self._lock:
+            return {
+                host: {
+                    "fetched": d.fetched,
+                    "queued": len(d.queue),
+                    "throttled": d.throttled,
+                    "rate": round(d.bucket.rate, 4),
+                    "robots": d.robots is not None,
+                }
+                for host, d in self.domains.items()
+            }
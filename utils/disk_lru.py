@@ -0,0 +1,168 @@
+"""
+Disk LRU Module
+
+Size-capped cache directory with least-recently-used eviction, shared by
+the page cache and the thumbnail cache:
+
+- an entry is one main file plus optional companion files with the same
+  name stem (e.g. <key>.json and <key>.html); the main file's mtime is the
+  entry's last use, refreshed with touch()
+- files are written to a temporary name and renamed into place, so a reader
+  never sees a half-written file
+- the directory size is summed once, then tracked per write; going over
+  the cap evicts the least recently used entries
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DiskLRU:
+    """
+    Size-capped directory of cache entries.
+
+    Example:
+        >>> disk = DiskLRU("/tmp/thumbs", max_bytes=50 * 1024 * 1024, suffix=".jpg", name="Thumbnail cache")
+        >>> disk.write(path, data)
+        >>> disk.grow(len(data))
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        suffix: str,
+        companions: Iterable[str] = (),
+        name: str = "Disk cache"
+    ):
+        """
+        Args:
+            directory (str): Cache directory (created on first write)
+            max_bytes (int): Total size cap before LRU eviction
+            suffix (str): Suffix of each entry's main file (e.g. ".json")
+            companions (Iterable[str]): Suffixes of files stored and evicted with it (e.g. (".html",))
+            name (str): Label for log messages
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.companions = tuple(companions)
+        self.name = name
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def entry_paths(self, main_path: str) -> List[str]:
+        """Main file and companion files of an entry."""
+        stem = main_path[:-len(self.suffix)]
+        return [main_path] + [stem + suffix for suffix in self.companions]
+
+    @staticmethod
+    def file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def entry_size(self, main_path: str) -> int:
+        """Bytes on disk of an entry (0 if it does not exist)."""
+        return sum(self.file_size(path) for path in self.entry_paths(main_path))
+
+    @staticmethod
+    def touch(main_path: str) -> bool:
+        """Mark an entry as recently used; False if it does not exist."""
+        try:
+            os.utime(main_path)
+        except OSError:
+            return False
+        return True
+
+    def write(self, path: str, data: Union[str, bytes]):
+        """
+        Atomically write one file of an entry.
+
+        Raises:
+            OSError: If the file could not be written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if isinstance(data, str):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        os.replace(tmp_path, path)
+
+    def files(self) -> List[str]:
+        """Names of the cache files in the directory."""
+        try:
+            return [n for n in os.listdir(self.directory) if n.endswith((self.suffix,) + self.companions)]
+        except OSError:
+            return []
+
+    def grow(self, delta: int):
+        """Track the cache size after a write; evict least-recently-used entries once over the cap."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(self.file_size(os.path.join(self.directory, n)) for n in self.files())
+            else:
+                self._size += delta
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least-recently-used entries (by main file mtime) until under the cap."""
+        entries = []
+        total = 0
+        for name in self.files():
+            if not name.endswith(self.suffix):
+                continue
+            main_path = os.path.join(self.directory, name)
+            try:
+                used = os.path.getmtime(main_path)
+            except OSError:
+                continue
+            size = self.entry_size(main_path)
+            entries.append((used, size, main_path))
+            total += size
+
+        entries.sort()
+        evicted = 0
+        for _, size, main_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self.entry_paths(main_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        self._size = total
+        if evicted:
+            logger.info(f"{self.name}: evicted {evicted} least recently used entries")
+
+    def clear(self):
+        """Delete every cache file."""
+        with self._lock:
+            for name in self.files():
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and bytes on disk."""
+        names = self.files()
+        return {
+            "entries": sum(1 for n in names if n.endswith(self.suffix)),
+            "bytes": sum(self.file_size(os.path.join(self.directory, n)) for n in names),
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,292 @@
+"""
+Domain Reputation Module
+
+Local index of known news domains for instant pre-screening. Before a URL
+costs scraping, VirusTotal and model calls, its host is looked up in a
+list of known fabricators, satire sites, unreliable outlets and reliable
+sources / wire services, giving an immediate verdict hint.
+
+- the list is a CSV (domain,label) or JSON ({"domain": "label"} or
+  [{"domain": ..., "label": ...}]) file at DOMAIN_LIST_PATH
+- lookups walk the host's suffixes (news.example.co.uk -> example.co.uk ->
+  co.uk), each an O(1) hashed-set probe, so a subdomain inherits its
+  site's reputation; a lookup takes a few microseconds
+- lists over DOMAIN_COMPACT_THRESHOLD entries are stored compactly as
+  sorted 64-bit domain hashes (9 bytes per domain) behind a Bloom filter
+  that rejects almost every unlisted suffix without a search
+- the file is re-read in the background when its mtime changes (hot reload)
+
+Example:
+    >>> hint = domain_reputation.lookup("https://politics.example-fake-news.com/story")
+    >>> hint["hint"], hint["label"]
+    ('Fake', 'fabricator')
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .bloom import BloomFilter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DOMAIN_LIST_PATH = os.getenv(
+    "DOMAIN_LIST_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "domain_reputation.csv")
+)
+# Lists larger than this use the compact hashed form + Bloom filter
+DOMAIN_COMPACT_THRESHOLD = int(os.getenv("DOMAIN_COMPACT_THRESHOLD", "100000"))
+# Seconds between checks of the list file's mtime
+DOMAIN_RELOAD_INTERVAL = float(os.getenv("DOMAIN_RELOAD_INTERVAL", "5"))
+
+# label -> (verdict hint, confidence, description); unknown labels give no hint
+LABELS: Dict[str, Tuple[Optional[str], float, str]] = {
+    "fabricator": ("Fake", 0.95, "Known fabricated-news site"),
+    "fake": ("Fake", 0.95, "Known fabricated-news site"),
+    "imposter": ("Fake", 0.95, "Imitates a real outlet"),
+    "satire": ("Satire", 0.9, "Satire site: stories are not meant as real news"),
+    "unreliable": ("Unreliable", 0.7, "Frequently publishes false or misleading stories"),
+    "conspiracy": ("Unreliable", 0.7, "Promotes conspiracy theories"),
+    "reliable": ("Real", 0.8, "Established outlet with editorial standards"),
+    "wire": ("Real", 0.85, "News wire service"),
+}
+
+
+def normalize_host(url_or_host: str) -> str:
+    """Lower-case host name of a URL or bare domain, without port, trailing dot or 'www.'."""
+    value = url_or_host.strip().lower()
+    if "//" in value:
+        value = urlsplit(value).hostname or ""
+    else:
+        value = value.split("/", 1)[0].rsplit("@", 1)[-1].split(":", 1)[0]
+    value = value.rstrip(".")
+    return value[4:] if value.startswith("www.") else value
+
+
+def _suffixes(host: str) -> List[str]:
+    """host and its parent domains, longest first (a bare TLD is never matched)."""
+    labels = host.split(".")
+    return [".".join(labels[i:]) for i in range(len(labels) - 1)]
+
+
+def _domain_hash(domain: str) -> int:
+    return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def load_entries(path: str) -> Iterable[Tuple[str, str]]:
+    """
+    Read (domain, label) pairs from a CSV or JSON list.
+
+    CSV: "domain,label" rows; a header row and '#' comment lines are skipped.
+    JSON: {"domain": "label", ...} or [{"domain": ..., "label": ...}, ...];
+    entries that are not of this shape are skipped.
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            items = list(data.items())
+        elif isinstance(data, list):
+            items = [(d.get("domain"), d.get("label")) for d in data if isinstance(d, dict)]
+            if len(items) < len(data):
+                logger.warning(f"Skipped {len(data) - len(items)} malformed entries in {path}")
+        else:
+            raise ValueError(f"Expected a JSON object or list in {path}")
+        for domain, label in items:
+            if isinstance(domain, str) and isinstance(label, str):
+                yield normalize_host(domain), label.strip().lower()
+        return
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip() or row[0].lstrip().startswith("#"):
+                continue
+            domain, label = normalize_host(row[0]), row[1].strip().lower()
+            if domain == "domain" and label == "label":
+                continue
+            yield domain, label
+
+
+class DomainIndex:
+    """Immutable domain -> label index (hashed set, or compact hashes + Bloom filter)."""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]], compact_threshold: Optional[int] = None):
+        """
+        Args:
+            entries (Iterable): (domain, label) pairs; later duplicates win
+            compact_threshold (int): Entry count above which the compact form is used
+                (default: DOMAIN_COMPACT_THRESHOLD)
+        """
+        table = {domain: label for domain, label in entries if domain and label}
+        self.size = len(table)
+        threshold = DOMAIN_COMPACT_THRESHOLD if compact_threshold is None else compact_threshold
+        self.compact = self.size > threshold
+        self._labels: List[str] = sorted(set(table.values()))
+
+        if not self.compact:
+            self._table: Optional[Dict[str, str]] = table
+            return
+
+        label_ids = {label: i for i, label in enumerate(self._labels)}
+        pairs = sorted((_domain_hash(domain), label_ids[label]) for domain, label in table.items())
+        self._table = None
+        self._hashes = array("Q", (h for h, _ in pairs))
+        self._label_ids = array("B" if len(self._labels) < 256 else "H", (i for _, i in pairs))
+        self._bloom = BloomFilter(self.size, error_rate=0.01)
+        for h, _ in pairs:
+            self._bloom.add(h)
+
+    def _get(self, domain: str) -> Optional[str]:
+        if self._table is not None:
+            return self._table.get(domain)
+        h = _domain_hash(domain)
+        if h not in self._bloom:
+            return None
+        i = bisect_left(self._hashes, h)
+        if i < len(self._hashes) and self._hashes[i] == h:
+            return self._labels[self._label_ids[i]]
+        return None
+
+    def match(self, host: str) -> Optional[Tuple[str, str]]:
+        """Most specific listed (domain, label) for a normalized host, or None."""
+        for suffix in _suffixes(host):
+            label = self._get(suffix)
+            if label is not None:
+                return suffix, label
+        return None
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class DomainReputation:
+    """Domain reputation lookups over a list file, reloaded when the file changes."""
+
+    def __init__(self, path: Optional[str] = None, reload_interval: Optional[float] = None):
+        """
+        Args:
+            path (str): CSV / JSON domain list (default: DOMAIN_LIST_PATH)
+            reload_interval (float): Seconds between mtime checks (default: DOMAIN_RELOAD_INTERVAL)
+        """
+        self.path = path or DOMAIN_LIST_PATH
+        self.reload_interval = DOMAIN_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        self.index: Optional[DomainIndex] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._reloading = False
+        self._lock = threading.Lock()
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def reload(self) -> DomainIndex:
+        """Re-read the list file now and swap in the new index."""
+        mtime = self._file_mtime()
+        start = time.perf_counter()
+        try:
+            index = DomainIndex(load_entries(self.path)) if mtime is not None else DomainIndex([])
+        except (OSError, ValueError, csv.Error) as e:
+            logger.error(f"Could not load domain list {self.path}: {e}")
+            index = self.index or DomainIndex([])
+        else:
+            if mtime is not None:
+                logger.info(f"✓ Loaded {len(index)} domains from {self.path} in {time.perf_counter() - start:.2f}s"
+                            f"{' (compact)' if index.compact else ''}")
+        with self._lock:
+            self.index, self._mtime = index, mtime
+        return index
+
+    def _current(self) -> DomainIndex:
+        """Index to answer from; starts a background reload if the file changed."""
+        index = self.index
+        if index is None:
+            with self._lock:
+                loaded = self.index is not None
+            return self.index if loaded else self.reload()
+
+        now = time.monotonic()
+        if now - self._checked_at >= self.reload_interval:
+            self._checked_at = now
+            if self._file_mtime() != self._mtime:
+                with self._lock:
+                    start_reload = not self._reloading
+                    self._reloading = True
+                if start_reload:
+                    threading.Thread(target=self._background_reload, name="domain-list-reload", daemon=True).start()
+        return index
+
+    def _background_reload(self):
+        try:
+            self.reload()
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def lookup(self, url_or_host: str) -> Optional[Dict[str, Any]]:
+        """
+        Reputation of a URL's domain.
+
+        Returns:
+            Dict[str, Any]: {name, matched, label, hint, confidence, description} if the
+                domain (or a parent domain) is listed, else None. hint is "Fake", "Real",
+                "Satire", "Unreliable" or None for labels without a verdict.
+        """
+        host = normalize_host(url_or_host)
+        if not host:
+            return None
+        found = self._current().match(host)
+        if found is None:
+            return None
+        matched, label = found
+        hint, confidence, description = LABELS.get(label, (None, 0.0, label))
+        return {
+            "name": host,
+            "matched": matched,
+            "label": label,
+            "hint": hint,
+            "confidence": confidence,
+            "description": description,
+        }
+
+    def verdict(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Classifier-style result ({label, score, raw, method}) for domains whose hint is
+        decisive (Fake or Real); else None. The app's URL mode shows it instead of
+        scraping, checking VirusTotal and running the model.
+        """
+        info = self.lookup(url)
+        if info is None or info["hint"] not in ("Fake", "Real"):
+            return None
+        return {
+            "label": info["hint"],
+            "score": info["confidence"],
+            "raw": info,
+            "method": "domain-reputation",
+        }
+
+
+# Shared instance
+domain_reputation = DomainReputation()
+
+
+def lookup(url_or_host: str) -> Optional[Dict[str, Any]]:
+    """Look up a domain in the shared index (see DomainReputation.lookup)."""
+    return domain_reputation.lookup(url_or_host)
+
+
+def verdict(url: str) -> Optional[Dict[str, Any]]:
+    """Decisive domain verdict from the shared index (see DomainReputation.verdict)."""
+    return domain_reputation.verdict(url)
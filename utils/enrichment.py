@@ -0,0 +1,163 @@
+"""
+Search Enrichment Module
+
+Background full-text enrichment and pre-scoring of NewsAPI search results.
+
+NewsAPI truncates `content` to about 200 characters, so classifying a
+search result from its fields alone scores a stub. As soon as a search
+returns, an EnrichmentJob:
+
+- scrapes every listed article concurrently (scraper.get_texts_from_urls,
+  so per-site limits and the page cache apply)
+- falls back to NewsAPI's title + description + content when a page cannot
+  be scraped or yields too little text
+- classifies the texts in batches as they arrive, through a caller-supplied
+  batch classifier (the app passes the fake news model)
+
+so the UI can show a verdict per result within seconds and analyzing a
+result needs neither scraping nor inference.
+
+Example:
+    >>> job = EnrichmentJob(articles, classify_batch).start()
+    >>> job.get(articles[0]["url"])
+    {'text': '...', 'full_text': True, 'verdict': {'label': 'Real', 'score': 0.97}, 'error': None}
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import newsapi_client, scraper
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Texts classified per model call
+ENRICH_BATCH_SIZE = int(os.getenv("ENRICH_BATCH_SIZE", "4"))
+# Scraped text shorter than this is treated as a failed scrape (paywall, cookie wall)
+ENRICH_MIN_CHARS = int(os.getenv("ENRICH_MIN_CHARS", "300"))
+
+
+class EnrichmentJob:
+    """Scrape and classify a list of NewsAPI articles on a background thread."""
+
+    def __init__(
+        self,
+        articles: List[Dict[str, Any]],
+        classify_batch: Callable[[List[str]], List[Optional[Dict[str, Any]]]],
+        batch_size: Optional[int] = None,
+        min_chars: Optional[int] = None
+    ):
+        """
+        Args:
+            articles (List[Dict]): Raw NewsAPI articles
+            classify_batch (Callable): Maps a list of texts to one result dict (or None) per text.
+                Runs on the job's thread, so it must be safe to call while other threads use the
+                same model (e.g. a detectors.pool.PipelinePool)
+            batch_size (int): Texts per classify_batch call (default: ENRICH_BATCH_SIZE)
+            min_chars (int): Minimum scraped text length to use (default: ENRICH_MIN_CHARS)
+        """
+        self.articles = articles
+        self.classify_batch = classify_batch
+        self.batch_size = max(1, batch_size or ENRICH_BATCH_SIZE)
+        self.min_chars = ENRICH_MIN_CHARS if min_chars is None else min_chars
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "EnrichmentJob":
+        """Start the background thread (returns self for chaining)."""
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="search-enrichment", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop scraping and scoring (e.g. when a new search replaces this one)."""
+        self._cancelled.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job; returns True once it has finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Enrichment of one article, once it has been scored.
+
+        Returns:
+            Dict[str, Any]: {text, full_text, verdict, error}, or None while pending
+        """
+        with self._lock:
+            return self.results.get(url)
+
+    def progress(self) -> Tuple[int, int]:
+        """(articles scored, articles total)."""
+        with self._lock:
+            return len(self.results), len(self._urls())
+
+    def _urls(self) -> List[str]:
+        return list(dict.fromkeys(a.get("url") for a in self.articles if a.get("url")))
+
+    def _run(self):
+        try:
+            snippets = {}
+            for article in self.articles:
+                if article.get("url"):
+                    snippets.setdefault(article["url"], newsapi_client.extract_article_text(article))
+
+            pending: List[Tuple[str, str, bool]] = []
+            batches = scraper.get_texts_from_urls(list(snippets))
+            try:
+                for result in batches:
+                    if self._cancelled.is_set():
+                        return
+                    url = result["url"]
+                    if result["ok"] and len(result["text"]) >= self.min_chars:
+                        pending.append((url, result["text"], True))
+                    else:
+                        pending.append((url, snippets[url], False))
+                    if len(pending) >= self.batch_size:
+                        self._score(pending)
+                        pending = []
+            finally:
+                batches.close()
+
+            if pending and not self._cancelled.is_set():
+                self._score(pending)
+        except Exception:
+            logger.exception("Search enrichment failed")
+        finally:
+            self.finished_at = time.monotonic()
+            if not self._cancelled.is_set():
+                scored, total = self.progress()
+                logger.info(f"✓ Enriched {scored}/{total} search results in {self.finished_at - self.started_at:.1f}s")
+
+    def _score(self, items: List[Tuple[str, str, bool]]):
+        """Classify one batch and publish its results."""
+        error = None
+        try:
+            verdicts = self.classify_batch([text for _, text, _ in items])
+        except Exception as e:
+            logger.warning(f"Batch classification failed: {e}")
+            verdicts, error = [None] * len(items), str(e)
+
+        with self._lock:
+            for (url, text, full_text), verdict in zip(items, verdicts):
+                self.results[url] = {
+                    "text": text,
+                    "full_text": full_text,
+                    "verdict": verdict,
+                    "error": error if verdict is None else None,
+                }
@@ -0,0 +1,289 @@
+"""
+Article Extractors Module
+
+Pluggable main-content extractors used by the scraper. Each extractor takes
+a downloaded page and returns its title and main text:
+
+- "density": fast lxml extractor. Paragraph-like blocks are scored by text
+  length, punctuation and text density (characters per tag), blocks that are
+  mostly links (menus, related stories, tag clouds) are dropped, and the
+  container that collects the highest score is taken as the article body.
+- "newspaper": newspaper3k's full Article parser (slower, heavier, but
+  handles more unusual layouts).
+
+The default "auto" chain tries the density extractor first and falls back to
+newspaper3k when it finds too little text. Select one with SCRAPER_EXTRACTOR.
+
+Example:
+    >>> from utils import extractors
+    >>> extractors.extract(url, html)
+    {'title': 'Council approves new budget', 'text': '...', 'extractor': 'density'}
+"""
+
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCRAPER_EXTRACTOR = os.getenv("SCRAPER_EXTRACTOR", "auto")
+
+# Below this many characters of body text an extraction counts as a miss
+MIN_TEXT_CHARS = int(os.getenv("EXTRACTOR_MIN_TEXT_CHARS", "200"))
+
+# Extractor order for SCRAPER_EXTRACTOR=auto
+AUTO_CHAIN = ["density", "newspaper"]
+
+
+def _newspaper_article(url: str):
+    """Create a newspaper3k Article; newspaper3k is imported on first use."""
+    from newspaper import Article
+    return Article(url)
+
+
+class Extractor(ABC):
+    """
+    Interface of a main-content extractor.
+
+    Subclasses set `name` and implement extract(); register them in EXTRACTORS.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def extract(self, url: str, html: str) -> Dict[str, str]:
+        """
+        Extract the article from a page.
+
+        Args:
+            url (str): Page URL (for resolving relative links)
+            html (str): Page HTML
+
+        Returns:
+            Dict[str, str]: {"title": ..., "text": ...}; empty strings if nothing was found
+        """
+
+
+class NewspaperExtractor(Extractor):
+    """newspaper3k's Article parser (parse only; the page is already downloaded)."""
+
+    name = "newspaper"
+
+    def extract(self, url: str, html: str) -> Dict[str, str]:
+        article = _newspaper_article(url)
+        article.download(input_html=html)
+        article.parse()
+        return {"title": article.title or "", "text": article.text or ""}
+
+
+# Never part of the article body
+_DROP_TAGS = ["script", "style", "noscript", "iframe", "form", "button", "select", "svg",
+              "nav", "header", "footer", "aside", "figure", "template"]
+
+# Elements whose text becomes one paragraph of output
+_BLOCK_TAGS = {"p", "pre", "blockquote", "h2", "h3", "h4", "li", "td", "dd"}
+
+_POSITIVE = re.compile(r"article|body|content|entry|main|post|story|text|blog", re.I)
+_NEGATIVE = re.compile(
+    r"comment|footer|sidebar|share|social|related|promo|advert|\bads?\b|sponsor|cookie|"
+    r"banner|nav|menu|breadcrumb|subscribe|newsletter|popup|modal|widget|trending|tags?\b|meta",
+    re.I
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _clean(text: Optional[str]) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def _class_weight(element) -> int:
+    """Readability-style hint from class / id names."""
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    weight = 0
+    if _NEGATIVE.search(names):
+        weight -= 25
+    if _POSITIVE.search(names):
+        weight += 25
+    return weight
+
+
+class DensityExtractor(Extractor):
+    """Fast lxml extractor using text-density and link-density heuristics."""
+
+    name = "density"
+
+    # A block is kept only if at most this share of its characters are link text
+    max_link_density = 0.5
+    # Blocks shorter than this do not count towards their container's score
+    min_block_chars = 25
+
+    def extract(self, url: str, html: str) -> Dict[str, str]:
+        import lxml.html
+        from lxml import etree
+
+        if not html or not html.strip():
+            return {"title": "", "text": ""}
+        try:
+            doc = lxml.html.document_fromstring(html)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration
+            doc = lxml.html.document_fromstring(html.encode("utf-8"))
+
+        title = self._title(doc)
+
+        etree.strip_elements(doc, *_DROP_TAGS, etree.Comment, with_tail=False)
+        # Hidden boilerplate (cookie banners, modals) and ARIA navigation
+        hidden = [
+            element for element in doc.iter(etree.Element)
+            if "display:none" in element.get("style", "").replace(" ", "").lower()
+            or element.get("aria-hidden") == "true"
+            or element.get("role") in ("navigation", "complementary")
+        ]
+        for element in hidden:
+            if element.getparent() is not None:
+                element.drop_tree()
+
+        blocks = self._blocks(doc)
+        if not blocks:
+            return {"title": title, "text": ""}
+
+        # Score containers by the paragraphs they hold (parent full, grandparent half)
+        scores: Dict = {}
+        for block, text, _ in blocks:
+            if len(text) < self.min_block_chars:
+                continue
+            score = 1 + text.count(",") + min(len(text) / 100, 3)
+            # Text density: long runs of text in few tags look like prose, not UI
+            tags = sum(1 for _ in block.iter(etree.Element))
+            score *= min(1.0, len(text) / (tags * 40))
+            parent = block.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+                if ancestor is None:
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = _class_weight(ancestor)
+                scores[ancestor] += score * share
+
+        if not scores:
+            return {"title": title, "text": ""}
+
+        for container in scores:
+            text_len = len(_clean(container.text_content())) or 1
+            link_len = sum(len(_clean(a.text_content())) for a in container.iter("a"))
+            scores[container] *= 1 - link_len / text_len
+
+        best = max(scores, key=scores.get)
+
+        # Sibling containers that score well (articles split across wrappers)
+        parent = best.getparent()
+        selected = [best]
+        if parent is not None:
+            threshold = max(10.0, scores[best] * 0.2)
+            selected = [el for el in parent if el is best or scores.get(el, 0) >= threshold]
+
+        paragraphs = [
+            text for block, text, _ in blocks
+            if any(el is block or el in block.iterancestors() for el in selected)
+        ]
+        if title and paragraphs and paragraphs[0] == title:
+            paragraphs = paragraphs[1:]
+        return {"title": title, "text": "\n\n".join(paragraphs)}
+
+    def _blocks(self, doc) -> List:
+        """Innermost paragraph-like blocks in document order: (element, text, link density)."""
+        blocks = []
+        for element in doc.iter(*_BLOCK_TAGS):
+            # A list item or cell wrapping paragraphs is a container, not a paragraph
+            if any(True for _ in element.iterdescendants(*_BLOCK_TAGS)):
+                continue
+            text = _clean(element.text_content())
+            if not text:
+                continue
+            link_chars = sum(len(_clean(a.text_content())) for a in element.iter("a"))
+            link_density = link_chars / len(text)
+            if link_density > self.max_link_density:
+                continue
+            # Short list items and cells are UI labels, not prose
+            if element.tag in ("li", "td", "dd") and len(text) < self.min_block_chars:
+                continue
+            blocks.append((element, text, link_density))
+        return blocks
+
+    @staticmethod
+    def _title(doc) -> str:
+        """First <h1> if it matches the page title, else og:title, else <title>."""
+        page_title = _clean(doc.findtext(".//title"))
+        og = doc.xpath("//meta[@property='og:title']/@content")
+        og_title = _clean(og[0]) if og else ""
+        for h1 in doc.iter("h1"):
+            heading = _clean(h1.text_content())
+            if heading and (heading in page_title or heading in og_title):
+                return heading
+        return og_title or page_title
+
+
+EXTRACTORS = {
+    DensityExtractor.name: DensityExtractor,
+    NewspaperExtractor.name: NewspaperExtractor,
+}
+
+_instances: Dict[str, Extractor] = {}
+
+
+def get_extractor(name: str) -> Extractor:
+    """
+    Get an extractor instance by name.
+
+    Raises:
+        ValueError: If the name is not registered
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor {name!r}; choose from {sorted(EXTRACTORS)} or 'auto'")
+    if name not in _instances:
+        _instances[name] = EXTRACTORS[name]()
+    return _instances[name]
+
+
+def extract(url: str, html: str, extractor: Optional[str] = None) -> Dict[str, str]:
+    """
+    Extract the article with one extractor, or the "auto" fallback chain.
+
+    Args:
+        url (str): Page URL
+        html (str): Page HTML
+        extractor (str): Extractor name or "auto" (default: SCRAPER_EXTRACTOR)
+
+    Returns:
+        Dict[str, str]: {"title", "text", "extractor"}. With "auto", the first result
+                        with at least MIN_TEXT_CHARS of text; otherwise the longest one.
+
+    Raises:
+        Exception: If every extractor in the chain failed
+    """
+    name = extractor or SCRAPER_EXTRACTOR
+    chain = AUTO_CHAIN if name == "auto" else [name]
+
+    best, errors = None, []
+    for candidate in chain:
+        engine = get_extractor(candidate)
+        try:
+            result = engine.extract(url, html)
+        except Exception as e:
+            logger.warning(f"{candidate} extractor failed on {url}: {e}")
+            errors.append(f"{candidate}: {e}")
+            continue
+
+        result["extractor"] = candidate
+        if len(result["text"]) >= MIN_TEXT_CHARS:
+            return result
+        if best is None or len(result["text"]) > len(best["text"]):
+            best = result
+
+    if best is None:
+        raise Exception("; ".join(errors) or "no extractor configured")
+    return best
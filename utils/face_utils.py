@@ -0,0 +1,305 @@
+"""
+Face Detection Utilities Module
+
+This module locates faces in images and video frames so that deepfake analysis
+can focus on the face regions instead of the whole frame.
+Uses the Haar cascades bundled with OpenCV (cv2.data.haarcascades), so no
+model downloads are required.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (x, y, width, height) in pixel coordinates of the original image
+Box = Tuple[int, int, int, int]
+
+FRONTAL_CASCADE = "haarcascade_frontalface_default.xml"
+PROFILE_CASCADE = "haarcascade_profileface.xml"
+
+# Large frames are downscaled before detection; boxes are mapped back afterwards
+DETECTION_MAX_SIDE = 640
+
+_cascades: Dict[str, cv2.CascadeClassifier] = {}
+_cascade_lock = threading.Lock()
+
+
+def _get_cascade(name: str) -> cv2.CascadeClassifier:
+    """
+    Load (once) one of the cascades shipped with OpenCV.
+
+    Args:
+        name (str): Cascade file name inside cv2.data.haarcascades
+
+    Returns:
+        cv2.CascadeClassifier: The loaded cascade
+
+    Raises:
+        Exception: If the cascade file cannot be loaded
+    """
+    with _cascade_lock:
+        cascade = _cascades.get(name)
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(cv2.data.haarcascades + name)
+            if cascade.empty():
+                raise Exception(f"Could not load OpenCV cascade: {name}")
+            _cascades[name] = cascade
+        return cascade
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """Convert an RGB/BGR/gray array to an equalized grayscale image."""
+    if image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = image
+    return cv2.equalizeHist(gray)
+
+
+def _iou(a: Box, b: Box) -> float:
+    """Intersection-over-union of two (x, y, w, h) boxes."""
+    ax2, ay2 = a[0] + a[2], a[1] + a[3]
+    bx2, by2 = b[0] + b[2], b[1] + b[3]
+    inter_w = max(0, min(ax2, bx2) - max(a[0], b[0]))
+    inter_h = max(0, min(ay2, by2) - max(a[1], b[1]))
+    inter = inter_w * inter_h
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _dedupe_boxes(boxes: List[Box], iou_threshold: float = 0.3) -> List[Box]:
+    """Drop overlapping detections, keeping the larger box of each pair."""
+    kept: List[Box] = []
+    for box in sorted(boxes, key=lambda b: b[2] * b[3], reverse=True):
+        if all(_iou(box, k) < iou_threshold for k in kept):
+            kept.append(box)
+    return kept
+
+
+def detect_faces(
+    image: np.ndarray,
+    min_size: int = 40,
+    scale_factor: float = 1.1,
+    min_neighbors: int = 5,
+    use_profile: bool = True
+) -> List[Box]:
+    """
+    Detect faces in an image.
+
+    Runs the frontal-face cascade first and falls back to the profile cascade
+    (both orientations) only when no frontal face is found.
+
+    Args:
+        image (np.ndarray): RGB or grayscale image array (H x W [x 3])
+        min_size (int): Minimum face size in original-image pixels (default: 40)
+        scale_factor (float): Cascade scale step (default: 1.1)
+        min_neighbors (int): Cascade detection strictness (default: 5)
+        use_profile (bool): Try the profile cascade if no frontal face is found
+
+    Returns:
+        List[Box]: Face boxes as (x, y, width, height), largest first
+
+    Example:
+        >>> boxes = detect_faces(np.array(Image.open("photo.jpg").convert("RGB")))
+        >>> print(f"Found {len(boxes)} faces")
+    """
+    height, width = image.shape[:2]
+    scale = min(1.0, DETECTION_MAX_SIDE / float(max(height, width)))
+
+    gray = _to_gray(image)
+    if scale < 1.0:
+        gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+    scaled_min = max(16, int(min_size * scale))
+    detect_kwargs = {
+        "scaleFactor": scale_factor,
+        "minNeighbors": min_neighbors,
+        "minSize": (scaled_min, scaled_min),
+    }
+
+    found = list(_get_cascade(FRONTAL_CASCADE).detectMultiScale(gray, **detect_kwargs))
+
+    if not found and use_profile:
+        profile = _get_cascade(PROFILE_CASCADE)
+        found = list(profile.detectMultiScale(gray, **detect_kwargs))
+        # The profile cascade only finds faces looking one way; mirror for the other
+        flipped = cv2.flip(gray, 1)
+        gray_width = gray.shape[1]
+        for (x, y, w, h) in profile.detectMultiScale(flipped, **detect_kwargs):
+            found.append((gray_width - x - w, y, w, h))
+
+    boxes = [
+        (int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+        for (x, y, w, h) in found
+    ]
+
+    return _dedupe_boxes(boxes)
+
+
+def expand_box(box: Box, image_shape: Tuple[int, ...], margin: float = 0.25) -> Box:
+    """
+    Grow a face box into a square crop with context margin, clipped to the image.
+
+    Deepfake classifiers are trained on face crops that include hairline, ears
+    and chin, so a tight detector box is padded before cropping.
+
+    Args:
+        box (Box): Face box (x, y, width, height)
+        image_shape (Tuple): Shape of the image the box belongs to
+        margin (float): Extra context as a fraction of the box size (default: 0.25)
+
+    Returns:
+        Box: Expanded square box (x, y, width, height)
+    """
+    height, width = image_shape[:2]
+    x, y, w, h = box
+    side = int(max(w, h) * (1 + 2 * margin))
+    side = min(side, width, height)
+    cx, cy = x + w / 2.0, y + h / 2.0
+
+    x0 = int(round(cx - side / 2.0))
+    y0 = int(round(cy - side / 2.0))
+    x0 = min(max(0, x0), width - side)
+    y0 = min(max(0, y0), height - side)
+
+    return (x0, y0, side, side)
+
+
+def crop_faces(image: np.ndarray, boxes: List[Box], margin: float = 0.25) -> List[np.ndarray]:
+    """
+    Cut expanded face crops out of an image.
+
+    Args:
+        image (np.ndarray): Image array the boxes were detected on
+        boxes (List[Box]): Face boxes from detect_faces() or FaceTracker
+        margin (float): Context margin passed to expand_box()
+
+    Returns:
+        List[np.ndarray]: One crop per box
+    """
+    crops = []
+    for box in boxes:
+        x, y, w, h = expand_box(box, image.shape, margin=margin)
+        crops.append(image[y:y + h, x:x + w])
+    return crops
+
+
+class FaceTracker:
+    """
+    Track faces across consecutive video frames.
+
+    Full-frame detection is expensive, so it only runs every `redetect_every`
+    frames (or when every track is lost). In between, each tracked face is
+    searched for in a small window around its previous position; if the face is
+    not found there, its last box is kept for up to `max_misses` frames.
+
+    Example:
+        >>> tracker = FaceTracker()
+        >>> for frame in frames:
+        >>>     boxes = tracker.update(frame)
+    """
+
+    def __init__(self, redetect_every: int = 10, search_margin: float = 0.5, max_misses: int = 2, min_size: int = 40):
+        self.redetect_every = max(1, redetect_every)
+        self.search_margin = search_margin
+        self.max_misses = max_misses
+        self.min_size = min_size
+        self.frame_index = 0
+        self.full_detections = 0
+        # Each track is [box, consecutive_misses]
+        self._tracks: List[list] = []
+
+    def update(self, frame: np.ndarray) -> List[Box]:
+        """
+        Locate faces in the next frame.
+
+        Args:
+            frame (np.ndarray): Next frame in the sequence (RGB array)
+
+        Returns:
+            List[Box]: Current face boxes (x, y, width, height)
+        """
+        if not self._tracks or self.frame_index % self.redetect_every == 0:
+            self._tracks = [[box, 0] for box in detect_faces(frame, min_size=self.min_size)]
+            self.full_detections += 1
+        else:
+            self._tracks = self._follow(frame)
+
+        self.frame_index += 1
+        return [track[0] for track in self._tracks]
+
+    def _follow(self, frame: np.ndarray) -> List[list]:
+        """Search for each tracked face near its previous position."""
+        height, width = frame.shape[:2]
+        updated = []
+
+        for box, misses in self._tracks:
+            x, y, w, h = box
+            pad_w, pad_h = int(w * self.search_margin), int(h * self.search_margin)
+            x0, y0 = max(0, x - pad_w), max(0, y - pad_h)
+            x1, y1 = min(width, x + w + pad_w), min(height, y + h + pad_h)
+
+            window = frame[y0:y1, x0:x1]
+            candidates = detect_faces(window, min_size=int(min(w, h) * 0.6), use_profile=False) if window.size else []
+
+            if candidates:
+                # Pick the candidate closest to the previous box
+                best = max(
+                    ((cx + x0, cy + y0, cw, ch) for (cx, cy, cw, ch) in candidates),
+                    key=lambda c: _iou(c, box)
+                )
+                updated.append([best, 0])
+            elif misses < self.max_misses:
+                updated.append([box, misses + 1])
+
+        return updated
+
+
+def load_rgb_array(image_path: str) -> Optional[np.ndarray]:
+    """
+    Read an image file into an RGB array.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        np.ndarray: RGB image array, or None if the file could not be decoded
+    """
+    bgr = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if bgr is None:
+        return None
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+# Demo code
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Face Detection Utilities - Demo")
+    print("=" * 60)
+
+    print("\n⚠️  Note: Requires an image with faces for testing")
+    print("\nExample usage:")
+    print("-" * 60)
+
+    print("""
+# Detect faces in a single image
+image = load_rgb_array("photo.jpg")
+boxes = detect_faces(image)
+crops = crop_faces(image, boxes)
+print(f"Found {len(boxes)} faces")
+
+# Track faces across video frames
+tracker = FaceTracker(redetect_every=10)
+for frame in frames:
+    boxes = tracker.update(frame)
+    """)
+
+    print("\n" + "=" * 60)
+    print("✓ Module loaded successfully")
+    print("=" * 60)
@@ -8,6 +8,8 @@ import os
 import requests
 from typing import Dict, Any, Optional
 
+from . import http_client
+
 API_KEY = os.getenv("GOOGLE_API_KEY", "")
 BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
 MODEL = os.getenv("GOOGLE_GEMINI_MODEL", "models/gemini-1.5-flash")
@@ -19,7 +21,7 @@ def is_configured() -> bool:
 
 def _post(path: str, json: dict, timeout: int = 20) -> Dict[str, Any]:
     url = f"{BASE_URL}/{path}?key={API_KEY}"
-    resp = requests.post(url, json=json, timeout=timeout)
+    resp = http_client.post(url, json=json, timeout=timeout)
     resp.raise_for_status()
     return resp.json()
 
@@ -0,0 +1,258 @@
+"""
+Shared HTTP Client Module
+
+One transport for every outbound call the app makes (article scraping,
+NewsAPI, VirusTotal, Gemini):
+
+- keep-alive connection pooling: a single requests.Session whose pooled
+  adapter reuses TCP/TLS connections across calls and threads
+- per-host concurrency limits, so a burst of scrapes cannot flood one site
+  (a streamed response keeps its slot until it is closed, so body
+  downloads count too)
+- retries with jittered exponential backoff on connection errors, 429 and
+  5xx responses (Retry-After is honoured)
+- an asyncio API (async_get / async_post) that runs the blocking calls in
+  worker threads
+
+Responses are returned as-is; callers decide when to raise_for_status().
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "20"))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (compatible; FakeNewsDetector/1.0; +https://github.com/Saif-ua250/Fake-news-Detector)"
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses that guarantee the server did not act on the request, so even a POST can be resent
+_NOT_PROCESSED_STATUSES = {429, 503}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_session: Optional[requests.Session] = None
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared session, creating it on first use.
+
+    Returns:
+        requests.Session: Session with a pooled keep-alive adapter for http and https
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            # Retries are handled in request() so they can release the host slot while backing off
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = HTTP_USER_AGENT
+            _session = session
+        return _session
+
+
+def close():
+    """Close pooled connections; the next request opens a fresh session."""
+    global _session
+    with _lock:
+        session, _session = _session, None
+        _host_slots.clear()
+    if session is not None:
+        session.close()
+
+
+def host_key(url: str) -> str:
+    """Host (and port) a URL's requests are limited by."""
+    return urlsplit(url).netloc.lower()
+
+
+def _slot(url: str) -> threading.BoundedSemaphore:
+    key = host_key(url)
+    with _lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            slot = _host_slots[key] = threading.BoundedSemaphore(max(1, HTTP_PER_HOST_LIMIT))
+        return slot
+
+
+@contextmanager
+def host_slot(url: str):
+    """Hold one of the HTTP_PER_HOST_LIMIT concurrent request slots for the URL's host."""
+    with _slot(url):
+        yield
+
+
+def _release_on_close(resp: requests.Response, slot: threading.BoundedSemaphore):
+    """Keep a streamed response's host slot until the response is closed (or collected)."""
+    released = threading.Lock()
+
+    def release():
+        if released.acquire(blocking=False):
+            slot.release()
+
+    close = resp.close
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            release()
+
+    resp.close = close_and_release
+    # Safety net for callers that never close the response
+    weakref.finalize(resp, release)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+
+    Uses "full jitter" (uniform between 0 and the exponential cap) so clients
+    that failed together do not retry together; a numeric Retry-After header
+    from the server takes precedence.
+    """
+    if retry_after:
+        try:
+            return min(HTTP_BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            pass  # HTTP-date form: fall back to our own schedule
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(
+    method: str,
+    url: str,
+    retries: Optional[int] = None,
+    timeout: Optional[float] = None,
+    **kwargs
+) -> requests.Response:
+    """
+    Send a request through the shared session.
+
+    Connection errors, 429 and 5xx responses are retried with jittered
+    backoff. Non-idempotent methods (POST) are only resent when the request
+    cannot have been processed: connect failures, 429 and 503.
+
+    Args:
+        method (str): HTTP method
+        url (str): Absolute URL
+        retries (int): Extra attempts after the first (default: HTTP_MAX_RETRIES)
+        timeout (float): Connect/read timeout in seconds (default: HTTP_TIMEOUT)
+        **kwargs: Passed to requests.Session.request (params, json, data, headers, stream, ...)
+
+    Returns:
+        requests.Response: The final response (which may still be an error status)
+
+    Raises:
+        requests.RequestException: If the last attempt failed without a response
+
+    Example:
+        >>> resp = request("GET", "https://example.com/news", params={"page": 2})
+        >>> resp.raise_for_status()
+    """
+    method = method.upper()
+    retries = HTTP_MAX_RETRIES if retries is None else retries
+    timeout = HTTP_TIMEOUT if timeout is None else timeout
+    idempotent = method in _IDEMPOTENT_METHODS
+    session = get_session()
+
+    attempt = 0
+    while True:
+        slot = _slot(url)
+        slot.acquire()
+        try:
+            resp = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            slot.release()
+            # ConnectionError (incl. ConnectTimeout) means nothing was received; a ReadTimeout might have been processed
+            if attempt >= retries or not (idempotent or isinstance(e, requests.ConnectionError)):
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"{method} {url} failed ({type(e).__name__}); retry {attempt + 1}/{retries} in {delay:.2f}s")
+        except BaseException:
+            slot.release()
+            raise
+        else:
+            if kwargs.get("stream"):
+                # The body is still to be read: the slot is freed by resp.close()
+                _release_on_close(resp, slot)
+            else:
+                slot.release()
+            retryable = resp.status_code in (RETRY_STATUSES if idempotent else _NOT_PROCESSED_STATUSES)
+            if attempt >= retries or not retryable:
+                return resp
+            delay = backoff_delay(attempt, resp.headers.get("Retry-After"))
+            logger.warning(f"{method} {url} returned {resp.status_code}; retry {attempt + 1}/{retries} in {delay:.2f}s")
+            # Hand the connection back to the pool before sleeping
+            resp.close()
+
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared session (see request())."""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared session (see request())."""
+    return request("POST", url, **kwargs)
+
+
+def iter_body(resp: requests.Response, chunk_size: int) -> Iterator[bytes]:
+    """
+    Chunks of a streamed response body, each returned as soon as it arrives.
+
+    iter_content() waits until a whole chunk is in; read1() returns whatever
+    has arrived, so a caller checking a deadline between chunks cannot be
+    held past it by a slow-drip server.
+    """
+    if hasattr(resp.raw, "read1"):
+        return iter(lambda: resp.raw.read1(chunk_size, decode_content=True), b"")
+    return resp.iter_content(chunk_size)
+
+
+async def async_request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Awaitable request(); runs in a worker thread so the event loop is never blocked.
+
+    Example:
+        >>> responses = await asyncio.gather(*(async_get(u) for u in urls))
+    """
+    return await asyncio.to_thread(request, method, url, **kwargs)
+
+
+async def async_get(url: str, **kwargs) -> requests.Response:
+    """Awaitable get()."""
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_post(url: str, **kwargs) -> requests.Response:
+    """Awaitable post()."""
+    return await async_request("POST", url, **kwargs)
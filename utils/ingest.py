@@ -0,0 +1,299 @@
+"""
+News Ingestion Module
+
+Incremental NewsAPI ingestion: re-running a headline check only fetches
+and classifies articles that have not been seen before.
+
+- each query keeps a watermark, the newest `publishedAt` ingested so far;
+  a run only asks NewsAPI for articles from that instant on
+- every ingested URL (canonicalized, see page_cache.canonical_url) is kept
+  as a 64-bit hash in SQLite; an in-memory Bloom filter in front of the
+  table answers "definitely new" without touching the disk
+- only new articles are handed to the classifier; seen URLs and the
+  watermark are committed after it succeeded, so a failed run is retried
+- results come newest first, so a run cut short by the page budget or an
+  error still moves the watermark to the newest article it saw, and records
+  a backfill cursor (the oldest `publishedAt` it reached) for the gap below
+  it; the next runs page down from the cursor with NewsAPI's `to` parameter,
+  each within the same budget, until the gap is drained, and only then ask
+  for articles past the watermark again
+- hashes older than INGEST_SEEN_DAYS are pruned, keeping the set compact
+
+Example:
+    >>> store = IngestStore("news.sqlite")
+    >>> report = ingest("election fraud", classify=my_batch_classifier, store=store)
+    >>> print(report["fetched"], report["new"], report["duplicates"])
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import newsapi_client
+from .bloom import BloomFilter
+from .page_cache import canonical_url
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INGEST_DB_PATH = os.getenv("INGEST_DB_PATH", os.path.join(os.path.expanduser("~"), ".cache", "truthlens", "ingest.sqlite"))
+# Seen URLs older than this are forgotten (the watermark already excludes them)
+INGEST_SEEN_DAYS = float(os.getenv("INGEST_SEEN_DAYS", "30"))
+# Bloom filter sizing: starting capacity and false positive rate
+INGEST_BLOOM_CAPACITY = int(os.getenv("INGEST_BLOOM_CAPACITY", "100000"))
+INGEST_BLOOM_ERROR_RATE = 0.001
+
+
+# Default of IngestStore.commit(backfill=...): leave the cursor as it is
+_UNCHANGED = object()
+
+
+def url_key(url: str) -> int:
+    """64-bit signed hash of a canonical URL (the seen-set key)."""
+    digest = hashlib.blake2b(canonical_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _key_bytes(key: int) -> bytes:
+    return key.to_bytes(8, "big", signed=True)
+
+
+class IngestStore:
+    """
+    SQLite store of per-query watermarks and seen URL hashes, with a Bloom
+    filter over the hashes loaded on open.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str): SQLite file (default: INGEST_DB_PATH; ":memory:" for a throwaway store)
+        """
+        self.path = path or INGEST_DB_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks "
+                "(query TEXT PRIMARY KEY, published_at TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS seen_urls "
+                "(url_hash INTEGER PRIMARY KEY, seen_at REAL NOT NULL)"
+            )
+            # Articles published in [from_at, to_at] that a cut-short run did not reach
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS backfills "
+                "(query TEXT PRIMARY KEY, from_at TEXT, to_at TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+        self._load_bloom()
+
+    def _load_bloom(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+            capacity = max(INGEST_BLOOM_CAPACITY, 2 * count)
+            self.bloom = BloomFilter.from_items(
+                (_key_bytes(row[0]) for row in self._db.execute("SELECT url_hash FROM seen_urls")),
+                capacity, INGEST_BLOOM_ERROR_RATE
+            )
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        # Same normalization as the NewsAPI response cache
+        return newsapi_client._normalize_params({"q": query})["q"]
+
+    def watermark(self, query: str) -> Optional[str]:
+        """Newest publishedAt ingested for a query (ISO 8601), or None before the first run."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT published_at FROM watermarks WHERE query = ?", (self._query_key(query),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def backfill(self, query: str) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Range (from, to) of publishedAt a previous run left unread, or None.
+
+        `from` is None when the gap reaches back to the query's first run.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT from_at, to_at FROM backfills WHERE query = ?", (self._query_key(query),)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def is_seen(self, url: str) -> bool:
+        """True if the URL was ingested before (the Bloom filter answers most new URLs alone)."""
+        key = url_key(url)
+        if _key_bytes(key) not in self.bloom:
+            return False
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM seen_urls WHERE url_hash = ?", (key,)).fetchone() is not None
+
+    def commit(self, query: str, urls: Iterable[str], watermark: Optional[str], backfill: Any = _UNCHANGED):
+        """
+        Record ingested URLs, advance the query's watermark and update its
+        backfill cursor in one transaction.
+
+        The watermark never moves backwards. backfill is a (from, to) range to
+        store, None to clear it, or left out to keep the current one.
+        """
+        now = time.time()
+        keys = [url_key(url) for url in urls]
+        with self._lock, self._db:
+            if backfill is None:
+                self._db.execute("DELETE FROM backfills WHERE query = ?", (self._query_key(query),))
+            elif backfill is not _UNCHANGED:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO backfills (query, from_at, to_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (self._query_key(query), backfill[0], backfill[1], now)
+                )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO seen_urls (url_hash, seen_at) VALUES (?, ?)", [(key, now) for key in keys]
+            )
+            if watermark:
+                # ISO 8601 UTC timestamps compare correctly as strings
+                self._db.execute(
+                    "INSERT INTO watermarks (query, published_at, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(query) DO UPDATE SET published_at = MAX(published_at, excluded.published_at), "
+                    "updated_at = excluded.updated_at",
+                    (self._query_key(query), watermark, now)
+                )
+        for key in keys:
+            self.bloom.add(_key_bytes(key))
+        if self.bloom.is_full:
+            self._load_bloom()
+
+    def prune(self, max_age_days: Optional[float] = None) -> int:
+        """
+        Forget URLs first seen more than max_age_days ago (default: INGEST_SEEN_DAYS).
+
+        Returns:
+            int: Number of URLs removed
+        """
+        cutoff = time.time() - 86400 * (INGEST_SEEN_DAYS if max_age_days is None else max_age_days)
+        with self._lock, self._db:
+            removed = self._db.execute("DELETE FROM seen_urls WHERE seen_at < ?", (cutoff,)).rowcount
+        if removed:
+            # Pruned hashes would otherwise stay "maybe seen" in the filter
+            self._load_bloom()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Seen URL and query counts plus Bloom filter size."""
+        with self._lock:
+            seen = self._db.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+            queries = self._db.execute("SELECT COUNT(*) FROM watermarks").fetchone()[0]
+        return {"seen_urls": seen, "queries": queries, "bloom_bytes": self.bloom.size_bytes}
+
+    def close(self):
+        self._db.close()
+
+
+_store: Optional[IngestStore] = None
+
+
+def get_store() -> IngestStore:
+    """Default store at INGEST_DB_PATH (opened once)."""
+    global _store
+    if _store is None:
+        _store = IngestStore()
+    return _store
+
+
+def ingest(
+    query: str,
+    classify: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    store: Optional[IngestStore] = None,
+    language: str = "en",
+    max_requests: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fetch articles for a query published since its watermark and classify the new ones.
+
+    While a backfill cursor is pending (an earlier run was cut short), the run
+    reads the unread range below the cursor instead of newer articles.
+
+    Args:
+        query (str): NewsAPI search query
+        classify (Callable): Called once with the list of new articles; its
+            return value is reported as "verdicts". Exceptions propagate and
+            nothing is marked as seen.
+        store (IngestStore): Watermark / seen-URL store (default: get_store())
+        language (str): Language code
+        max_requests (int): NewsAPI page budget (default: NEWSAPI_PAGE_BUDGET)
+
+    Returns:
+        Dict[str, Any]: {query, fetched, new, duplicates, watermark, backfill, ended,
+            articles, verdicts, seconds}; backfill is the (from, to) range still
+            unread after this run, or None; ended is NewsIteration.ended
+    """
+    store = store or get_store()
+    start = time.monotonic()
+    since = store.watermark(query)
+    pending = store.backfill(query)
+    # Either the gap a cut-short run left, or everything since the watermark
+    from_at, to_at = pending if pending else (since, None)
+
+    fetched = duplicates = 0
+    fresh: List[Dict[str, Any]] = []
+    batch_urls = set()
+    newest = oldest = None
+    # NewsAPI's "from" and "to" are inclusive, so the boundary articles come back and are deduplicated
+    articles = newsapi_client.iter_news(
+        query, language=language, sort_by="publishedAt",
+        from_date=from_at.rstrip("Z") if from_at else None,
+        to_date=to_at.rstrip("Z") if to_at else None,
+        max_requests=max_requests
+    )
+    for article in articles:
+        fetched += 1
+        published = article.get("publishedAt")
+        if published:
+            newest = published if newest is None else max(newest, published)
+            oldest = published if oldest is None else min(oldest, published)
+        url = article.get("url")
+        if not url:
+            continue
+        canonical = canonical_url(url)
+        if canonical in batch_urls or store.is_seen(url):
+            duplicates += 1
+            continue
+        batch_urls.add(canonical)
+        fresh.append(article)
+
+    verdicts = classify(fresh) if classify and fresh else None
+
+    # Results are newest first: when a run stops early, the pages it did not
+    # read hold the articles between from_at and the oldest one it reached
+    backfill: Any = _UNCHANGED
+    if articles.complete:
+        backfill = None
+    elif oldest is not None:
+        backfill = (from_at, oldest)
+        logger.warning(f"Ingest of '{query}' ended early ({articles.ended}); "
+                       f"articles from {from_at or 'the start'} to {oldest} are fetched next run")
+    watermark = since if pending else newest
+    store.commit(query, (a["url"] for a in fresh), watermark, backfill=backfill)
+
+    report = {
+        "query": query,
+        "fetched": fetched,
+        "new": len(fresh),
+        "duplicates": duplicates,
+        "watermark": store.watermark(query),
+        "backfill": store.backfill(query),
+        "ended": articles.ended,
+        "articles": fresh,
+        "verdicts": verdicts,
+        "seconds": round(time.monotonic() - start, 3),
+    }
+    logger.info(f"Ingested '{query}': {fetched} fetched, {len(fresh)} new, {duplicates} duplicates")
+    return report
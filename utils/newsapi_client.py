@@ -4,14 +4,28 @@ NewsAPI Integration Module
 This module provides functionality to fetch real news articles from NewsAPI.org
 for analysis with the fake news detector.
 
+Requests go straight to the REST API through the shared HTTP client, so
+every call reuses the same pooled connections; iter_news() pages through
+all results of a search lazily. Responses are cached by
+normalized query (NEWSAPI_CACHE_TTL, longer NEWSAPI_SOURCES_TTL for the
+source list); just-expired results are served while a background refresh
+runs, and NEWSAPI_CACHE_PATH adds a SQLite tier that survives restarts.
+
 API: https://newsapi.org/
 """
 
 import os
+import math
 import logging
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Any
 from datetime import datetime, timedelta
-from newsapi import NewsApiClient
+
+from . import http_client
+from .ttl_cache import TTLCache, make_key
+
+if TYPE_CHECKING:
+    from newsapi import NewsApiClient
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,10 +34,43 @@ logger = logging.getLogger(__name__)
 # Load NewsAPI key from environment
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", None)
 
+# REST endpoint (override to point at a proxy or a test server)
+NEWSAPI_BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2").rstrip("/")
+
+# Response cache (seconds); identical searches within the TTL cost no quota
+NEWSAPI_CACHE_TTL = float(os.getenv("NEWSAPI_CACHE_TTL", "300"))
+NEWSAPI_SOURCES_TTL = float(os.getenv("NEWSAPI_SOURCES_TTL", str(24 * 3600)))
+# How long after expiry a result may still be served while it is refreshed
+NEWSAPI_STALE_TTL = float(os.getenv("NEWSAPI_STALE_TTL", "600"))
+# Optional SQLite file for a persistent cache tier
+NEWSAPI_CACHE_PATH = os.getenv("NEWSAPI_CACHE_PATH") or None
+
+# Most pages iter_news() requests per call (each page costs one request of quota)
+NEWSAPI_PAGE_BUDGET = int(os.getenv("NEWSAPI_PAGE_BUDGET", "5"))
+# NewsAPI's page size limit
+MAX_PAGE_SIZE = 100
+
+# Case-insensitive parameters (cache key normalization)
+_LOWERCASE_PARAMS = {"language", "country", "category"}
+_QUERY_OPERATORS = {"AND", "OR", "NOT"}
+
+_sdk_client = None
+
+response_cache = TTLCache(
+    ttl=NEWSAPI_CACHE_TTL,
+    stale_ttl=NEWSAPI_STALE_TTL,
+    max_entries=256,
+    path=NEWSAPI_CACHE_PATH,
+    name="newsapi"
+)
+
 
-def get_newsapi_client() -> Optional[NewsApiClient]:
+def get_newsapi_client() -> Optional["NewsApiClient"]:
     """
-    Initialize and return NewsAPI client.
+    Initialize and return the newsapi-python SDK client (created once).
+    
+    The functions in this module call the REST API directly; the SDK client
+    is only provided for callers that want it.
     
     Returns:
         NewsApiClient: Initialized client or None if key not available.
@@ -37,15 +84,93 @@ def get_newsapi_client() -> Optional[NewsApiClient]:
         logger.warning("NewsAPI key not found in environment variables")
         return None
     
+    global _sdk_client
+    if _sdk_client is not None:
+        return _sdk_client
+    
     try:
-        client = NewsApiClient(api_key=NEWSAPI_KEY)
+        from newsapi import NewsApiClient
+        _sdk_client = NewsApiClient(api_key=NEWSAPI_KEY)
         logger.info("✓ NewsAPI client initialized successfully")
-        return client
+        return _sdk_client
     except Exception as e:
         logger.error(f"Failed to initialize NewsAPI client: {e}")
         return None
 
 
+class NewsAPIError(Exception):
+    """Error reported by NewsAPI; `code` is its machine-readable error code."""
+    
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+
+
+def _get(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Call a NewsAPI endpoint through the shared HTTP client.
+    
+    Args:
+        endpoint (str): Path below NEWSAPI_BASE_URL, e.g. "everything"
+        params (Dict): Query parameters (None values are dropped)
+    
+    Returns:
+        Dict: Decoded JSON response
+    
+    Raises:
+        NewsAPIError: With NewsAPI's error message if the request was rejected
+    """
+    resp = http_client.get(
+        f"{NEWSAPI_BASE_URL}/{endpoint}",
+        params={k: v for k, v in params.items() if v is not None},
+        headers={"X-Api-Key": NEWSAPI_KEY}
+    )
+    try:
+        data = resp.json()
+    except ValueError:
+        resp.raise_for_status()
+        raise NewsAPIError(f"Invalid JSON from NewsAPI (HTTP {resp.status_code})")
+    
+    if data.get("status") == "error" or not resp.ok:
+        raise NewsAPIError(data.get("message") or f"HTTP {resp.status_code}", data.get("code"))
+    return data
+
+
+def _normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Canonical form of query parameters for cache keys.
+    
+    Whitespace is collapsed and case-insensitive values are lower-cased, so
+    "Climate  Change" and "climate change" are the same request. Boolean
+    operators (AND / OR / NOT) and camelCase values such as sortBy keep their case.
+    """
+    normalized = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            words = value.split()
+            if key == "q":
+                words = [w if w in _QUERY_OPERATORS else w.lower() for w in words]
+            elif key in _LOWERCASE_PARAMS:
+                words = [w.lower() for w in words]
+            value = " ".join(words)
+        normalized[key] = value
+    return normalized
+
+
+def _cached_get(endpoint: str, params: Dict[str, Any], ttl: Optional[float] = None) -> Dict[str, Any]:
+    """
+    _get() through the response cache.
+    
+    Errors are raised, not cached. The request sends the normalized
+    parameters, so whichever caller loads an entry gets the same result.
+    """
+    params = _normalize_params(params)
+    key = make_key(endpoint, params)
+    return response_cache.get_or_load(key, lambda: _get(endpoint, params), ttl=ttl)
+
+
 def search_news(
     query: str,
     language: str = "en",
@@ -74,8 +199,8 @@ def search_news(
         >>> for article in results.get('articles', []):
         >>>     print(article['title'])
     """
-    client = get_newsapi_client()
-    if not client:
+    if not is_newsapi_configured():
+        logger.warning("NewsAPI key not found in environment variables")
         return {
             "status": "error",
             "message": "NewsAPI client not available",
@@ -89,13 +214,13 @@ def search_news(
         
         logger.info(f"Searching news for: '{query}'")
         
-        response = client.get_everything(
-            q=query,
-            language=language,
-            sort_by=sort_by,
-            page_size=page_size,
-            from_param=from_date
-        )
+        response = _cached_get("everything", {
+            "q": query,
+            "language": language,
+            "sortBy": sort_by,
+            "pageSize": page_size,
+            "from": from_date
+        })
         
         logger.info(f"✓ Found {response.get('totalResults', 0)} articles")
         return response
@@ -109,6 +234,166 @@ def search_news(
         }
 
 
+class NewsIteration:
+    """
+    Iterator returned by iter_news().
+
+    Once exhausted, `ended` tells why the iteration stopped: "complete" (the
+    results ran out), "max_results", "budget" (max_requests pages were
+    requested and more remain), "plan_limit" (NewsAPI's maximumResultsReached)
+    or "error" (`error` holds the exception). It is None while iterating or
+    if the caller stopped early.
+    """
+    
+    def __init__(self, pages: Iterator[Dict[str, Any]]):
+        self._pages = pages
+        self.ended: Optional[str] = None
+        self.error: Optional[Exception] = None
+    
+    def __iter__(self) -> "NewsIteration":
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        try:
+            return next(self._pages)
+        except StopIteration as stop:
+            if self.ended is None:
+                self.ended, self.error = stop.value or ("complete", None)
+            raise
+    
+    @property
+    def complete(self) -> bool:
+        """True if every matching article was yielded."""
+        return self.ended == "complete"
+
+
+def iter_news(
+    query: str,
+    language: str = "en",
+    sort_by: str = "publishedAt",
+    page_size: int = MAX_PAGE_SIZE,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    max_results: Optional[int] = None,
+    max_requests: Optional[int] = None
+) -> NewsIteration:
+    """
+    Iterate over every article matching a query, page by page.
+    
+    Pages are fetched lazily: while the caller works through one page the
+    next is already being downloaded in the background, and at most two
+    pages are held in memory. Iteration stops when the results run out,
+    after max_results articles, or once max_requests pages have been
+    requested (the quota budget). Articles repeated across neighbouring
+    pages (results shift as new articles are published) are yielded once.
+    Errors are logged and end the iteration; the returned iterator's
+    `ended` attribute tells a complete run from a cut-short one.
+    
+    Args:
+        query (str): Search query (keywords, phrases, AND / OR / NOT)
+        language (str): Language code (en, es, fr, etc.)
+        sort_by (str): Sort by 'publishedAt', 'relevancy', or 'popularity'
+        page_size (int): Articles per request (max 100)
+        from_date (str): Oldest article date (YYYY-MM-DD or ISO 8601)
+        to_date (str): Newest article date (YYYY-MM-DD or ISO 8601)
+        max_results (int): Stop after this many articles (default: all)
+        max_requests (int): Page request budget (default: NEWSAPI_PAGE_BUDGET)
+    
+    Returns:
+        NewsIteration: Yields raw article dictionaries in result order
+    
+    Example:
+        >>> articles = iter_news("election fraud", max_requests=3)
+        >>> for article in articles:
+        >>>     print(article['publishedAt'], article['title'])
+        >>> print(articles.ended)
+    """
+    return NewsIteration(_iter_pages(
+        query, language, sort_by, page_size, from_date, to_date, max_results, max_requests
+    ))
+
+
+def _iter_pages(query, language, sort_by, page_size, from_date, to_date, max_results, max_requests):
+    """Generator behind iter_news(); returns (ended, error)."""
+    if not is_newsapi_configured():
+        logger.warning("NewsAPI key not found in environment variables")
+        return "error", NewsAPIError("NewsAPI key not configured", "apiKeyMissing")
+    
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    budget = NEWSAPI_PAGE_BUDGET if max_requests is None else max_requests
+    if budget < 1:
+        return "budget", None
+    params = _normalize_params({
+        "q": query,
+        "language": language,
+        "sortBy": sort_by,
+        "pageSize": page_size,
+        "from": from_date,
+        "to": to_date
+    })
+    
+    prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="newsapi-prefetch")
+    # URLs of the previous and current page: results only shift by a few
+    # positions between requests, so older pages need not be remembered
+    seen_before, seen = set(), set()
+    yielded = 0
+    try:
+        page = 1
+        future = prefetch.submit(_get, "everything", dict(params, page=page))
+        requests_made = 1
+        total_pages = None
+        capped = False
+        
+        while future is not None:
+            try:
+                data = future.result()
+            except NewsAPIError as e:
+                if e.code == "maximumResultsReached":
+                    logger.info(f"NewsAPI plan limit reached after {yielded} articles")
+                    return "plan_limit", None
+                logger.error(f"Failed to fetch page {page} of '{query}': {e}")
+                return "error", e
+            except Exception as e:
+                logger.error(f"Failed to fetch page {page} of '{query}': {e}")
+                return "error", e
+            
+            articles = data.get("articles") or []
+            if total_pages is None:
+                total = data.get("totalResults", 0)
+                if max_results is not None and max_results < total:
+                    total, capped = max_results, True
+                total_pages = math.ceil(total / page_size)
+                logger.info(f"✓ {data.get('totalResults', 0)} articles for '{query}'")
+            
+            # Start downloading the next page before handing out this one
+            future = None
+            ended = "max_results" if capped else "complete"
+            if articles and page < total_pages:
+                if requests_made < budget:
+                    page += 1
+                    future = prefetch.submit(_get, "everything", dict(params, page=page))
+                    requests_made += 1
+                else:
+                    logger.info(f"NewsAPI request budget ({budget}) reached after page {page}")
+                    ended = "budget"
+            
+            seen_before, seen = seen, set()
+            for article in articles:
+                url = article.get("url")
+                if url:
+                    if url in seen or url in seen_before:
+                        continue
+                    seen.add(url)
+                yield article
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    # Uncapped means max_results covered every result
+                    return ("max_results" if capped else "complete"), None
+        return ended, None
+    finally:
+        prefetch.shutdown(wait=False, cancel_futures=True)
+
+
 def get_top_headlines(
     category: Optional[str] = None,
     country: str = "us",
@@ -134,8 +419,8 @@ def get_top_headlines(
         >>> for article in headlines.get('articles', []):
         >>>     print(article['title'])
     """
-    client = get_newsapi_client()
-    if not client:
+    if not is_newsapi_configured():
+        logger.warning("NewsAPI key not found in environment variables")
         return {
             "status": "error",
             "message": "NewsAPI client not available",
@@ -145,11 +430,11 @@ def get_top_headlines(
     try:
         logger.info(f"Fetching top headlines: category={category}, country={country}")
         
-        response = client.get_top_headlines(
-            category=category,
-            country=country,
-            page_size=page_size
-        )
+        response = _cached_get("top-headlines", {
+            "category": category,
+            "country": country,
+            "pageSize": page_size
+        })
         
         logger.info(f"✓ Found {response.get('totalResults', 0)} headlines")
         return response
@@ -186,8 +471,8 @@ def get_sources(
         >>> for source in sources.get('sources', []):
         >>>     print(source['name'])
     """
-    client = get_newsapi_client()
-    if not client:
+    if not is_newsapi_configured():
+        logger.warning("NewsAPI key not found in environment variables")
         return {
             "status": "error",
             "message": "NewsAPI client not available",
@@ -197,11 +482,11 @@ def get_sources(
     try:
         logger.info("Fetching news sources")
         
-        response = client.get_sources(
-            category=category,
-            language=language,
-            country=country
-        )
+        response = _cached_get("top-headlines/sources", {
+            "category": category,
+            "language": language,
+            "country": country
+        }, ttl=NEWSAPI_SOURCES_TTL)
         
         logger.info(f"✓ Found {len(response.get('sources', []))} sources")
         return response
@@ -0,0 +1,274 @@
+"""
+Page Cache Module
+
+On-disk cache of scraped pages (raw HTML plus the extracted text) that
+follows HTTP caching semantics:
+
+- entries are keyed by the canonical URL (tracking parameters such as utm_*
+  removed, scheme/host normalized), so share links hit the same entry
+- fresh entries (Cache-Control max-age, Expires, or a heuristic based on
+  Last-Modified) are served without touching the network
+- stale entries are revalidated with a conditional GET (If-None-Match /
+  If-Modified-Since); a 304 reuses the stored text, so the page is not parsed again
+- no-store responses are never written; no-cache ones are always revalidated
+- total size is capped (PAGE_CACHE_MAX_MB) with least-recently-used eviction
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .disk_lru import DiskLRU
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE", "1") == "1"
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "truthlens", "pages"))
+PAGE_CACHE_MAX_BYTES = int(float(os.getenv("PAGE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+# Upper bound for heuristic freshness (no explicit max-age/Expires), as RFC 9111 suggests
+HEURISTIC_MAX_AGE = 24 * 3600
+
+# Query parameters that only track the click, never change the page
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "ref_src"}
+
+# Response headers kept with an entry
+_STORED_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+
+    Lower-cases the host, treats http and https as the same page, drops
+    default ports, fragments and tracking parameters, and sorts the query.
+
+    Example:
+        >>> canonical_url("HTTP://News.Example.com:80/story?utm_source=x&id=7#top")
+        'https://news.example.com/story?id=7'
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    if scheme in ("http", "https"):
+        scheme = "https"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header into {directive: argument or None}.
+
+    Example:
+        >>> parse_cache_control('max-age=300, no-cache, private="set-cookie"')
+        {'max-age': '300', 'no-cache': None, 'private': 'set-cookie'}
+    """
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds a response stays fresh after it was received.
+
+    Returns:
+        Optional[float]: Lifetime (0 = revalidate on every use), or None if
+                         the response must not be stored (no-store)
+    """
+    now = now or time.time()
+    cc = parse_cache_control(headers.get("Cache-Control"))
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0.0
+
+    # Age already spent in upstream caches counts against the lifetime
+    try:
+        age = float(headers.get("Age") or 0)
+    except ValueError:
+        age = 0.0
+
+    if cc.get("max-age") is not None:
+        try:
+            return max(0.0, float(cc["max-age"]) - age)
+        except ValueError:
+            return 0.0
+
+    date = _http_date(headers.get("Date")) or now
+    expires = headers.get("Expires")
+    if expires is not None:
+        expires_at = _http_date(expires)
+        # An invalid Expires (e.g. "0") means already expired
+        return max(0.0, expires_at - date - age) if expires_at else 0.0
+
+    last_modified = _http_date(headers.get("Last-Modified"))
+    if last_modified and last_modified < date:
+        return min(HEURISTIC_MAX_AGE, 0.1 * (date - last_modified))
+    return 0.0
+
+
+class PageCache:
+    """
+    Disk-backed page cache: one <key>.html and one <key>.json file per URL.
+
+    Example:
+        >>> cache = PageCache("/tmp/pages")
+        >>> entry = cache.get(url)
+        >>> if entry and cache.is_fresh(entry):
+        ...     text = entry["text"]
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory (str): Cache directory (default: PAGE_CACHE_DIR)
+            max_bytes (int): Size cap before LRU eviction (default: PAGE_CACHE_MAX_BYTES)
+        """
+        self.directory = directory or PAGE_CACHE_DIR
+        self.max_bytes = max_bytes or PAGE_CACHE_MAX_BYTES
+        # The metadata file's mtime is the entry's last use
+        self._disk = DiskLRU(self.directory, self.max_bytes, ".json", companions=(".html",), name="Page cache")
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.html"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a page and mark it as recently used.
+
+        Returns:
+            Dict[str, Any]: Entry {url, canonical, headers, stored_at, expires_at, text}, or None
+        """
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._disk.touch(meta_path)
+        return entry
+
+    def html(self, url: str) -> Optional[str]:
+        """Stored raw HTML of a page, or None."""
+        _, html_path = self._paths(url)
+        try:
+            with open(html_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """True if the entry can be used without revalidation."""
+        return (now or time.time()) < entry.get("expires_at", 0)
+
+    @staticmethod
+    def validators(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Conditional request headers for revalidating an entry."""
+        if not entry:
+            return {}
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def put(self, url: str, headers: Mapping[str, str], html: str, text: str) -> bool:
+        """
+        Store a downloaded page and its extracted text.
+
+        Responses marked no-store, or that could neither be reused while fresh
+        nor revalidated (no lifetime, no ETag/Last-Modified), are not stored.
+
+        Returns:
+            bool: True if the page was stored
+        """
+        lifetime = freshness_lifetime(headers)
+        kept = {name: headers[name] for name in _STORED_HEADERS if headers.get(name)}
+        if lifetime is None or (lifetime <= 0 and not ("ETag" in kept or "Last-Modified" in kept)):
+            return False
+
+        now = time.time()
+        entry = {
+            "url": url,
+            "canonical": canonical_url(url),
+            "headers": kept,
+            "stored_at": now,
+            "expires_at": now + lifetime,
+            "text": text,
+        }
+        meta_path, html_path = self._paths(url)
+        old_size = self._disk.entry_size(meta_path)
+        try:
+            self._disk.write(html_path, html)
+            self._disk.write(meta_path, json.dumps(entry))
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+            return False
+
+        self._disk.grow(self._disk.entry_size(meta_path) - old_size)
+        return True
+
+    def refresh(self, url: str, headers: Mapping[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Apply a 304 Not Modified response: merge its headers and restart the freshness clock.
+
+        Returns:
+            Dict[str, Any]: The updated entry, or None if the page is no longer cached
+        """
+        entry = self.get(url)
+        if entry is None:
+            return None
+        merged = dict(entry["headers"], **{name: headers[name] for name in _STORED_HEADERS if headers.get(name)})
+        lifetime = freshness_lifetime(merged)
+        now = time.time()
+        entry.update(headers=merged, stored_at=now, expires_at=now + (lifetime or 0.0))
+
+        meta_path, _ = self._paths(url)
+        try:
+            self._disk.write(meta_path, json.dumps(entry))
+        except OSError as e:
+            logger.warning(f"Could not refresh cached {url}: {e}")
+        return entry
+
+    def clear(self):
+        """Delete every cached page."""
+        self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and bytes on disk."""
+        return self._disk.stats()
+
+
+# Shared instance used by the scraper
+page_cache = PageCache()
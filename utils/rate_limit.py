@@ -0,0 +1,94 @@
+"""
+Rate Limit Module
+
+Thread-safe token bucket used to pace requests: per-domain politeness in the
+crawl scheduler and API quotas (e.g. VirusTotal's free tier).
+
+A bucket holds up to `capacity` tokens and refills at `rate` tokens per
+second; each request takes one token. `capacity` is the burst allowed after
+an idle period, `rate` the sustained request rate.
+
+Example:
+    >>> bucket = TokenBucket(rate=4 / 60, capacity=4)   # 4 requests per minute
+    >>> bucket.acquire()                                 # blocks until a token is free
+    True
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second (> 0)
+            capacity (float): Maximum tokens (burst size); the bucket starts full
+            clock (Callable): Monotonic time source (injectable for tests)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now; never blocks."""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` will be available (0 if they already are)."""
+        with self._lock:
+            self._refill(self._clock())
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, sleeping until they are available.
+
+        Args:
+            tokens (float): Tokens to take
+            timeout (float): Give up after this many seconds (None = wait as long as needed)
+
+        Returns:
+            bool: True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                delay = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or delay > remaining:
+                    return False
+            time.sleep(delay)
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None):
+        """Change the refill rate (and optionally the burst size), keeping current tokens."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = float(rate)
+            if capacity is not None:
+                self.capacity = max(1.0, float(capacity))
+                self._tokens = min(self._tokens, self.capacity)
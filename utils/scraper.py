@@ -2,23 +2,236 @@
 Web Scraper Module
 
 This module provides functionality to extract text content from news article URLs
-using the newspaper3k library.
+using a fast lxml extractor, with the newspaper3k library as a fallback
+(utils/extractors.py). Pages are downloaded through the shared HTTP client
+(pooled keep-alive connections, per-host limits, retries) as bounded streams:
+non-HTML responses are rejected before the body is read, size and time are
+capped, and reading stops once enough article text has arrived. Downloaded pages
+and their text are kept in the page cache (utils/page_cache.py) and
+revalidated with conditional GETs.
 """
 
 import logging
-from typing import Optional
-from newspaper import Article
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from . import extractors, http_client, page_cache
+from .page_cache import PageCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FETCH_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", "15"))
+
+# Download bounds (fetch_page)
+SCRAPER_MAX_BYTES = int(os.getenv("SCRAPER_MAX_BYTES", str(5 * 1024 * 1024)))
+SCRAPER_MAX_SECONDS = float(os.getenv("SCRAPER_MAX_SECONDS", "20"))
+# Stop reading once this much paragraph text has arrived (0 = always read the whole page)
+SCRAPER_ENOUGH_TEXT_CHARS = int(os.getenv("SCRAPER_ENOUGH_TEXT_CHARS", "20000"))
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+
+_CHUNK_SIZE = 16 * 1024
+_PARAGRAPH_LOOKBACK = 64 * 1024
+_PARAGRAPH = re.compile(rb"<p[\s>].*?</p\s*>", re.S | re.I)
+_TAG = re.compile(rb"<[^>]*>")
+_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.I)
+
+# Batch fetching (get_texts_from_urls)
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "16"))
+SCRAPER_PER_DOMAIN = int(os.getenv("SCRAPER_PER_DOMAIN", "2"))
+SCRAPER_PARSE_PROCESSES = int(os.getenv("SCRAPER_PARSE_PROCESSES", str(os.cpu_count() or 1)))
+URL_TIMEOUT = float(os.getenv("SCRAPER_URL_TIMEOUT", "30"))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+class DownloadRejected(Exception):
+    """A page was not (fully) downloaded: unsupported content type or over a size/time cap."""
+
+
+class Page(NamedTuple):
+    """A downloaded page."""
+    url: str
+    status_code: int
+    headers: Mapping[str, str]
+    text: str
+    # True if reading stopped early because enough article text had arrived
+    truncated: bool = False
+
+
+def fetch_page(url: str, timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None) -> Page:
+    """
+    Download a page through the shared HTTP client, streaming with bounds.
+    
+    The body is only read for HTML responses, never beyond SCRAPER_MAX_BYTES
+    or SCRAPER_MAX_SECONDS, and reading stops early once the paragraphs
+    received so far hold SCRAPER_ENOUGH_TEXT_CHARS characters (plenty for
+    classification, which only looks at the first 512 tokens).
+    
+    Args:
+        url (str): Page URL
+        timeout (float): Connect / per-read timeout in seconds (default: FETCH_TIMEOUT)
+        headers (Dict[str, str]): Extra request headers (e.g. conditional GET validators)
+    
+    Returns:
+        Page: The page (status 200, or 304 with empty text for a conditional request)
+    
+    Raises:
+        requests.RequestException: On connection errors or error statuses
+        DownloadRejected: If the content is not HTML or exceeds a cap
+    """
+    start = time.monotonic()
+    resp = http_client.get(url, timeout=timeout or FETCH_TIMEOUT, headers=headers, stream=True)
+    try:
+        if resp.status_code == 304:
+            return Page(url, 304, resp.headers, "")
+        resp.raise_for_status()
+        
+        content_type = resp.headers.get("Content-Type", "")
+        mime = content_type.split(";")[0].strip().lower()
+        if mime and mime not in HTML_CONTENT_TYPES:
+            raise DownloadRejected(f"Not an HTML page ({mime})")
+        declared = resp.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > SCRAPER_MAX_BYTES:
+            raise DownloadRejected(f"Page too large ({int(declared)} bytes, limit {SCRAPER_MAX_BYTES})")
+        
+        body, truncated = _read_bounded(resp, start)
+        return Page(url, resp.status_code, resp.headers, _decode(body, content_type), truncated)
+    finally:
+        # Returns the connection to the pool, or drops it if the body was not read to the end
+        resp.close()
+
+
+def _read_bounded(resp, start: float):
+    """Read a streamed body within the byte / time caps; returns (bytes, stopped early)."""
+    body = bytearray()
+    text_chars = 0
+    scan_from = 0
+    
+    for chunk in http_client.iter_body(resp, _CHUNK_SIZE):
+        body += chunk
+        if len(body) > SCRAPER_MAX_BYTES:
+            raise DownloadRejected(f"Page exceeded {SCRAPER_MAX_BYTES} bytes")
+        if time.monotonic() - start > SCRAPER_MAX_SECONDS:
+            raise DownloadRejected(f"Download exceeded {SCRAPER_MAX_SECONDS:.0f}s")
+        
+        if SCRAPER_ENOUGH_TEXT_CHARS:
+            # Count text in the paragraphs completed so far (only re-scan near the new data)
+            window = max(scan_from, len(body) - len(chunk) - _PARAGRAPH_LOOKBACK)
+            for match in _PARAGRAPH.finditer(body, window):
+                text_chars += len(_TAG.sub(b"", match.group()).strip())
+                scan_from = match.end()
+            if text_chars >= SCRAPER_ENOUGH_TEXT_CHARS:
+                logger.info(f"Stopped reading {resp.url} after {len(body)} bytes: enough article text")
+                return bytes(body), True
+    return bytes(body), False
+
+
+def _decode(body: bytes, content_type: str) -> str:
+    """Decode HTML using the header charset, a <meta charset>, UTF-8, then cp1252."""
+    match = _CHARSET.search(content_type) or _META_CHARSET.search(body[:4096])
+    if match:
+        charset = match.group(1)
+        charset = charset.decode("ascii", "ignore") if isinstance(charset, bytes) else charset
+        try:
+            return body.decode(charset, errors="replace")
+        except LookupError:
+            pass
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start >= len(body) - 3:
+            # A multi-byte character cut off by an early stop
+            return body[:e.start].decode("utf-8", errors="replace")
+        return body.decode("cp1252", errors="replace")
+
+
+def fetch_html(url: str, timeout: Optional[float] = None) -> str:
+    """
+    Download a page's HTML through the shared HTTP client (no caching; see fetch_page for the caps).
+    
+    Returns:
+        str: Decoded HTML
+    
+    Raises:
+        requests.RequestException: On connection errors or error statuses
+        DownloadRejected: If the content is not HTML or exceeds a cap
+    """
+    return fetch_page(url, timeout=timeout).text
+
+
+def _load_page(url: str, timeout: Optional[float] = None):
+    """
+    Get a page via the page cache.
+    
+    Returns:
+        Tuple[Optional[str], Optional[Page]]: (cached text, None) when the
+        cache answers (fresh, or revalidated with a 304), else (None, downloaded Page)
+    """
+    cache = page_cache.page_cache if page_cache.PAGE_CACHE_ENABLED else None
+    entry = cache.get(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        logger.info(f"Page cache hit: {url}")
+        return entry["text"], None
+    
+    page = fetch_page(url, timeout=timeout, headers=PageCache.validators(entry))
+    if page.status_code == 304:
+        if entry is None:
+            raise Exception("Server answered 304 Not Modified to an unconditional request")
+        logger.info(f"Page not modified: {url}")
+        cache.refresh(url, page.headers)
+        return entry["text"], None
+    return None, page
+
+
+def _store_page(url: str, page: Page, text: str):
+    """Cache a downloaded page and its extracted text (if the response allows it)."""
+    if page_cache.PAGE_CACHE_ENABLED:
+        page_cache.page_cache.put(url, page.headers, page.text, text)
+
+
+def extract_text(url: str, html: str, extractor: Optional[str] = None) -> str:
+    """
+    Extract the title and main text of an already downloaded article.
+    
+    Args:
+        url (str): The article URL (used to resolve relative links)
+        html (str): Page HTML
+        extractor (str): "density", "newspaper" or "auto" (default: SCRAPER_EXTRACTOR,
+                         see utils/extractors.py)
+    
+    Returns:
+        str: Extracted article text (title + body)
+    
+    Raises:
+        Exception: If no text could be extracted
+    """
+    article = extractors.extract(url, html, extractor)
+    
+    # Combine title and text
+    full_text = f"{article['title']}\n\n{article['text']}".strip()
+    
+    if not full_text:
+        raise Exception("No text content could be extracted from the URL")
+    
+    return full_text
+
 
 def get_text_from_url(url: str) -> str:
     """
     Extract article text from a given URL.
     
-    Uses newspaper3k to parse and extract the main text content from news articles.
+    Extracts the main text content of news articles (see extract_text).
     
     Args:
         url (str): The URL of the news article to fetch
@@ -34,32 +247,15 @@ def get_text_from_url(url: str) -> str:
         >>> text = get_text_from_url("https://example.com/news/article")
         >>> print(f"Extracted {len(text)} characters")
     """
-    # Validate URL
-    if not url or not url.strip():
-        raise ValueError("URL cannot be empty")
-    
-    if not url.startswith(('http://', 'https://')):
-        raise ValueError("URL must start with http:// or https://")
+    _validate_url(url)
     
     try:
         logger.info(f"Fetching article from: {url}")
         
-        # Create Article object
-        article = Article(url)
-        
-        # Download and parse
-        article.download()
-        article.parse()
-        
-        # Extract title and text
-        title = article.title or ""
-        text = article.text or ""
-        
-        # Combine title and text
-        full_text = f"{title}\n\n{text}".strip()
-        
-        if not full_text:
-            raise Exception("No text content could be extracted from the URL")
+        full_text, page = _load_page(url)
+        if full_text is None:
+            full_text = extract_text(url, page.text)
+            _store_page(url, page, full_text)
         
         logger.info(f"✓ Extracted {len(full_text)} characters from article")
         
@@ -70,6 +266,194 @@ def get_text_from_url(url: str) -> str:
         raise Exception(f"Could not extract text from URL: {str(e)}")
 
 
+def get_texts_from_urls(
+    urls: Iterable[str],
+    timeout: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    per_domain: Optional[int] = None,
+    parse_processes: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extract article text from many URLs concurrently, yielding results as they complete.
+    
+    Downloads run on a thread pool over the shared HTTP client's pooled
+    connections, with at most `per_domain` downloads per host at a time
+    (hosts are served round-robin, so one big site cannot starve the rest).
+    Downloaded pages are parsed in a process pool so the lxml work spreads
+    across cores. Failures are captured per URL and never stop the batch.
+    
+    Args:
+        urls (Iterable[str]): Article URLs
+        timeout (float): Wall-clock budget per URL for download + parse,
+                         measured from the start of its download (default: URL_TIMEOUT)
+        max_workers (int): Concurrent downloads (default: SCRAPER_WORKERS)
+        per_domain (int): Concurrent downloads per host (default: SCRAPER_PER_DOMAIN)
+        parse_processes (int): Parser processes; 0 parses in the download threads
+                               (default: SCRAPER_PARSE_PROCESSES)
+    
+    Yields:
+        Dict[str, Any]: {"url", "ok", "text", "error", "seconds"} for every input URL,
+                        in completion order
+    
+    Example:
+        >>> for result in get_texts_from_urls(links):
+        ...     if result["ok"]:
+        ...         print(result["url"], len(result["text"]))
+        ...     else:
+        ...         print(result["url"], "failed:", result["error"])
+    """
+    timeout = timeout or URL_TIMEOUT
+    max_workers = max(1, max_workers or SCRAPER_WORKERS)
+    per_domain = max(1, per_domain or SCRAPER_PER_DOMAIN)
+    parse_processes = SCRAPER_PARSE_PROCESSES if parse_processes is None else parse_processes
+    
+    # host -> URLs waiting for a download slot (insertion order = round-robin order)
+    queues: "OrderedDict[str, deque]" = OrderedDict()
+    remaining = 0
+    for url in urls:
+        try:
+            _validate_url(url)
+        except ValueError as e:
+            yield _batch_result(url, error=str(e))
+            continue
+        queues.setdefault(http_client.host_key(url), deque()).append(url)
+        remaining += 1
+    
+    if not remaining:
+        return
+    
+    parse_pool = _get_parse_pool(parse_processes) if parse_processes > 0 else None
+    downloads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scraper")
+    # future -> {"url", "host", "stage", "started", "deadline", "reported"}
+    pending: Dict[Future, Dict[str, Any]] = {}
+    active_hosts: Dict[str, int] = {}
+    
+    def dispatch():
+        """Start downloads round-robin across hosts while workers and host slots are free."""
+        while queues:
+            started = False
+            for host in list(queues):
+                running = sum(1 for job in pending.values() if job["stage"] == "download")
+                if running >= max_workers:
+                    return
+                if active_hosts.get(host, 0) >= per_domain:
+                    continue
+                url = queues[host].popleft()
+                if queues[host]:
+                    queues.move_to_end(host)
+                else:
+                    del queues[host]
+                now = time.monotonic()
+                future = downloads.submit(_download, url, timeout, parse_pool is None)
+                pending[future] = {"url": url, "host": host, "stage": "download",
+                                   "started": now, "deadline": now + timeout, "reported": False}
+                active_hosts[host] = active_hosts.get(host, 0) + 1
+                started = True
+            if not started:
+                return
+    
+    try:
+        dispatch()
+        while remaining:
+            live = [job["deadline"] for job in pending.values() if not job["reported"]]
+            wait_for = max(0.0, min(live) - time.monotonic()) if live else None
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                job = pending.pop(future)
+                if job["stage"] == "download":
+                    active_hosts[job["host"]] -= 1
+                if job["reported"]:
+                    # Already reported as timed out; the late result is dropped
+                    continue
+                
+                text, error = None, future.exception()
+                if error is None:
+                    result = future.result()
+                    if job["stage"] == "parse":
+                        text = result
+                        _store_page(job["url"], job["page"], text)
+                    elif "text" in result:
+                        text = result["text"]
+                    else:
+                        try:
+                            parsed = parse_pool.submit(extract_text, job["url"], result["page"].text)
+                        except BrokenProcessPool as e:
+                            error = e
+                        else:
+                            pending[parsed] = dict(job, stage="parse", page=result["page"])
+                            continue
+                
+                remaining -= 1
+                seconds = time.monotonic() - job["started"]
+                if error is not None:
+                    if isinstance(error, BrokenProcessPool):
+                        _reset_parse_pool(parse_pool)
+                    yield _batch_result(job["url"], error=f"{type(error).__name__}: {str(error)[:200]}", seconds=seconds)
+                else:
+                    yield _batch_result(job["url"], text=text, seconds=seconds)
+            
+            now = time.monotonic()
+            for future, job in pending.items():
+                if not job["reported"] and now >= job["deadline"]:
+                    # Keep the entry (and its host slot) until the work really ends
+                    job["reported"] = True
+                    remaining -= 1
+                    yield _batch_result(job["url"], error=f"Timed out after {timeout:.0f}s ({job['stage']})", seconds=now - job["started"])
+            
+            dispatch()
+    finally:
+        downloads.shutdown(wait=False, cancel_futures=True)
+
+
+def _validate_url(url: str):
+    """Raise ValueError unless url is a non-empty http(s) URL."""
+    if not url or not url.strip():
+        raise ValueError("URL cannot be empty")
+    
+    if not url.startswith(('http://', 'https://')):
+        raise ValueError("URL must start with http:// or https://")
+
+
+def _batch_result(url: str, text: str = "", error: Optional[str] = None, seconds: float = 0.0) -> Dict[str, Any]:
+    return {"url": url, "ok": error is None, "text": text, "error": error, "seconds": round(seconds, 3)}
+
+
+def _download(url: str, timeout: float, parse: bool) -> Dict[str, Any]:
+    """
+    Batch worker: fetch a page via the page cache.
+    
+    Returns {"text": ...} when the cache answered or the page was parsed here
+    (parse=True), else {"page": Page} for the parser pool.
+    """
+    text, page = _load_page(url, timeout=timeout)
+    if text is None and parse:
+        text = extract_text(url, page.text)
+        _store_page(url, page, text)
+    return {"text": text} if text is not None else {"page": page}
+
+
+def _get_parse_pool(processes: int) -> ProcessPoolExecutor:
+    """Shared parser process pool (spawned once; workers stay warm between batches)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool._max_workers != processes:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False)
+            # spawn, not fork: the app process runs threads that fork would copy mid-flight
+            _parse_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pool
+
+
+def _reset_parse_pool(pool: ProcessPoolExecutor):
+    """Drop a broken parser pool; the next batch spawns a new one."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False)
+
+
 # Demo code
 if __name__ == "__main__":
     print("=" * 60)
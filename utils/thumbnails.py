@@ -0,0 +1,254 @@
+"""
+Thumbnail Cache Module
+
+Local proxy for news result images. NewsAPI's `urlToImage` points at
+full-size originals on third-party hosts; rendering them directly makes
+every browser download megabytes per search and stalls the page. Instead:
+
+- each image is downloaded once, in a small bounded pool (THUMBNAIL_WORKERS),
+  with content-type, size (THUMBNAIL_MAX_DOWNLOAD_MB) and time limits
+- it is resized to card size (THUMBNAIL_WIDTH) and stored as a small JPEG
+  named by the URL's hash under THUMBNAIL_DIR
+- the directory is capped (THUMBNAIL_MAX_MB) with least-recently-used eviction
+- failed URLs are remembered for a while so reruns do not retry them
+
+Example:
+    >>> thumbnails.prefetch(image_urls)            # at search time, non-blocking
+    >>> path = thumbnails.get_thumbnail(url)       # at render time: path or None while pending
+    >>> if path:
+    ...     st.image(path)
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional
+
+from . import http_client
+from .disk_lru import DiskLRU
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", os.path.join(os.path.expanduser("~"), ".cache", "truthlens", "thumbnails"))
+THUMBNAIL_MAX_BYTES = int(float(os.getenv("THUMBNAIL_MAX_MB", "50")) * 1024 * 1024)
+THUMBNAIL_WIDTH = int(os.getenv("THUMBNAIL_WIDTH", "480"))
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "4"))
+THUMBNAIL_MAX_DOWNLOAD = int(float(os.getenv("THUMBNAIL_MAX_DOWNLOAD_MB", "8")) * 1024 * 1024)
+THUMBNAIL_TIMEOUT = float(os.getenv("THUMBNAIL_TIMEOUT", "10"))
+# Seconds before a failed image URL is tried again
+THUMBNAIL_RETRY_AFTER = 15 * 60
+
+# Tallest card image (portrait originals are cropped to this aspect ratio)
+_MAX_ASPECT = 1.0
+_JPEG_QUALITY = 80
+
+
+class ThumbnailError(Exception):
+    """The image could not be downloaded or decoded."""
+
+
+def make_thumbnail(data: bytes, width: int) -> bytes:
+    """
+    Resize encoded image bytes to a card-sized JPEG.
+
+    Args:
+        data (bytes): Original image (any format Pillow reads)
+        width (int): Target width; smaller images are not enlarged
+
+    Returns:
+        bytes: JPEG data
+
+    Raises:
+        ThumbnailError: If the data is not a readable image
+    """
+    from PIL import Image
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        # JPEG: let the decoder downscale by 1/2..1/8 while reading (much faster)
+        img.draft("RGB", (width, width))
+        img = img.convert("RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ThumbnailError(f"Unreadable image: {e}")
+
+    if img.height > img.width * _MAX_ASPECT:
+        top = (img.height - int(img.width * _MAX_ASPECT)) // 2
+        img = img.crop((0, top, img.width, top + int(img.width * _MAX_ASPECT)))
+    if img.width > width:
+        img = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=_JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def _download(url: str, timeout: float, max_bytes: int) -> bytes:
+    """Fetch image bytes with content-type and size limits."""
+    resp = http_client.get(url, stream=True, timeout=timeout, retries=1, headers={"Accept": "image/*"})
+    try:
+        if resp.status_code != 200:
+            raise ThumbnailError(f"HTTP {resp.status_code}")
+        content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and not content_type.startswith("image/") and content_type != "application/octet-stream":
+            raise ThumbnailError(f"Not an image ({content_type})")
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ThumbnailError(f"Image too large ({int(declared)} bytes)")
+
+        body = bytearray()
+        deadline = time.monotonic() + timeout
+        for chunk in http_client.iter_body(resp, 64 * 1024):
+            body += chunk
+            if len(body) > max_bytes:
+                raise ThumbnailError(f"Image larger than {max_bytes} bytes")
+            if time.monotonic() > deadline:
+                raise ThumbnailError("Image download timed out")
+        return bytes(body)
+    finally:
+        resp.close()
+
+
+class ThumbnailCache:
+    """Disk cache of resized images, one <sha256>.jpg per source URL."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        width: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        """
+        Args:
+            directory (str): Cache directory (default: THUMBNAIL_DIR)
+            max_bytes (int): Size cap before LRU eviction (default: THUMBNAIL_MAX_BYTES)
+            width (int): Thumbnail width in pixels (default: THUMBNAIL_WIDTH)
+            workers (int): Concurrent downloads (default: THUMBNAIL_WORKERS)
+        """
+        self.directory = directory or THUMBNAIL_DIR
+        self.max_bytes = max_bytes or THUMBNAIL_MAX_BYTES
+        self.width = width or THUMBNAIL_WIDTH
+        self.workers = max(1, workers or THUMBNAIL_WORKERS)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self._failed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._disk = DiskLRU(self.directory, self.max_bytes, ".jpg", name="Thumbnail cache")
+
+    def path(self, url: str) -> str:
+        """Cache file for an image URL (whether or not it exists yet)."""
+        key = hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.jpg")
+
+    def cached(self, url: str) -> Optional[str]:
+        """Path of the cached thumbnail, marked as recently used, or None."""
+        path = self.path(url)
+        return path if self._disk.touch(path) else None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+            return self._pool
+
+    def _schedule(self, url: str) -> Optional[Future]:
+        """Start fetching a thumbnail unless it is cached, in flight, or recently failed."""
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is not None:
+                return future
+            failed_at = self._failed.get(url)
+            if failed_at is not None and time.time() - failed_at < THUMBNAIL_RETRY_AFTER:
+                return None
+        if self.cached(url):
+            return None
+
+        executor = self._executor()
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is None:
+                future = self._in_flight[url] = executor.submit(self._fetch, url)
+        return future
+
+    def _fetch(self, url: str) -> Optional[str]:
+        try:
+            thumb = make_thumbnail(_download(url, THUMBNAIL_TIMEOUT, THUMBNAIL_MAX_DOWNLOAD), self.width)
+            path = self.path(url)
+            old_size = self._disk.file_size(path)
+            self._disk.write(path, thumb)
+            self._disk.grow(len(thumb) - old_size)
+            return path
+        except Exception as e:
+            logger.info(f"No thumbnail for {url[:80]}: {e}")
+            with self._lock:
+                self._failed[url] = time.time()
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.pop(url, None)
+
+    def prefetch(self, urls: Iterable[str]) -> List[Future]:
+        """Queue thumbnails for download in the background (never blocks)."""
+        futures = []
+        for url in urls:
+            if url and url.startswith(("http://", "https://")):
+                future = self._schedule(url)
+                if future is not None:
+                    futures.append(future)
+        return futures
+
+    def get_thumbnail(self, url: str, timeout: float = 0.0) -> Optional[str]:
+        """
+        Local thumbnail path for an image URL.
+
+        Starts a background fetch on a miss and waits up to `timeout` seconds
+        for it (0 = return at once).
+
+        Returns:
+            str: Path to the cached JPEG, or None if it is not available (yet)
+        """
+        if not url or not url.startswith(("http://", "https://")):
+            return None
+        path = self.cached(url)
+        if path:
+            return path
+        future = self._schedule(url)
+        if future is None or timeout <= 0:
+            return None
+        done, _ = wait([future], timeout=timeout)
+        return future.result() if done else None
+
+    def pending(self, urls: Iterable[str]) -> int:
+        """How many of these URLs are still being fetched."""
+        with self._lock:
+            return sum(1 for url in urls if url in self._in_flight)
+
+    def stats(self) -> Dict[str, int]:
+        """Thumbnail count and bytes on disk."""
+        return self._disk.stats()
+
+    def clear(self):
+        """Delete every cached thumbnail."""
+        self._disk.clear()
+        with self._lock:
+            self._failed.clear()
+
+
+# Shared instance used by the app
+thumbnails = ThumbnailCache()
+
+
+def prefetch(urls: Iterable[str]) -> List[Future]:
+    """Queue thumbnails on the shared cache (see ThumbnailCache.prefetch)."""
+    return thumbnails.prefetch(urls)
+
+
+def get_thumbnail(url: str, timeout: float = 0.0) -> Optional[str]:
+    """Local thumbnail path from the shared cache (see ThumbnailCache.get_thumbnail)."""
+    return thumbnails.get_thumbnail(url, timeout)
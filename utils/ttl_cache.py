@@ -0,0 +1,273 @@
+"""
+TTL Cache Module
+
+Small thread-safe response cache for API clients (NewsAPI, VirusTotal):
+
+- entries expire after a per-entry time-to-live
+- an expired entry is still served for up to `stale_ttl` seconds while one
+  background refresh fetches a new value (stale-while-revalidate), so a
+  repeated search answers instantly even just after expiry
+- concurrent misses for the same key share a single load
+- the in-memory tier is a bounded LRU; an optional SQLite file keeps
+  entries across restarts (values must be JSON-serializable)
+- loader errors are never cached
+
+Example:
+    >>> cache = TTLCache(ttl=300, stale_ttl=600)
+    >>> key = make_key("everything", {"q": "election", "pageSize": 10})
+    >>> data = cache.get_or_load(key, lambda: fetch("everything", q="election"))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Background refreshes shared by every cache (they are short API calls)
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ttl-cache-refresh")
+
+
+def make_key(namespace: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Stable cache key for a call: None values dropped, parameters sorted.
+
+    Example:
+        >>> make_key("everything", {"q": "ai", "page": None}) == make_key("everything", {"q": "ai"})
+        True
+    """
+    items = sorted((str(k), v if isinstance(v, (int, float, bool)) else str(v))
+                   for k, v in (params or {}).items() if v is not None)
+    payload = json.dumps([namespace, items], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """
+    Time-to-live cache with stale-while-revalidate and an optional SQLite tier.
+
+    Entries are (value, stored_at, ttl); `clock` is wall time so persisted
+    entries age correctly across restarts.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_entries: int = 256,
+        path: Optional[str] = None,
+        name: str = "cache",
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            ttl (float): Default seconds an entry stays fresh
+            stale_ttl (float): Extra seconds an expired entry may be served while it is refreshed
+            max_entries (int): In-memory LRU bound
+            path (str): SQLite file for the persistent tier (None = memory only)
+            name (str): Label used in log messages
+            clock (Callable): Wall-clock time source (injectable for tests)
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max(1, max_entries)
+        self.path = path
+        self.name = name
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, Future] = {}
+        self._refreshing: Dict[str, Future] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+    # ------------------------------------------------------------------
+    # Persistent tier
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._db is None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                db = sqlite3.connect(self.path, check_same_thread=False)
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS entries "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, ttl REAL NOT NULL)"
+                )
+                db.commit()
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"{self.name}: persistent cache disabled ({e})")
+                self.path = None
+                return None
+        return self._db
+
+    def _load_persisted(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute("SELECT value, stored_at, ttl FROM entries WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name}: could not read persistent cache ({e})")
+                return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def _persist(self, key: str, entry: Tuple[Any, float, float]):
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                           (key, json.dumps(entry[0]), entry[1], entry[2]))
+                # Drop rows that can no longer be served
+                db.execute("DELETE FROM entries WHERE stored_at + ttl + ? < ?", (self.stale_ttl, entry[1]))
+                db.commit()
+            except (TypeError, ValueError, sqlite3.Error) as e:
+                logger.warning(f"{self.name}: could not persist entry ({e})")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._load_persisted(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Tuple[Any, float, float]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Fresh value for key, or default (never triggers a load)."""
+        entry = self._lookup(key)
+        if entry is not None and self._clock() < entry[1] + entry[2]:
+            return entry[0]
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value (in memory and, if enabled, on disk)."""
+        entry = (value, self._clock(), self.ttl if ttl is None else ttl)
+        self._remember(key, entry)
+        self._persist(key, entry)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for key, calling loader() when needed.
+
+        Fresh entries are returned as-is. An expired entry within stale_ttl is
+        returned immediately and refreshed in the background. Otherwise the
+        caller loads the value (other callers for the same key wait for it).
+
+        Args:
+            key (str): Cache key (see make_key)
+            loader (Callable): Fetches the value; exceptions propagate and are not cached
+            ttl (float): Freshness for this entry (default: the cache's ttl)
+
+        Returns:
+            Any: The cached or freshly loaded value
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            value, stored_at, entry_ttl = entry
+            age = self._clock() - stored_at
+            if age < entry_ttl:
+                self.hits += 1
+                return value
+            if age < entry_ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader, ttl)
+                return value
+
+        self.misses += 1
+        with self._lock:
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any], ttl: Optional[float]):
+        """Start one refresh per key; failures keep serving the stale value."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self.refreshes += 1
+            self._refreshing[key] = _refresh_pool.submit(self._refresh, key, loader, ttl)
+
+    def _refresh(self, key: str, loader: Callable[[], Any], ttl: Optional[float]):
+        try:
+            self.set(key, loader(), ttl)
+        except Exception as e:
+            logger.warning(f"{self.name}: background refresh failed, serving stale entry ({e})")
+        finally:
+            with self._lock:
+                self._refreshing.pop(key, None)
+
+    def drain(self, timeout: Optional[float] = None):
+        """Wait for background refreshes in flight (e.g. before shutdown or in tests)."""
+        with self._lock:
+            futures = list(self._refreshing.values())
+        wait(futures, timeout=timeout)
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+        with self._db_lock:
+            db = self._connect()
+            if db is not None:
+                db.execute("DELETE FROM entries")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit / miss counters and the in-memory entry count."""
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "persistent": self.path is not None,
+        }
@@ -1,15 +1,58 @@
 """
 VirusTotal Client (v3) - URL scan and reputation lookup
+
+A check first asks for VirusTotal's existing report on the URL (one GET,
+keyed by the URL identifier); only unknown or outdated URLs are submitted
+for a new scan. The scan is polled with exponential backoff for a few
+seconds at most (VIRUSTOTAL_POLL_BLOCK); if it has not finished by then the
+check returns a "pending" result with the analysis id, and checking the same
+URL again polls that analysis instead of submitting a new one. Every API
+call takes a token from a bucket sized to the request quota (the free tier
+allows 4 per minute); polls only use a token that is free right away. One
+interactive check waits at most VIRUSTOTAL_CHECK_WAIT seconds in total for
+quota and polling, while batch checks wait for quota as long as needed.
+Calls are not retried by the HTTP client, since each retry would spend
+quota. Verdicts are cached for VIRUSTOTAL_CACHE_TTL.
 """
 
+import base64
 import os
 import time
 import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional
+
+from . import http_client
+from .rate_limit import TokenBucket
+from .ttl_cache import TTLCache
 
 API_KEY = os.getenv("VIRUSTOTAL_API_KEY", "")
 BASE = "https://www.virustotal.com/api/v3"
 
+# API quota (public API: 4 requests per minute)
+REQUESTS_PER_MINUTE = float(os.getenv("VIRUSTOTAL_REQUESTS_PER_MINUTE", "4"))
+# Total seconds one url_analyze() call may block, on quota and polling together
+CHECK_WAIT = float(os.getenv("VIRUSTOTAL_CHECK_WAIT", "8"))
+# Existing reports older than this are rescanned
+REPORT_MAX_AGE = float(os.getenv("VIRUSTOTAL_REPORT_MAX_AGE", str(7 * 24 * 3600)))
+# Verdict cache lifetime
+CACHE_TTL = float(os.getenv("VIRUSTOTAL_CACHE_TTL", str(6 * 3600)))
+# Polling a new scan: first delay, longest delay, and how long one check blocks on it
+POLL_INITIAL = 2.0
+POLL_MAX_DELAY = 16.0
+POLL_BLOCK = float(os.getenv("VIRUSTOTAL_POLL_BLOCK", "6"))
+# How long a submitted analysis is remembered for re-checks of its URL
+PENDING_TTL = 15 * 60
+
+_bucket = TokenBucket(REQUESTS_PER_MINUTE / 60, capacity=REQUESTS_PER_MINUTE)
+verdict_cache = TTLCache(ttl=CACHE_TTL, max_entries=2048, name="virustotal")
+# URL -> id of its analysis that had not completed yet
+pending_analyses = TTLCache(ttl=PENDING_TTL, max_entries=512, name="virustotal-pending")
+
+
+class QuotaWaitExceeded(Exception):
+    """No API request slot became free within the check's wait budget."""
+
 
 def is_configured() -> bool:
     return bool(API_KEY)
@@ -19,56 +62,155 @@ def _headers():
     return {"x-apikey": API_KEY}
 
 
-def url_analyze(url: str) -> Dict[str, Any]:
+def url_id(url: str) -> str:
+    """VirusTotal URL identifier: unpadded URL-safe base64 of the URL."""
+    return base64.urlsafe_b64encode(url.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _call(method: str, path: str, deadline: Optional[float], **kwargs) -> requests.Response:
     """
-    Submit URL for analysis, then poll for result briefly.
-    Returns: { ok, verdict, malicious, suspicious, harmless, undetected, raw }
+    One API request (not retried), after taking a token from the quota bucket.
+
+    `deadline` is the time.monotonic() by which the token must be free (None = wait as long as needed).
+    """
+    wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+    if not _bucket.acquire(timeout=wait):
+        raise QuotaWaitExceeded("VirusTotal quota: no request slot free within the wait budget")
+    return http_client.request(method, f"{BASE}{path}", headers=_headers(), timeout=20, retries=0, **kwargs)
+
+
+def _verdict(stats: Dict[str, int]) -> str:
+    # Simple verdict heuristic
+    if stats.get("malicious", 0) > 0:
+        return "malicious"
+    if stats.get("suspicious", 0) > 0:
+        return "suspicious"
+    return "clean"
+
+
+def _result(stats: Dict[str, int], raw: Dict[str, Any], source: str) -> Dict[str, Any]:
+    return {
+        "ok": True,
+        "verdict": _verdict(stats),
+        "malicious": stats.get("malicious", 0),
+        "suspicious": stats.get("suspicious", 0),
+        "harmless": stats.get("harmless", 0),
+        "undetected": stats.get("undetected", 0),
+        "source": source,
+        "raw": raw,
+    }
+
+
+def _lookup(url: str, deadline: Optional[float]):
+    """Existing report for the URL if VirusTotal has a recent one, else None."""
+    r = _call("GET", f"/urls/{url_id(url)}", deadline)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    data = r.json()
+    attributes = data.get("data", {}).get("attributes", {})
+    stats = attributes.get("last_analysis_stats")
+    analyzed_at = attributes.get("last_analysis_date")
+    if not stats or not analyzed_at or time.time() - analyzed_at > REPORT_MAX_AGE:
+        return None
+    return _result(stats, data, "report")
+
+
+def _pending(url: str, analysis_id: str) -> Dict[str, Any]:
+    pending_analyses.set(url, analysis_id)
+    return {"ok": False, "pending": True, "analysis_id": analysis_id,
+            "error": "Scan submitted; the analysis is still running, check again shortly"}
+
+
+def _poll(url: str, analysis_id: str, deadline: Optional[float], first_delay: float = POLL_INITIAL):
+    """
+    Poll an analysis with exponential backoff for at most POLL_BLOCK seconds
+    (and not past the check's deadline).
+
+    Polls only take a quota token that is free right away; when none is, or
+    time runs out, the analysis is left pending.
+    """
+    poll_until = time.monotonic() + POLL_BLOCK
+    if deadline is not None:
+        poll_until = min(poll_until, deadline)
+    delay = first_delay
+    while time.monotonic() + delay <= poll_until:
+        time.sleep(delay)
+        try:
+            rr = _call("GET", f"/analyses/{analysis_id}", time.monotonic())
+        except QuotaWaitExceeded:
+            break
+        rr.raise_for_status()
+        d2 = rr.json()
+        attributes = d2.get("data", {}).get("attributes", {})
+        if attributes.get("status") == "completed":
+            pending_analyses.set(url, None, ttl=0)  # expire it: the next check starts afresh
+            return _result(attributes.get("stats", {}), d2, "scan")
+        delay = min(delay * 2, POLL_MAX_DELAY) if delay else POLL_INITIAL
+
+    return _pending(url, analysis_id)
+
+
+def _scan(url: str, deadline: Optional[float]):
+    """Submit the URL and poll the analysis briefly (see _poll)."""
+    r = _call("POST", "/urls", deadline, data={"url": url})
+    r.raise_for_status()
+    analysis_id = r.json().get("data", {}).get("id")
+    if not analysis_id:
+        return {"ok": False, "error": "No analysis id returned"}
+    return _poll(url, analysis_id, deadline)
+
+
+def url_analyze(url: str, use_cache: bool = True, quota_wait: Optional[float] = CHECK_WAIT) -> Dict[str, Any]:
+    """
+    Reputation of a URL: cached verdict, else VirusTotal's existing report,
+    else a new scan, polled for up to POLL_BLOCK seconds. A scan still
+    running after that returns {ok: False, pending: True, analysis_id};
+    calling again with the same URL polls that analysis.
+    quota_wait is the total time the call may spend waiting for quota and
+    polling (default: VIRUSTOTAL_CHECK_WAIT; None = wait for quota as long as needed).
+    Returns: { ok, verdict, malicious, suspicious, harmless, undetected, source, cached, raw }
     """
     if not is_configured():
         return {"ok": False, "error": "VIRUSTOTAL_API_KEY not configured"}
 
+    url = url.strip()
+    if use_cache:
+        cached = verdict_cache.get(url)
+        if cached is not None:
+            return dict(cached, cached=True)
+
+    deadline = None if quota_wait is None else time.monotonic() + quota_wait
     try:
-        r = requests.post(f"{BASE}/urls", headers=_headers(), data={"url": url}, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        analysis_id = data.get("data", {}).get("id")
-        if not analysis_id:
-            return {"ok": False, "error": "No analysis id returned"}
-
-        # Poll a few times (short)
-        for _ in range(6):
-            time.sleep(2)
-            rr = requests.get(f"{BASE}/analyses/{analysis_id}", headers=_headers(), timeout=20)
-            rr.raise_for_status()
-            d2 = rr.json()
-            status = d2.get("data", {}).get("attributes", {}).get("status")
-            if status == "completed":
-                stats = d2["data"]["attributes"].get("stats", {})
-                malicious = stats.get("malicious", 0)
-                suspicious = stats.get("suspicious", 0)
-                harmless = stats.get("harmless", 0)
-                undetected = stats.get("undetected", 0)
-
-                # Simple verdict heuristic
-                if malicious > 0:
-                    verdict = "malicious"
-                elif suspicious > 0:
-                    verdict = "suspicious"
-                else:
-                    verdict = "clean"
-
-                return {
-                    "ok": True,
-                    "verdict": verdict,
-                    "malicious": malicious,
-                    "suspicious": suspicious,
-                    "harmless": harmless,
-                    "undetected": undetected,
-                    "raw": d2,
-                }
-
-        return {"ok": False, "error": "Timeout waiting for analysis"}
+        analysis_id = pending_analyses.get(url)
+        if analysis_id:
+            result = _poll(url, analysis_id, deadline, first_delay=0.0)
+        else:
+            result = _lookup(url, deadline) or _scan(url, deadline)
     except requests.HTTPError as e:
         return {"ok": False, "error": f"HTTP {e.response.status_code}", "details": e.response.text[:300]}
     except Exception as e:
         return {"ok": False, "error": str(e)[:200]}
+
+    if result.get("ok"):
+        verdict_cache.set(url, result)
+    return dict(result, cached=False)
+
+
+def url_analyze_many(
+    urls: Iterable[str],
+    max_workers: int = 4,
+    quota_wait: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Check many URLs concurrently; the quota bucket paces the API calls, so a
+    batch larger than the quota's burst takes minutes on the free tier.
+    quota_wait is passed to url_analyze() (default None: every check waits
+    for its quota as long as needed).
+    Returns: { url: url_analyze(url) } in input order
+    """
+    urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))), thread_name_prefix="virustotal") as pool:
+        return dict(zip(urls, pool.map(lambda u: url_analyze(u, quota_wait=quota_wait), urls)))